@@ -5,7 +5,10 @@ import threading
 import time
 from collections import deque
 import copy
-from job_assistant_models import JobRecord, WebhookPayload
+from job_assistant_models import (
+    JobRecord, WebhookPayload, JobBatch, JobRecordValidationError, decode_job_record, decode_webhook_payload,
+    is_noop_update
+)
 
 class SupabaseWebhookService:
     """Service for handling Supabase webhooks with batching capability"""
@@ -23,6 +26,8 @@ class SupabaseWebhookService:
         self.quiet_period = quiet_period
         self.last_webhook_time = None
         self.quiet_timer = None
+        # UPDATE webhooks dropped because the job content did not change
+        self.ignored_updates = 0
     
     def parse_job_record(self, record_data: Dict[str, Any]) -> Optional[JobRecord]:
         """
@@ -37,33 +42,11 @@ class SupabaseWebhookService:
         if not record_data:
             return None
             
-        # Convert string timestamps to datetime objects if they exist
-        created_at = None
-        if 'created_at' in record_data and record_data['created_at']:
-            try:
-                created_at = datetime.fromisoformat(record_data['created_at'].replace('Z', '+00:00'))
-            except (ValueError, TypeError):
-                pass
-                
-        updated_at = None
-        if 'updated_at' in record_data and record_data['updated_at']:
-            try:
-                updated_at = datetime.fromisoformat(record_data['updated_at'].replace('Z', '+00:00'))
-            except (ValueError, TypeError):
-                pass
-        
-        return JobRecord(
-            id=record_data.get('id', ''),
-            job_url=record_data.get('job_url', ''),
-            title=record_data.get('title', ''),
-            company=record_data.get('company', ''),
-            location=record_data.get('location'),
-            posted_time=record_data.get('posted_time'),
-            applicants=record_data.get('applicants'),
-            description=record_data.get('description'),
-            created_at=created_at,
-            updated_at=updated_at
-        )
+        try:
+            return decode_job_record(record_data)
+        except JobRecordValidationError as e:
+            print(f"Invalid job record: {str(e)}")
+            return None
     
     def process_job_batch(self, payloads: List[WebhookPayload]):
         """
@@ -76,9 +59,17 @@ class SupabaseWebhookService:
         try:
             print(f"Starting batch processing of {len(payloads)} job payloads")
             
+            changes = [p for p in payloads if p.type in ('INSERT', 'UPDATE') and p.record]
+            
+            # Handle each job URL once (its latest version), even if the batch changed it several times
+            batch = JobBatch.from_payloads(changes).dedup('job_url', keep='last')
+            if len(batch) < len(changes):
+                print(f"Skipping {len(changes) - len(batch)} duplicate job payloads")
+            unique = [changes[i] for i in sorted(batch.indices())]
+            
             # Group payloads by type for easier processing
-            inserts = [p for p in payloads if p.type == 'INSERT']
-            updates = [p for p in payloads if p.type == 'UPDATE']
+            inserts = [p for p in unique if p.type == 'INSERT']
+            updates = [p for p in unique if p.type == 'UPDATE']
             
             print(f"Batch contains: {len(inserts)} inserts, {len(updates)} updates")
             
@@ -168,37 +159,36 @@ class SupabaseWebhookService:
             # Print the raw data for debugging
             print(f"Received webhook data: {data}")
             
-            # Validate that this is a Supabase webhook payload
-            if not all(key in data for key in ['type', 'table', 'schema']):
+            # Validate and parse the Supabase webhook payload
+            try:
+                payload = decode_webhook_payload(data)
+            except JobRecordValidationError as e:
                 return {
                     "success": False,
-                    "message": "Invalid webhook payload format",
+                    "message": f"Invalid webhook payload format: {str(e)}",
                     "data": data
                 }
                 
-            # Parse the webhook payload
-            webhook_type = data['type']
-            table_name = data['table']
-            schema_name = data['schema']
-            
-            # Parse record and old_record based on webhook type
-            record = None
-            old_record = None
-            
-            if webhook_type in ['INSERT', 'UPDATE'] and 'record' in data:
-                record = self.parse_job_record(data['record'])
-                
-            if webhook_type in ['UPDATE', 'DELETE'] and 'old_record' in data:
-                old_record = self.parse_job_record(data['old_record'])
-                
-            # Create the parsed payload object
-            payload = WebhookPayload(
-                type=webhook_type,
-                table=table_name,
-                schema=schema_name,
-                record=record,
-                old_record=old_record
-            )
+            webhook_type = payload.type
+            table_name = payload.table
+            schema_name = payload.schema
+            record = payload.record
+            old_record = payload.old_record
+            
+            # An UPDATE that left the content hash unchanged needs no processing
+            if webhook_type == 'UPDATE' and is_noop_update(record, old_record):
+                with self.queue_lock:
+                    self.ignored_updates += 1
+                return {
+                    "success": True,
+                    "message": f"Ignored {webhook_type} event for {table_name}: job content unchanged",
+                    "data": {
+                        "type": webhook_type,
+                        "table": table_name,
+                        "schema": schema_name,
+                        "ignored": True
+                    }
+                }
             
             # Update the last webhook time and add to queue
             current_time = time.time()
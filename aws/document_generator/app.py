@@ -1,13 +1,37 @@
 import json
-import boto3
-import openai
 import os
 from datetime import datetime, timedelta
 import traceback
 import uuid
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from document_writer import open_document_writer
+import document_cache
+from shared.clients import get_client, get_table, get_openai_client
+from shared.prompts import format_job_prompt, create_completion, count_message_tokens, count_tokens, record_call
 
-# Initialize OpenAI client
-openai.api_key = os.environ.get('OPENAI_API_KEY')
+# Stop streaming this long before the Lambda timeout so the partial document can be saved
+TIMEOUT_SAFETY_MARGIN_MS = 5000
+
+# 'stream' asks for the whole analysis in one completion, 'sections' generates each section concurrently
+DOCUMENT_GENERATION_MODE = os.environ.get('DOCUMENT_GENERATION_MODE', 'stream')
+SECTION_CONCURRENCY = int(os.environ.get('SECTION_CONCURRENCY', 4))
+SECTION_MAX_RETRIES = int(os.environ.get('SECTION_MAX_RETRIES', 2))
+
+# Bump these when the prompts or the HTML shell change so cached documents are regenerated
+PROMPT_VERSION = '2'
+TEMPLATE_VERSION = '1'
+
+# Sections of the analysis document, in output order, with section-specific instructions
+DOCUMENT_SECTIONS = [
+    ("Job Overview", "Summarize the role, its seniority and what the team is trying to achieve."),
+    ("Company Analysis", "Describe the company, its market and what it is likely to value in candidates."),
+    ("Key Responsibilities", "List the main day-to-day responsibilities of the role."),
+    ("Required Skills & Qualifications", "List the required and preferred skills, experience and qualifications."),
+    ("Potential Interview Questions", "Suggest likely interview questions with brief guidance on answering them."),
+    ("Salary Insights", "Give salary insights for the role and location if possible, and state your assumptions."),
+    ("Application Strategy", "Recommend a concrete strategy for applying and standing out.")
+]
 
 def lambda_handler(event, context):
     """
@@ -37,8 +61,7 @@ def lambda_handler(event, context):
         print(f"Processing document generation for workflow: {workflow_id}")
         
         # Get workflow from DynamoDB
-        dynamodb = boto3.resource('dynamodb')
-        table = dynamodb.Table(os.environ['WORKFLOW_TABLE'])
+        table = get_table()
         
         response = table.get_item(
             Key={
@@ -72,11 +95,17 @@ def lambda_handler(event, context):
         # Get job data
         job = workflow.get('job_data', {})
         
-        # Generate document content
-        document_content = generate_document_with_ai(job)
+        # Reuse the document for identical job content if it was already generated
+        cache_key = document_cache.content_key(job, get_document_version())
+        cached_location = document_cache.lookup(cache_key)
         
-        # Upload document to S3
-        document_url = upload_document_to_s3(workflow_id, job, document_content)
+        if cached_location:
+            print(f"Document cache hit for workflow {workflow_id}: {cache_key}")
+            document_url = generate_document_url(cached_location)
+            stats = {'partial': False, 'first_token_ms': None, 'generation_ms': 0, 'cache_hit': True}
+        else:
+            # Generate document content and stream it to S3
+            document_url, stats = generate_document(workflow_id, job, context, key=cache_key)
         
         # Update workflow with document URL
         current_time = datetime.now().isoformat()
@@ -85,26 +114,36 @@ def lambda_handler(event, context):
             Key={
                 'workflow_id': workflow_id
             },
-            UpdateExpression="set #status = :status, document_url = :url, updated_at = :time, completed_at = :time",
+            UpdateExpression="set #status = :status, document_url = :url, updated_at = :time, completed_at = :time, "
+                             "document_partial = :partial, first_token_ms = :ttfb, generation_ms = :duration, "
+                             "document_cache_hit = :cache_hit",
             ExpressionAttributeNames={
                 '#status': 'status'
             },
             ExpressionAttributeValues={
                 ':status': 'COMPLETED',
                 ':url': document_url,
-                ':time': current_time
+                ':time': current_time,
+                ':partial': stats['partial'],
+                ':ttfb': stats['first_token_ms'],
+                ':duration': stats['generation_ms'],
+                ':cache_hit': stats.get('cache_hit', False)
             }
         )
         
         # Send notification with document link
-        send_document_notification(workflow_id, job, document_url)
+        send_document_notification(workflow_id, job, document_url, partial=stats['partial'])
         
         return {
             'statusCode': 200,
             'body': json.dumps({
                 'message': 'Document generated successfully',
                 'workflow_id': workflow_id,
-                'document_url': document_url
+                'document_url': document_url,
+                'job_url': job.get('job_url'),
+                'partial': stats['partial'],
+                'first_token_ms': stats['first_token_ms'],
+                'cache_hit': stats.get('cache_hit', False)
             })
         }
         
@@ -115,7 +154,7 @@ def lambda_handler(event, context):
         # If we have a workflow ID, update its status to ERROR
         if 'workflow_id' in locals() and workflow_id:
             try:
-                table = boto3.resource('dynamodb').Table(os.environ['WORKFLOW_TABLE'])
+                table = get_table()
                 
                 table.update_item(
                     Key={
@@ -142,60 +181,21 @@ def lambda_handler(event, context):
             })
         }
 
-def generate_document_with_ai(job):
+def build_document_header(job):
     """
-    Generate document content using OpenAI
-    
+    Build the opening part of the HTML document shell
+
     Args:
         job: Job data
-        
+
     Returns:
-        Generated document content as HTML
+        HTML up to and including the job header
     """
     job_title = job.get('title', 'Unknown')
     company = job.get('company', 'Unknown')
     location = job.get('location', 'Unknown')
-    description = job.get('description', 'No description provided')
-    url = job.get('url', '#')
-    
-    # Prepare job data for AI
-    job_text = f"""
-    Title: {job_title}
-    Company: {company}
-    Location: {location}
-    Description: {description}
-    URL: {url}
-    """
-    
-    # Call OpenAI API to generate document
-    try:
-        response = openai.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": """You are an expert job analyst. Your task is to create a detailed analysis of a job posting in HTML format.
-                Include the following sections:
-                1. Job Overview
-                2. Company Analysis
-                3. Key Responsibilities
-                4. Required Skills & Qualifications
-                5. Potential Interview Questions
-                6. Salary Insights (if possible)
-                7. Application Strategy
-                
-                Format the output as clean, well-structured HTML with appropriate headings, paragraphs, and lists.
-                Use a professional tone and provide actionable insights."""},
-                {"role": "user", "content": f"Please analyze this job posting and create a detailed report:\n\n{job_text}"}
-            ],
-            max_tokens=4000,
-            temperature=0.7
-        )
-        
-        # Extract the generated content
-        document_content = response.choices[0].message.content.strip()
-        
-        # Wrap in full HTML document if not already
-        if not document_content.startswith('<!DOCTYPE html>') and not document_content.startswith('<html>'):
-            document_content = f"""<!DOCTYPE html>
+
+    return f"""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
@@ -257,76 +257,350 @@ def generate_document_with_ai(job):
         <p><strong>Generated:</strong> {datetime.now().strftime('%B %d, %Y')}</p>
     </div>
     
-    {document_content}
-    
+"""
+
+def build_document_footer(job, partial=False):
+    """
+    Build the closing part of the HTML document shell
+
+    The posting URL is left out: documents are cached by content and shared
+    by reposts, so the link to the posting is sent with the notification.
+
+    Args:
+        job: Job data
+        partial: Whether the generated content was cut short
+
+    Returns:
+        HTML from the footer to the end of the document
+    """
+    job_title = job.get('title', 'Unknown')
+    company = job.get('company', 'Unknown')
+
+    partial_notice = ''
+    if partial:
+        partial_notice = """
+    <div class="highlight">
+        <p>This analysis is incomplete: generation was interrupted before it finished.</p>
+    </div>
+    """
+
+    return f"""
+    {partial_notice}
     <div class="footer">
         <p>This analysis was generated automatically and should be used as a reference only.</p>
-        <p>Original job posting: <a href="{url}" target="_blank">{job_title} at {company}</a></p>
+        <p>Analysis of the job posting: {job_title} at {company}</p>
     </div>
 </body>
 </html>"""
-        
-        return document_content
-        
-    except Exception as e:
-        print(f"Error calling OpenAI API: {str(e)}")
-        raise Exception(f"Failed to generate document content: {str(e)}")
 
-def upload_document_to_s3(workflow_id, job, document_content):
+def stream_document_with_ai(job, usage=None):
     """
-    Upload document to S3 bucket
-    
+    Stream document content from OpenAI
+
     Args:
-        workflow_id: Workflow ID
         job: Job data
-        document_content: Document content as HTML
-        
+        usage: Optional dict, 'total_tokens' (counted locally) is added to it
+
+    Yields:
+        Chunks of generated HTML as they arrive
+    """
+    # Only the content fields, so the cached document is the same for every repost
+    job_text, prompt_info = format_job_prompt(document_cache.job_content(job), 'document')
+
+    messages = [
+        {"role": "system", "content": """You are an expert job analyst. Your task is to create a detailed analysis of a job posting in HTML format.
+            Include the following sections:
+            1. Job Overview
+            2. Company Analysis
+            3. Key Responsibilities
+            4. Required Skills & Qualifications
+            5. Potential Interview Questions
+            6. Salary Insights (if possible)
+            7. Application Strategy
+            
+            Format the output as clean, well-structured HTML with appropriate headings, paragraphs, and lists.
+            Only return the content of the sections, without <html>, <head> or <body> tags.
+            Use a professional tone and provide actionable insights."""},
+        {"role": "user", "content": f"Please analyze this job posting and create a detailed report:\n\n{job_text}"}
+    ]
+
+    start = time.perf_counter()
+    stream = get_openai_client().chat.completions.create(
+        model="gpt-4",
+        messages=messages,
+        max_tokens=4000,
+        temperature=0.7,
+        stream=True
+    )
+
+    # Streamed completions report no usage, so tokens are counted locally
+    generated = []
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            content = chunk.choices[0].delta.content
+            if content:
+                generated.append(content)
+                yield content
+    finally:
+        prompt_tokens = count_message_tokens(messages)
+        completion_tokens = count_tokens(''.join(generated))
+        if usage is not None:
+            usage['total_tokens'] = prompt_tokens + completion_tokens
+        record_call(
+            'document',
+            prompt_tokens,
+            completion_tokens,
+            (time.perf_counter() - start) * 1000,
+            prompt_info['truncated']
+        )
+
+def generate_section_with_ai(job, title, instructions, max_retries=SECTION_MAX_RETRIES, backoff_factor=2):
+    """
+    Generate a single document section using OpenAI, retrying on failure
+
+    Args:
+        job: Job data
+        title: Section title
+        instructions: Section-specific instructions
+        max_retries: Maximum number of retries
+        backoff_factor: Backoff factor for exponential backoff
+
     Returns:
-        S3 URL for the uploaded document
+        Tuple of (section HTML, total tokens used)
+    """
+    # Only the content fields, so the cached document is the same for every repost
+    job_text, prompt_info = format_job_prompt(document_cache.job_content(job), 'section')
+    retries = 0
+
+    while True:
+        try:
+            response = create_completion(
+                get_openai_client(),
+                'section',
+                prompt_info=prompt_info,
+                model="gpt-4",
+                messages=[
+                    {"role": "system", "content": f"""You are an expert job analyst. Your task is to write the "{title}" section of a detailed job posting analysis in HTML format.
+                    {instructions}
+                    Start the section with <h2>{title}</h2> and use paragraphs and lists as appropriate.
+                    Only return the section, without <html>, <head> or <body> tags.
+                    Use a professional tone and provide actionable insights."""},
+                    {"role": "user", "content": f"Please write the {title} section for this job posting:\n\n{job_text}"}
+                ],
+                max_tokens=800,
+                temperature=0.7
+            )
+            tokens = response.usage.total_tokens if response.usage else 0
+            return response.choices[0].message.content.strip(), tokens
+
+        except Exception as e:
+            retries += 1
+            if retries > max_retries:
+                print(f"Section '{title}' failed after {max_retries} retries: {str(e)}")
+                raise
+
+            sleep_time = backoff_factor ** retries
+            print(f"Section '{title}' failed, retrying in {sleep_time} seconds: {str(e)}")
+            time.sleep(sleep_time)
+
+def stream_sections_with_ai(job, usage=None, context=None):
+    """
+    Generate all document sections concurrently and yield them in order
+
+    At most SECTION_CONCURRENCY requests are in flight at once. Each section
+    is retried on its own; a section that still fails is replaced with a
+    notice instead of failing the whole document. When the Lambda is about
+    to time out, generation stops without waiting for the outstanding
+    sections and 'timed_out' is set in usage.
+
+    Args:
+        job: Job data
+        usage: Optional dict, 'total_tokens' and 'failed_sections' are added to it
+        context: Lambda context, used to stop waiting before the function times out
+
+    Yields:
+        Section HTML in document order
+    """
+    usage = usage if usage is not None else {}
+    usage.setdefault('total_tokens', 0)
+    usage.setdefault('failed_sections', 0)
+
+    executor = ThreadPoolExecutor(max_workers=SECTION_CONCURRENCY)
+    try:
+        futures = [
+            executor.submit(generate_section_with_ai, job, title, instructions)
+            for title, instructions in DOCUMENT_SECTIONS
+        ]
+
+        for (title, _), future in zip(DOCUMENT_SECTIONS, futures):
+            timeout = None
+            if context:
+                timeout = (context.get_remaining_time_in_millis() - TIMEOUT_SAFETY_MARGIN_MS) / 1000
+                if timeout <= 0:
+                    usage['timed_out'] = True
+                    return
+
+            try:
+                content, tokens = future.result(timeout=timeout)
+                usage['total_tokens'] += tokens
+            except FutureTimeoutError:
+                usage['timed_out'] = True
+                return
+            except Exception:
+                usage['failed_sections'] += 1
+                content = f'<h2>{title}</h2>\n<p class="highlight">This section could not be generated.</p>'
+
+            yield f'<div class="section">\n{content}\n</div>\n'
+    finally:
+        # Do not wait for sections still being generated (or retried) once we stop
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_document_version():
+    """
+    Get the version identifier included in document cache keys
+
+    Returns:
+        Version string covering the prompts, HTML template and generation mode
+    """
+    return f"{PROMPT_VERSION}:{TEMPLATE_VERSION}:{DOCUMENT_GENERATION_MODE}"
+
+def generate_document_key(job):
+    """
+    Generate a unique object key for a job document
+
+    Args:
+        job: Job data
+
+    Returns:
+        Object key
     """
-    s3 = boto3.client('s3')
-    bucket_name = os.environ['DOCUMENT_BUCKET']
-    
-    # Generate a unique filename
     job_title = job.get('title', 'Unknown').replace(' ', '_')
     company = job.get('company', 'Unknown').replace(' ', '_')
     timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
     unique_id = str(uuid.uuid4())[:8]
-    
-    filename = f"{job_title}_{company}_{timestamp}_{unique_id}.html"
-    
-    # Upload to S3
+
+    return f"{job_title}_{company}_{timestamp}_{unique_id}.html"
+
+def generate_document_url(key):
+    """
+    Generate a URL for a stored document
+
+    Args:
+        key: Object key (or local path when using the file stand-in)
+
+    Returns:
+        Pre-signed S3 URL that expires in 7 days, or a file URL for local runs
+    """
+    if os.environ.get('DOCUMENT_OUTPUT_DIR'):
+        return f"file://{os.path.abspath(key)}"
+
+    s3 = get_client('s3')
+    return s3.generate_presigned_url(
+        'get_object',
+        Params={
+            'Bucket': os.environ['DOCUMENT_BUCKET'],
+            'Key': key
+        },
+        ExpiresIn=604800  # 7 days in seconds
+    )
+
+def generate_document(workflow_id, job, context=None, key=None):
+    """
+    Generate a document and stream it to storage as it is produced
+
+    The HTML header is written before OpenAI is called and every chunk is
+    appended as it arrives. If generation fails or the Lambda is about to
+    time out after content has started arriving, the document is closed
+    with a notice so the partial analysis is still available.
+
+    Args:
+        workflow_id: Workflow ID
+        job: Job data
+        context: Lambda context, used to stop before the function times out
+        key: Object key to write to, defaults to a unique key for the job.
+             Incomplete documents are moved to a unique key so they are never cached.
+
+    Returns:
+        Tuple of (document URL, generation stats)
+    """
+    key = key or generate_document_key(job)
+    start_time = time.monotonic()
+    first_token_ms = None
+    partial = False
+    usage = {}
+
+    writer = open_document_writer(key, metadata={
+        'workflow_id': workflow_id,
+        'job_id': job.get('id', 'unknown'),
+        'job_title': job.get('title', 'Unknown'),
+        'company': job.get('company', 'Unknown')
+    })
+
+    if DOCUMENT_GENERATION_MODE == 'sections':
+        content_source = stream_sections_with_ai(job, usage, context)
+    else:
+        content_source = stream_document_with_ai(job, usage)
+
     try:
-        s3.put_object(
-            Bucket=bucket_name,
-            Key=filename,
-            Body=document_content,
-            ContentType='text/html',
-            Metadata={
-                'workflow_id': workflow_id,
-                'job_id': job.get('id', 'unknown'),
-                'job_title': job.get('title', 'Unknown'),
-                'company': job.get('company', 'Unknown')
-            }
-        )
-        
-        # Generate a pre-signed URL that expires in 7 days
-        url = s3.generate_presigned_url(
-            'get_object',
-            Params={
-                'Bucket': bucket_name,
-                'Key': filename
-            },
-            ExpiresIn=604800  # 7 days in seconds
-        )
-        
-        return url
-        
-    except Exception as e:
-        print(f"Error uploading to S3: {str(e)}")
-        raise Exception(f"Failed to upload document to S3: {str(e)}")
+        writer.write(build_document_header(job))
+
+        try:
+            for content in content_source:
+                if first_token_ms is None:
+                    first_token_ms = int((time.monotonic() - start_time) * 1000)
+                    print(f"Time to first token for workflow {workflow_id}: {first_token_ms} ms")
+
+                writer.write(content)
+
+                if context and context.get_remaining_time_in_millis() < TIMEOUT_SAFETY_MARGIN_MS:
+                    print(f"Stopping generation for workflow {workflow_id} before Lambda timeout")
+                    partial = True
+                    break
+        except Exception as e:
+            print(f"Error calling OpenAI API: {str(e)}")
+            if first_token_ms is None:
+                raise Exception(f"Failed to generate document content: {str(e)}")
+            partial = True
+        finally:
+            # Stop the source now rather than when it is garbage collected
+            content_source.close()
+
+        if usage.get('timed_out'):
+            print(f"Stopping generation for workflow {workflow_id} before Lambda timeout")
+            if first_token_ms is None:
+                raise Exception("Failed to generate document content before the Lambda timeout")
+            partial = True
 
-def send_document_notification(workflow_id, job, document_url):
+        if usage.get('failed_sections', 0) == len(DOCUMENT_SECTIONS):
+            raise Exception("Failed to generate document content: every section failed")
+
+        writer.write(build_document_footer(job, partial=partial))
+        location = writer.close()
+
+    except Exception:
+        writer.abort()
+        raise
+
+    stats = {
+        'first_token_ms': first_token_ms,
+        'generation_ms': int((time.monotonic() - start_time) * 1000),
+        'bytes_written': writer.bytes_written,
+        'partial': partial or usage.get('failed_sections', 0) > 0,
+        'mode': DOCUMENT_GENERATION_MODE,
+        'total_tokens': usage.get('total_tokens')
+    }
+
+    if stats['partial'] and key.startswith(document_cache.CACHE_PREFIX):
+        location = document_cache.discard(location, generate_document_key(job))
+
+    print(f"Generated document for workflow {workflow_id}: {stats}")
+
+    return generate_document_url(location), stats
+
+def send_document_notification(workflow_id, job, document_url, partial=False):
     """
     Send notification with document link
     
@@ -334,16 +608,23 @@ def send_document_notification(workflow_id, job, document_url):
         workflow_id: Workflow ID
         job: Job data
         document_url: URL to the generated document
+        partial: Whether the document generation was cut short
     """
-    sns = boto3.client('sns')
+    sns = get_client('sns')
     
     job_title = job.get('title', 'Unknown')
     company = job.get('company', 'Unknown')
+    job_url = job.get('job_url', 'Unknown')
+    
+    status_line = "Your job analysis document is ready!"
+    if partial:
+        status_line = "Your job analysis document is ready, but generation was interrupted and it is incomplete."
     
     message = f"""
-    Your job analysis document is ready!
+    {status_line}
     
     Job: {job_title} at {company}
+    Job posting: {job_url}
     
     You can view your document here:
     {document_url}
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from shared.clients import get_client
+
+# Cached documents live under this prefix; the bucket lifecycle rule for it expires
+# objects that have not been accessed (copied in place on every hit) recently
+CACHE_PREFIX = 'cache/'
+
+# Job fields that determine the generated document. Nothing specific to one posting (its URL
+# or ID) is written into the document, so an identical repost reuses it
+CONTENT_FIELDS = ('title', 'company', 'location', 'description')
+
+# Hits and misses seen by this Lambda container
+cache_stats = {'hits': 0, 'misses': 0}
+
+def normalize_field(value):
+    """Normalize a job field so formatting-only differences hash the same"""
+    if value is None:
+        return ''
+    return ' '.join(str(value).split()).casefold()
+
+def job_content(job):
+    """
+    Get the fields of a job that determine its document
+
+    Args:
+        job: Job data
+
+    Returns:
+        Dict of the content fields, used to prompt for cacheable documents
+    """
+    return {field: job.get(field) for field in CONTENT_FIELDS}
+
+def content_key(job, version):
+    """
+    Compute the content-addressed key for a job document
+
+    Args:
+        job: Job data
+        version: Prompt / template version the document is generated with
+
+    Returns:
+        Object key derived from the normalized job content and version
+    """
+    content = {field: normalize_field(job.get(field)) for field in CONTENT_FIELDS}
+    content['version'] = version
+    digest = hashlib.sha256(json.dumps(content, sort_keys=True).encode('utf-8')).hexdigest()
+    return f"{CACHE_PREFIX}{digest}.html"
+
+def lookup(key):
+    """
+    Look up a cached document and refresh its LRU metadata on a hit
+
+    Args:
+        key: Content-addressed object key
+
+    Returns:
+        Location of the cached document, or None on a miss
+    """
+    output_dir = os.environ.get('DOCUMENT_OUTPUT_DIR')
+    if output_dir:
+        location = _lookup_local(output_dir, key)
+    else:
+        location = _lookup_s3(os.environ['DOCUMENT_BUCKET'], key)
+
+    record_lookup(location is not None)
+    return location
+
+def _lookup_local(output_dir, key):
+    """Look up a document written by the local file stand-in"""
+    path = os.path.join(output_dir, key)
+    if not os.path.exists(path):
+        return None
+
+    # Touch the file so the modification time tracks the last access
+    os.utime(path)
+    return path
+
+def _lookup_s3(bucket_name, key):
+    """Look up a document in S3, copying it in place to record the access"""
+    from botocore.exceptions import ClientError
+
+    s3 = get_client('s3')
+
+    try:
+        head = s3.head_object(Bucket=bucket_name, Key=key)
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+            return None
+        raise
+
+    metadata = head.get('Metadata', {})
+    metadata['last-accessed'] = datetime.now().isoformat()
+    metadata['hit-count'] = str(int(metadata.get('hit-count', '0')) + 1)
+
+    # Copying the object onto itself resets LastModified, which is what the
+    # lifecycle expiration counts from, so eviction follows least recent use
+    try:
+        s3.copy_object(
+            Bucket=bucket_name,
+            Key=key,
+            CopySource={'Bucket': bucket_name, 'Key': key},
+            ContentType=head.get('ContentType', 'text/html'),
+            Metadata=metadata,
+            MetadataDirective='REPLACE'
+        )
+    except Exception as e:
+        # The document is still usable, it just ages out sooner
+        print(f"Error refreshing cache metadata for {key}: {str(e)}")
+
+    return key
+
+def discard(location, key):
+    """
+    Move a document out of the cache, e.g. because it is incomplete
+
+    Args:
+        location: Current location of the document in the cache
+        key: Key to move the document to
+
+    Returns:
+        New location of the document
+    """
+    output_dir = os.environ.get('DOCUMENT_OUTPUT_DIR')
+    if output_dir:
+        path = os.path.join(output_dir, key)
+        os.replace(location, path)
+        return path
+
+    s3 = get_client('s3')
+    bucket_name = os.environ['DOCUMENT_BUCKET']
+    s3.copy_object(Bucket=bucket_name, Key=key, CopySource={'Bucket': bucket_name, 'Key': location})
+    s3.delete_object(Bucket=bucket_name, Key=location)
+    return key
+
+def record_lookup(hit):
+    """
+    Count a cache lookup and emit it as a CloudWatch embedded metric
+
+    Args:
+        hit: Whether the lookup was a hit
+    """
+    cache_stats['hits' if hit else 'misses'] += 1
+    total = cache_stats['hits'] + cache_stats['misses']
+
+    print(json.dumps({
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': 'JobAssistant/DocumentCache',
+                'Dimensions': [[]],
+                'Metrics': [
+                    {'Name': 'CacheHit', 'Unit': 'Count'},
+                    {'Name': 'CacheMiss', 'Unit': 'Count'}
+                ]
+            }]
+        },
+        'CacheHit': 1 if hit else 0,
+        'CacheMiss': 0 if hit else 1,
+        'container_hit_rate': round(cache_stats['hits'] / total, 3)
+    }))
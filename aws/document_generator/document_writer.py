@@ -0,0 +1,183 @@
+import os
+import uuid
+from shared.clients import get_client
+
+# S3 rejects multipart parts smaller than 5 MiB (except the last one)
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+class S3MultipartWriter:
+    """
+    Incrementally writes a document to S3 using a multipart upload
+
+    Text is buffered until a full part is available, so at most one part
+    is held in memory regardless of the document size. The multipart
+    upload is only started once the first part fills up; a document
+    smaller than a part (which is nearly every analysis) is stored with a
+    single put_object on close.
+    """
+
+    def __init__(self, bucket_name, key, content_type='text/html', metadata=None, part_size=MIN_PART_SIZE):
+        """
+        Prepare the upload
+
+        Args:
+            bucket_name: Target S3 bucket
+            key: Target object key
+            content_type: Content type of the object
+            metadata: Object metadata
+            part_size: Size in bytes at which a buffered part is uploaded
+        """
+        self.s3 = get_client('s3')
+        self.bucket_name = bucket_name
+        self.key = key
+        self.content_type = content_type
+        self.metadata = metadata or {}
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.buffer = bytearray()
+        self.parts = []
+        self.bytes_written = 0
+        self.upload_id = None
+
+    def write(self, text):
+        """Append text to the document, uploading full parts as they fill up"""
+        data = text.encode('utf-8')
+        self.buffer.extend(data)
+        self.bytes_written += len(data)
+
+        if len(self.buffer) >= self.part_size:
+            self._upload_part()
+
+    def _upload_part(self):
+        """Upload the buffered bytes as the next part, starting the multipart upload if needed"""
+        if self.upload_id is None:
+            response = self.s3.create_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=self.key,
+                ContentType=self.content_type,
+                Metadata=self.metadata
+            )
+            self.upload_id = response['UploadId']
+
+        part_number = len(self.parts) + 1
+        response = self.s3.upload_part(
+            Bucket=self.bucket_name,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=bytes(self.buffer)
+        )
+        self.parts.append({'ETag': response['ETag'], 'PartNumber': part_number})
+        self.buffer = bytearray()
+
+    def close(self):
+        """
+        Upload the remaining buffer and complete the upload
+
+        Returns:
+            S3 key of the completed object
+        """
+        if self.upload_id is None:
+            self.s3.put_object(
+                Bucket=self.bucket_name,
+                Key=self.key,
+                Body=bytes(self.buffer),
+                ContentType=self.content_type,
+                Metadata=self.metadata
+            )
+            self.buffer = bytearray()
+            return self.key
+
+        if self.buffer:
+            self._upload_part()
+
+        self.s3.complete_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={'Parts': self.parts}
+        )
+        return self.key
+
+    def abort(self):
+        """Abort the upload and discard any uploaded parts"""
+        self.buffer = bytearray()
+        if self.upload_id is None:
+            return
+        try:
+            self.s3.abort_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=self.key,
+                UploadId=self.upload_id
+            )
+        except Exception as e:
+            print(f"Error aborting multipart upload: {str(e)}")
+
+class LocalFileWriter:
+    """
+    File-backed stand-in for S3MultipartWriter used for local runs
+
+    Every write is flushed to a temporary file next to the document, so a
+    partially generated document is visible on disk while the generation is
+    still in progress. The file is only moved to its final path on close,
+    so an interrupted run never leaves a truncated document there.
+    """
+
+    def __init__(self, output_dir, key):
+        """
+        Open the output file
+
+        Args:
+            output_dir: Directory the document is written to
+            key: File name of the document
+        """
+        self.key = key
+        self.path = os.path.join(output_dir, key)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.temp_path = f"{self.path}.{uuid.uuid4().hex[:8]}.tmp"
+        self.file = open(self.temp_path, 'w', encoding='utf-8')
+        self.bytes_written = 0
+
+    def write(self, text):
+        """Append text to the document"""
+        self.file.write(text)
+        self.file.flush()
+        self.bytes_written += len(text.encode('utf-8'))
+
+    def close(self):
+        """
+        Close the document
+
+        Returns:
+            Path of the written file
+        """
+        self.file.close()
+        os.replace(self.temp_path, self.path)
+        return self.path
+
+    def abort(self):
+        """Close and remove the document"""
+        self.file.close()
+        try:
+            os.remove(self.temp_path)
+        except OSError:
+            pass
+
+def open_document_writer(key, metadata=None):
+    """
+    Open a writer for a new document
+
+    Uses the local file stand-in when DOCUMENT_OUTPUT_DIR is set,
+    otherwise writes to DOCUMENT_BUCKET with S3MultipartWriter.
+
+    Args:
+        key: Object key / file name of the document
+        metadata: Object metadata
+
+    Returns:
+        Document writer
+    """
+    output_dir = os.environ.get('DOCUMENT_OUTPUT_DIR')
+    if output_dir:
+        return LocalFileWriter(output_dir, key)
+
+    return S3MultipartWriter(os.environ['DOCUMENT_BUCKET'], key, metadata=metadata)
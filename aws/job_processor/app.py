@@ -1,13 +1,13 @@
 import json
-import boto3
-import openai
 import os
+import uuid
 from datetime import datetime, timedelta
 import traceback
 from typing import List, Dict, Any
-
-# Initialize OpenAI client
-openai.api_key = os.environ.get('OPENAI_API_KEY')
+from shared.clients import get_client, get_table, get_openai_client
+from shared.prompts import format_job_prompt, create_completion
+from ranking import get_ranker, RANKING_TOP_K, RANKING_MIN_SCORE
+import shared.models as job_models
 
 def lambda_handler(event, context):
     """
@@ -44,20 +44,30 @@ def lambda_handler(event, context):
                 'filtered_count': 0
             })
         
+        # In digest mode all jobs of this request share a batch and one notification
+        digest = os.environ.get('NOTIFICATION_MODE', 'per_job') == 'digest'
+        batch_id = f"batch-{int(datetime.now().timestamp())}-{uuid.uuid4().hex[:8]}" if digest else None
+        
         # For each filtered job, create a workflow
         workflow_ids = []
         for job in filtered_jobs:
             # Create workflow record in DynamoDB
-            workflow_id = create_workflow(job)
+            workflow_id = create_workflow(job, batch_id)
             workflow_ids.append(workflow_id)
             
             # Send notification to user
-            send_notification(workflow_id, job)
+            if not digest:
+                send_notification(workflow_id, job)
+        
+        if digest:
+            send_digest_notification(batch_id, filtered_jobs)
         
         return generate_api_response(200, {
             'message': f'Processed {len(filtered_jobs)} matching jobs',
             'filtered_count': len(filtered_jobs),
-            'workflow_ids': workflow_ids
+            'workflow_ids': workflow_ids,
+            'batch_id': batch_id,
+            'notifications_sent': 1 if digest else len(filtered_jobs)
         })
         
     except Exception as e:
@@ -80,6 +90,7 @@ def filter_jobs_with_ai(payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         List of filtered job records
     """
     filtered_jobs = []
+    records = []
     
     for payload in payloads:
         # Skip non-INSERT and non-UPDATE payloads
@@ -89,21 +100,47 @@ def filter_jobs_with_ai(payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         # Skip payloads without a record
         if 'record' not in payload or not payload['record']:
             continue
+        
+        # Skip updates that did not change the posting (e.g. only updated_at)
+        if payload['type'] == 'UPDATE' and job_models.is_noop_update(payload['record'], payload.get('old_record')):
+            continue
             
-        job = payload['record']
+        # Validate the record with the shared decoder (timestamps are parsed once here)
+        try:
+            records.append(job_models.decode_job_record(payload['record']))
+        except job_models.JobRecordValidationError as e:
+            print(f"Skipping invalid job record: {str(e)}")
+            continue
+    
+    # Evaluate each job URL once (its latest version), even if the batch updated it several times
+    batch = job_models.JobBatch.from_records(records).dedup('job_url', keep='last')
+    if len(batch) < len(records):
+        print(f"Skipping {len(records) - len(batch)} duplicate job records")
+    
+    jobs = [records[i].to_dict() for i in batch.indices()]
+    
+    # Rank against the candidate profile so only the best matches reach the LLM
+    ranker = get_ranker()
+    if ranker is not None:
+        ranked = ranker.top_k(jobs, RANKING_TOP_K, RANKING_MIN_SCORE)
+        for score, job in ranked:
+            print(f"Ranked job {job.get('id')}: {score:.3f}")
+        print(f"Kept top {len(ranked)} of {len(jobs)} jobs by profile match")
+        jobs = [job for _, job in ranked]
         
-        # Prepare job data for AI evaluation
-        job_text = f"""
-        Title: {job.get('title', 'Unknown')}
-        Company: {job.get('company', 'Unknown')}
-        Location: {job.get('location', 'Unknown')}
-        Description: {job.get('description', 'No description')}
-        URL: {job.get('url', 'No URL')}
-        """
+        if os.environ.get('RANKING_LLM_FILTER', 'true').lower() != 'true':
+            return jobs
+    
+    for job in jobs:
+        # Prepare job data for AI evaluation, with the description fitted to the filter budget
+        job_text, prompt_info = format_job_prompt(job, 'filter')
         
         try:
             # Call OpenAI API to evaluate job
-            response = openai.chat.completions.create(
+            response = create_completion(
+                get_openai_client(),
+                'filter',
+                prompt_info=prompt_info,
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "You are a job filtering assistant. You evaluate job postings to determine if they match specific criteria. Respond with only YES or NO."},
@@ -127,18 +164,18 @@ def filter_jobs_with_ai(payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     
     return filtered_jobs
 
-def create_workflow(job: Dict[str, Any]) -> str:
+def create_workflow(job: Dict[str, Any], batch_id: str = None) -> str:
     """
     Create a workflow record in DynamoDB
     
     Args:
         job: Job record data
+        batch_id: Digest batch the workflow belongs to, if any
         
     Returns:
         Workflow ID
     """
-    dynamodb = boto3.resource('dynamodb')
-    table = dynamodb.Table(os.environ['WORKFLOW_TABLE'])
+    table = get_table()
     
     # Generate a unique workflow ID
     workflow_id = f"wf-{job['id']}-{int(datetime.now().timestamp())}"
@@ -160,6 +197,10 @@ def create_workflow(job: Dict[str, Any]) -> str:
         'expires_at': int(expiration_time.timestamp())
     }
     
+    # Only batched workflows carry batch_id, which keeps the batch index sparse
+    if batch_id:
+        workflow_item['batch_id'] = batch_id
+    
     # Save to DynamoDB
     table.put_item(Item=workflow_item)
     
@@ -175,7 +216,7 @@ def send_notification(workflow_id: str, job: Dict[str, Any]):
         workflow_id: Workflow ID
         job: Job record data
     """
-    sns = boto3.client('sns')
+    sns = get_client('sns')
     
     api_base_url = os.environ['API_BASE_URL']
     
@@ -215,6 +256,44 @@ def send_notification(workflow_id: str, job: Dict[str, Any]):
     
     print(f"Sent notification for workflow {workflow_id}, MessageId: {response['MessageId']}")
 
+def send_digest_notification(batch_id: str, jobs: List[Dict[str, Any]]):
+    """
+    Send one notification for all jobs of a batch, linking to the batch approval page
+    
+    Args:
+        batch_id: Batch ID
+        jobs: Job record data of the batch's workflows
+    """
+    sns = get_client('sns')
+    
+    api_base_url = os.environ['API_BASE_URL']
+    batch_url = f"{api_base_url}/batch?batch_id={batch_id}"
+    
+    job_lines = '\n'.join(
+        f"    {i}. {job.get('title', 'Unknown')} at {job.get('company', 'Unknown')} ({job.get('location', 'Unknown')})"
+        for i, job in enumerate(jobs, 1)
+    )
+    
+    message = f"""
+    {len(jobs)} new job opportunities found!
+    
+{job_lines}
+    
+    To review and approve them, open:
+    {batch_url}
+    
+    These requests will expire in 5 minutes.
+    """
+    
+    # Send SNS notification
+    response = sns.publish(
+        TopicArn=os.environ['SNS_TOPIC_ARN'],
+        Message=message,
+        Subject=f"{len(jobs)} New Job Opportunities"
+    )
+    
+    print(f"Sent digest notification for batch {batch_id} ({len(jobs)} jobs), MessageId: {response['MessageId']}")
+
 def generate_api_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
     """
     Generate API Gateway response
@@ -0,0 +1,370 @@
+import heapq
+import json
+import os
+import re
+import zlib
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+# Candidate profile: a local JSON file or an s3://bucket/key object
+RANKING_PROFILE = os.environ.get('RANKING_PROFILE', '')
+RANKING_TOP_K = int(os.environ.get('RANKING_TOP_K', 10))
+RANKING_MIN_SCORE = float(os.environ.get('RANKING_MIN_SCORE', 0.05))
+
+# Hashed feature space; collisions at this size only add a little noise to the scores
+N_FEATURES = 2 ** 20
+
+# Title words count this many times, the title says more about the role than the body
+TITLE_WEIGHT = 3
+
+# Keeps tech terms such as c++, c#, node.js and ci/cd whole
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9]')
+
+# Words with no signal for matching a posting to a profile
+STOP_WORDS = frozenset("""
+a about all also an and any are as at be been but by can do for from has have if in into is it its
+may more most not of on or our over such that the their them there these they this to up us was we
+were what when which who will with within without you your
+""".split())
+
+# token -> 32-bit hash, shared by all rankers in the process
+_token_hashes: Dict[str, int] = {}
+_MAX_CACHED_TOKENS = 500000
+
+_profile = None
+_profile_source = None
+_ranker = None
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase terms of a text, without stop words"""
+    if not text:
+        return []
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+def _token_hash(token: str) -> int:
+    value = _token_hashes.get(token)
+    if value is None:
+        if len(_token_hashes) >= _MAX_CACHED_TOKENS:
+            _token_hashes.clear()
+        value = _token_hashes[token] = zlib.crc32(token.encode('utf-8'))
+    return value
+
+def term_counts(text: str, title: str = '') -> Counter:
+    """
+    Count the unigrams and bigrams of a document
+
+    Args:
+        text: Document text
+        title: Title, counted TITLE_WEIGHT times
+
+    Returns:
+        Counter of terms (str for unigrams, tuple for bigrams)
+    """
+    tokens = tokenize(text)
+    counts = Counter(tokens)
+    counts.update(zip(tokens, tokens[1:]))
+
+    title_tokens = tokenize(title)
+    for _ in range(TITLE_WEIGHT):
+        counts.update(title_tokens)
+        counts.update(zip(title_tokens, title_tokens[1:]))
+    return counts
+
+def hash_terms(counts: Counter, n_features: int = N_FEATURES) -> Tuple[List[int], List[int]]:
+    """
+    Map term counts to hashed feature indices
+
+    Args:
+        counts: Counter from term_counts
+        n_features: Size of the feature space (a power of two)
+
+    Returns:
+        Tuple of (feature indices, counts)
+    """
+    mask = n_features - 1
+    features = []
+    for term in counts:
+        if term.__class__ is str:
+            features.append(_token_hash(term) & mask)
+        else:
+            features.append(((_token_hash(term[0]) * 0x01000193) ^ _token_hash(term[1])) & mask)
+    return features, list(counts.values())
+
+def job_document(job: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Text of a job used for ranking
+
+    Args:
+        job: Job data
+
+    Returns:
+        Tuple of (body text, title)
+    """
+    body = ' '.join(job.get(field) or '' for field in ('company', 'location', 'description'))
+    return body, job.get('title') or ''
+
+class CandidateProfile:
+    """
+    Candidate profile to rank jobs against
+
+    A profile is a list of weighted documents, e.g. one per target role or
+    one for the skills summary. A job's score is its best weighted cosine
+    similarity with any of them.
+    """
+
+    def __init__(self, documents: List[Tuple[str, float]]):
+        """
+        Create a profile
+
+        Args:
+            documents: (text, weight) pairs
+        """
+        self.documents = [(text, float(weight)) for text, weight in documents if text and text.strip()]
+        if not self.documents:
+            raise ValueError("Candidate profile has no documents")
+
+    @classmethod
+    def from_dict(cls, data: Any) -> 'CandidateProfile':
+        """
+        Create a profile from its JSON form
+
+        Accepts {"documents": [{"text": ..., "weight": ...}, ...]}, where a
+        document may also be a plain string (weight 1.0), or just the list.
+
+        Args:
+            data: Parsed profile JSON
+
+        Returns:
+            CandidateProfile
+        """
+        documents = data.get('documents', []) if isinstance(data, dict) else data
+        parsed = []
+        for document in documents:
+            if isinstance(document, str):
+                parsed.append((document, 1.0))
+            else:
+                parsed.append((document.get('text', ''), document.get('weight', 1.0)))
+        return cls(parsed)
+
+def load_profile(source: str = None) -> Optional[CandidateProfile]:
+    """
+    Load the candidate profile, kept at module level for warm invocations
+
+    Args:
+        source: Local path or s3://bucket/key, defaults to RANKING_PROFILE
+
+    Returns:
+        CandidateProfile, or None if no profile is configured or it cannot be read
+    """
+    global _profile, _profile_source
+    source = source if source is not None else RANKING_PROFILE
+    if not source:
+        return None
+    if _profile is not None and _profile_source == source:
+        return _profile
+
+    try:
+        if source.startswith('s3://'):
+            from shared.clients import get_client
+            bucket, _, key = source[len('s3://'):].partition('/')
+            body = get_client('s3').get_object(Bucket=bucket, Key=key)['Body'].read()
+            data = json.loads(body)
+        else:
+            with open(source, encoding='utf-8') as f:
+                data = json.load(f)
+        _profile = CandidateProfile.from_dict(data)
+        _profile_source = source
+    except Exception as e:
+        print(f"Error loading candidate profile from {source}, ranking disabled: {str(e)}")
+        return None
+
+    print(f"Loaded candidate profile with {len(_profile.documents)} documents from {source}")
+    return _profile
+
+def get_ranker() -> Optional['JobRanker']:
+    """
+    Get the ranker for the configured profile, kept at module level for warm invocations
+
+    Returns:
+        JobRanker, or None if ranking is disabled
+    """
+    global _ranker
+    profile = load_profile()
+    if profile is None:
+        return None
+    if _ranker is None or _ranker.profile is not profile:
+        _ranker = JobRanker(profile)
+    return _ranker
+
+class TopK:
+    """Bounded min-heap keeping the k highest-scoring items"""
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._count = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @property
+    def threshold(self) -> float:
+        """Score an item must beat to enter a full heap"""
+        return self._heap[0][0] if len(self._heap) >= self.k else float('-inf')
+
+    def push(self, score: float, item: Any):
+        """Offer an item; ties keep the item offered first"""
+        if self.k <= 0:
+            return
+        # The sequence number keeps items out of comparisons and makes ties stable
+        self._count += 1
+        entry = (score, -self._count, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> List[Tuple[float, Any]]:
+        """(score, item) pairs, highest score first"""
+        return [(score, item) for score, _, item in sorted(self._heap, reverse=True)]
+
+class JobRanker:
+    """
+    Ranks jobs against a candidate profile with hashed TF-IDF features
+
+    Jobs and profile documents are turned into sparse vectors of unigram
+    and bigram counts (the hashing trick, so there is no vocabulary to
+    store), weighted by sublinear TF and by IDF over the jobs being ranked.
+    The profile stays sparse: its features and TF weights are computed once
+    per ranker (kept for warm invocations by get_ranker), and only the IDF
+    weighting is applied per call. Scoring looks every job term up in each
+    profile document with a binary search, done in NumPy. Runs offline on
+    CPU; no model download.
+    """
+
+    def __init__(self, profile: CandidateProfile, n_features: int = N_FEATURES):
+        """
+        Create a ranker
+
+        Args:
+            profile: Candidate profile
+            n_features: Size of the hashed feature space (a power of two)
+        """
+        if n_features & (n_features - 1):
+            raise ValueError(f"n_features must be a power of two, got {n_features}")
+        self.profile = profile
+        self.n_features = n_features
+        self.weights = [weight for _, weight in profile.documents]
+        self._profile_terms = [self._sparse_tf(*hash_terms(term_counts(text), n_features))
+                               for text, _ in profile.documents]
+
+    @staticmethod
+    def _sparse_tf(features: List[int], counts: List[int]):
+        """Sorted unique features and their summed sublinear TF (hash collisions add up)"""
+        import numpy as np
+
+        unique, inverse = np.unique(np.array(features, dtype=np.int64), return_inverse=True)
+        tf = np.bincount(inverse, weights=1.0 + np.log(np.array(counts, dtype=np.float64)), minlength=len(unique))
+        return unique, tf.astype(np.float32)
+
+    def _encode(self, jobs: List[Dict[str, Any]]):
+        """Sparse (row lengths, features, counts) of jobs"""
+        import numpy as np
+
+        lengths = []
+        features = []
+        counts = []
+        for job in jobs:
+            body, title = job_document(job)
+            job_features, job_counts = hash_terms(term_counts(body, title), self.n_features)
+            lengths.append(len(job_features))
+            features.extend(job_features)
+            counts.extend(job_counts)
+
+        return (
+            np.array(lengths, dtype=np.int64),
+            np.array(features, dtype=np.int64),
+            np.array(counts, dtype=np.float32)
+        )
+
+    def score(self, jobs: List[Dict[str, Any]]):
+        """
+        Score jobs against the profile
+
+        Args:
+            jobs: Job data
+
+        Returns:
+            NumPy array of scores in [0, 1] (times the profile weights), one per job
+        """
+        import numpy as np
+
+        if not jobs:
+            return np.zeros(0, dtype=np.float32)
+        return self._score_encoded(*self._encode(jobs))
+
+    def _score_encoded(self, lengths, features, counts):
+        """Scores of jobs encoded by _encode"""
+        import numpy as np
+
+        n = len(lengths)
+        if not len(features):
+            return np.zeros(n, dtype=np.float64)
+
+        # Smoothed IDF over the jobs being ranked: terms in every posting carry little signal
+        job_features, inverse, document_frequency = np.unique(features, return_inverse=True, return_counts=True)
+        idf = (np.log((1.0 + n) / (1.0 + document_frequency)) + 1.0).astype(np.float32)
+
+        values = (1.0 + np.log(counts)) * idf[inverse]
+        rows = np.repeat(np.arange(n), lengths)
+        norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=n))
+        norms[norms == 0] = 1.0
+
+        similarity = np.zeros((len(self._profile_terms), n), dtype=np.float64)
+        for i, (profile_features, profile_tf) in enumerate(self._profile_terms):
+            if not len(profile_features):
+                continue
+
+            # IDF-weight and L2-normalize the profile document; its terms absent from the jobs get full IDF
+            position = np.minimum(np.searchsorted(job_features, profile_features), len(job_features) - 1)
+            shared = job_features[position] == profile_features
+            profile_df = np.where(shared, document_frequency[position], 0)
+            profile_values = profile_tf * (np.log((1.0 + n) / (1.0 + profile_df)) + 1.0).astype(np.float32)
+            norm = np.linalg.norm(profile_values)
+            if norm:
+                profile_values /= norm
+
+            # Profile weight of every distinct job term (zero if the profile lacks it), gathered per job term
+            term_weights = np.zeros(len(job_features), dtype=np.float32)
+            term_weights[position[shared]] = profile_values[shared]
+            similarity[i] = np.bincount(rows, weights=term_weights[inverse] * values, minlength=n)
+
+        similarity /= norms
+        return (similarity * np.array(self.weights)[:, None]).max(axis=0)
+
+    def top_k(self, jobs: List[Dict[str, Any]], k: int, min_score: float = 0.0) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Keep the k jobs that best match the profile
+
+        Args:
+            jobs: Job data
+            k: Number of jobs to keep
+            min_score: Jobs scoring below this are dropped even if there is room
+
+        Returns:
+            (score, job) pairs, best match first
+        """
+        import numpy as np
+
+        heap = TopK(k)
+        if not jobs or k <= 0:
+            return []
+
+        scores = self.score(jobs)
+        # Only the k best scores can stay in the heap, so select them with argpartition instead of pushing every job
+        candidates = np.flatnonzero(scores >= min_score)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        for i in sorted(candidates):
+            heap.push(float(scores[i]), jobs[i])
+        return heap.items()
@@ -0,0 +1,156 @@
+import os
+import threading
+
+# boto3 / botocore and openai are imported on first use rather than at module
+# level, so cold starts that end early (validation errors, empty batches)
+# never pay for loading the SDKs
+
+AWS_MAX_POOL_CONNECTIONS = int(os.environ.get('AWS_MAX_POOL_CONNECTIONS', 20))
+OPENAI_MAX_CONNECTIONS = int(os.environ.get('OPENAI_MAX_CONNECTIONS', 10))
+
+# Clients live at module level so they survive across warm invocations of the container
+_lock = threading.Lock()
+_session = None
+_boto_config = None
+_clients = {}
+_resources = {}
+_tables = {}
+_openai_client = None
+
+# Number of clients / resources constructed per service, for instrumentation
+construction_counts = {}
+
+def _count_construction(name: str):
+    construction_counts[name] = construction_counts.get(name, 0) + 1
+
+def _get_session():
+    """Get the shared boto3 session (the default session is not thread-safe)"""
+    global _session
+    if _session is None:
+        import boto3
+        _session = boto3.session.Session()
+    return _session
+
+def _get_boto_config():
+    """
+    Get the shared botocore configuration
+
+    Uses a larger connection pool for concurrent callers (e.g. parallel
+    section generation) and TCP keep-alive so warm invocations reuse
+    connections instead of paying for a new TLS handshake.
+    """
+    global _boto_config
+    if _boto_config is None:
+        from botocore.config import Config
+        _boto_config = Config(
+            max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+            tcp_keepalive=True,
+            connect_timeout=5,
+            read_timeout=60,
+            retries={'max_attempts': 3, 'mode': 'standard'}
+        )
+    return _boto_config
+
+def get_client(service_name: str):
+    """
+    Get a shared boto3 client, creating it on first use
+
+    Args:
+        service_name: AWS service name, e.g. 's3' or 'sns'
+
+    Returns:
+        boto3 client
+    """
+    client = _clients.get(service_name)
+    if client is not None:
+        return client
+
+    with _lock:
+        if service_name not in _clients:
+            _clients[service_name] = _get_session().client(service_name, config=_get_boto_config())
+            _count_construction(service_name)
+        return _clients[service_name]
+
+def get_resource(service_name: str):
+    """
+    Get a shared boto3 resource, creating it on first use
+
+    Args:
+        service_name: AWS service name, e.g. 'dynamodb'
+
+    Returns:
+        boto3 service resource
+    """
+    resource = _resources.get(service_name)
+    if resource is not None:
+        return resource
+
+    with _lock:
+        if service_name not in _resources:
+            _resources[service_name] = _get_session().resource(service_name, config=_get_boto_config())
+            _count_construction(f"{service_name}:resource")
+        return _resources[service_name]
+
+def get_table(table_name: str = None):
+    """
+    Get a shared DynamoDB table resource
+
+    Args:
+        table_name: Table name, defaults to the WORKFLOW_TABLE environment variable
+
+    Returns:
+        DynamoDB Table resource
+    """
+    table_name = table_name or os.environ['WORKFLOW_TABLE']
+    table = _tables.get(table_name)
+    if table is None:
+        table = get_resource('dynamodb').Table(table_name)
+        _tables[table_name] = table
+    return table
+
+def get_openai_client():
+    """
+    Get the shared OpenAI client with a pooled, keep-alive HTTP client
+
+    openai is only installed for the functions that call it, so it is
+    imported here rather than at module level.
+
+    Returns:
+        OpenAI client
+    """
+    global _openai_client
+    if _openai_client is not None:
+        return _openai_client
+
+    import httpx
+    import openai
+
+    with _lock:
+        if _openai_client is None:
+            http_client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=OPENAI_MAX_CONNECTIONS,
+                    keepalive_expiry=60
+                ),
+                timeout=httpx.Timeout(60.0, connect=5.0)
+            )
+            # OPENAI_BASE_URL points the client at a local server (benchmarks); openai 1.0.0 does not read it itself
+            _openai_client = openai.OpenAI(
+                api_key=os.environ.get('OPENAI_API_KEY'),
+                base_url=os.environ.get('OPENAI_BASE_URL'),
+                http_client=http_client
+            )
+            _count_construction('openai')
+        return _openai_client
+
+def reset_clients():
+    """Drop all cached clients, as on a cold start"""
+    global _session, _boto_config, _openai_client
+    with _lock:
+        _session = None
+        _boto_config = None
+        _openai_client = None
+        _clients.clear()
+        _resources.clear()
+        _tables.clear()
@@ -1,3 +1,14 @@
-from job_assistant_models import JobRecord, WebhookPayload, Workflow
+# job_assistant_models is loaded on first attribute access so importing shared
+# modules does not pull in the models package on every cold start
+_EXPORTS = (
+    'JobRecord', 'WebhookPayload', 'Workflow',
+    'JobRecordValidationError', 'decode_job_record', 'decode_webhook_payload', 'JobBatch', 'is_noop_update'
+)
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        import job_assistant_models
+        return getattr(job_assistant_models, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # You can add any AWS-specific extensions here if needed
\ No newline at end of file
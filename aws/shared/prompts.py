@@ -0,0 +1,322 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+# Token budget for the job description in each stage's prompt
+STAGE_BUDGETS = {
+    'filter': int(os.environ.get('PROMPT_BUDGET_FILTER', 600)),
+    'document': int(os.environ.get('PROMPT_BUDGET_DOCUMENT', 2500)),
+    'section': int(os.environ.get('PROMPT_BUDGET_SECTION', 1500))
+}
+
+# Used when tiktoken is not installed
+CHARS_PER_TOKEN = 4
+
+# Headings of the sections kept first when a description has to be cut, highest priority first
+PRIORITY_SECTIONS = [
+    re.compile(r'requirement|qualification|must have|what you.ll (bring|need)|about you|skills|experience', re.IGNORECASE),
+    re.compile(r'responsibilit|what you.ll do|the role|duties|day to day', re.IGNORECASE),
+    re.compile(r'salary|compensation|pay|benefits|location|remote|hybrid', re.IGNORECASE)
+]
+
+TRUNCATION_MARKER = '[...]'
+
+FIT_CACHE_SIZE = int(os.environ.get('PROMPT_CACHE_SIZE', 1024))
+
+_lock = threading.Lock()
+_encoder = None
+_encoder_loaded = False
+
+# (job hash, budget) -> (description, tokens, truncated), kept across warm invocations
+_fit_cache: 'OrderedDict[Tuple[str, int], Tuple[str, int, bool]]' = OrderedDict()
+cache_stats = {'hits': 0, 'misses': 0}
+
+def _get_encoder():
+    """Get the tiktoken encoding for gpt-4, or None if tiktoken is not installed"""
+    global _encoder, _encoder_loaded
+    if not _encoder_loaded:
+        try:
+            import tiktoken
+            _encoder = tiktoken.encoding_for_model('gpt-4')
+        except Exception:
+            _encoder = None
+        _encoder_loaded = True
+    return _encoder
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens of a text
+
+    Uses tiktoken when it is installed, otherwise estimates four characters per token.
+
+    Args:
+        text: Text to count
+
+    Returns:
+        Number of tokens
+    """
+    if not text:
+        return 0
+    encoder = _get_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text))
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cut a text to at most max_tokens tokens, at a word boundary where possible
+
+    Args:
+        text: Text to cut
+        max_tokens: Token limit
+
+    Returns:
+        Cut text
+    """
+    if max_tokens <= 0:
+        return ''
+    encoder = _get_encoder()
+    if encoder is not None:
+        tokens = encoder.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        cut = encoder.decode(tokens[:max_tokens])
+    else:
+        limit = max_tokens * CHARS_PER_TOKEN
+        if len(text) <= limit:
+            return text
+        cut = text[:limit]
+
+    space = cut.rfind(' ')
+    return cut[:space] if space > len(cut) // 2 else cut
+
+def job_hash(job: Dict[str, Any]) -> str:
+    """
+    Hash the job fields that go into a prompt
+
+    Args:
+        job: Job data
+
+    Returns:
+        Hex digest
+    """
+    content = [job.get(field) or '' for field in ('title', 'company', 'location', 'description')]
+    return hashlib.sha256(json.dumps(content).encode('utf-8')).hexdigest()
+
+def _plain_text(description: str) -> str:
+    """Reduce legacy HTML descriptions to text lines"""
+    if '<' not in description:
+        return description
+    text = re.sub(r'<(br|/p|/li|/h\d|/div)\b[^>]*>', '\n', description, flags=re.IGNORECASE)
+    text = re.sub(r'<[^>]+>', ' ', text)
+    return '\n'.join(' '.join(line.split()) for line in text.splitlines() if line.strip())
+
+def split_sections(description: str) -> List[Tuple[str, str]]:
+    """
+    Split a description into (heading, text) sections
+
+    Headings are markdown heading lines (as written by the scraper's description
+    normalizer) or short lines ending with a colon. Text before the first
+    heading forms a section with an empty heading.
+
+    Args:
+        description: Description text
+
+    Returns:
+        List of (heading, section text) in document order
+    """
+    sections = []
+    heading, lines = '', []
+    for line in _plain_text(description).splitlines():
+        stripped = line.strip()
+        if stripped.startswith('#') or (stripped.endswith(':') and len(stripped) <= 60):
+            if heading or lines:
+                sections.append((heading, '\n'.join(lines)))
+            heading, lines = stripped, []
+        elif stripped:
+            lines.append(stripped)
+    if heading or lines:
+        sections.append((heading, '\n'.join(lines)))
+    return sections
+
+def _section_priority(heading: str) -> int:
+    for priority, pattern in enumerate(PRIORITY_SECTIONS):
+        if pattern.search(heading):
+            return priority
+    return len(PRIORITY_SECTIONS)
+
+def fit_description(description: Optional[str], budget: int) -> Tuple[str, int, bool]:
+    """
+    Fit a description into a token budget
+
+    Descriptions within the budget are returned unchanged. Otherwise whole
+    sections are taken in priority order (requirements and qualifications,
+    then responsibilities, then compensation and location, then the rest in
+    document order) and the first section that no longer fits is truncated.
+
+    Args:
+        description: Description text
+        budget: Token budget
+
+    Returns:
+        Tuple of (description text, tokens, whether it was shortened)
+    """
+    if not description:
+        return '', 0, False
+
+    tokens = count_tokens(description)
+    if tokens <= budget:
+        return description, tokens, False
+
+    sections = split_sections(description)
+    order = sorted(range(len(sections)), key=lambda i: (_section_priority(sections[i][0]), i))
+
+    parts = []
+    used = count_tokens(TRUNCATION_MARKER)
+    for i in order:
+        heading, text = sections[i]
+        block = f"{heading}\n{text}".strip()
+        block_tokens = count_tokens(block) + 1
+        if used + block_tokens <= budget:
+            parts.append(block)
+            used += block_tokens
+            continue
+
+        # Keep as much of this section as still fits, then stop
+        remaining = budget - used - count_tokens(heading) - 1
+        if remaining > 20:
+            parts.append(f"{heading}\n{truncate_to_tokens(text, remaining)}".strip())
+        break
+
+    parts.append(TRUNCATION_MARKER)
+    fitted = '\n'.join(parts)
+    return fitted, count_tokens(fitted), True
+
+def fit_job_description(job: Dict[str, Any], budget: int) -> Tuple[str, int, bool]:
+    """
+    Fit a job's description into a token budget, caching the result per job hash
+
+    Args:
+        job: Job data
+        budget: Token budget
+
+    Returns:
+        Tuple of (description text, tokens, whether it was shortened)
+    """
+    key = (job_hash(job), budget)
+    with _lock:
+        cached = _fit_cache.get(key)
+        if cached is not None:
+            _fit_cache.move_to_end(key)
+            cache_stats['hits'] += 1
+            return cached
+
+    result = fit_description(job.get('description'), budget)
+
+    with _lock:
+        cache_stats['misses'] += 1
+        _fit_cache[key] = result
+        if len(_fit_cache) > FIT_CACHE_SIZE:
+            _fit_cache.popitem(last=False)
+    return result
+
+def format_job_prompt(job: Dict[str, Any], stage: str, budget: int = None) -> Tuple[str, Dict[str, Any]]:
+    """
+    Format job data for an AI prompt, with the description fitted to the stage budget
+
+    Args:
+        job: Job data
+        stage: Prompt stage ('filter', 'document' or 'section')
+        budget: Description token budget, defaults to the stage budget
+
+    Returns:
+        Tuple of (job text, prompt info with description_tokens and truncated)
+    """
+    budget = budget or STAGE_BUDGETS[stage]
+    description, description_tokens, truncated = fit_job_description(job, budget)
+
+    job_text = f"""
+    Title: {job.get('title') or 'Unknown'}
+    Company: {job.get('company') or 'Unknown'}
+    Location: {job.get('location') or 'Unknown'}
+    Description: {description or 'No description provided'}
+    URL: {job.get('job_url') or '#'}
+    """
+    return job_text, {
+        'stage': stage,
+        'description_tokens': description_tokens,
+        'truncated': truncated
+    }
+
+def count_message_tokens(messages: List[Dict[str, str]]) -> int:
+    """
+    Count the prompt tokens of chat messages (content plus per-message overhead)
+
+    Args:
+        messages: Chat messages
+
+    Returns:
+        Number of tokens
+    """
+    return sum(count_tokens(message.get('content', '')) + 4 for message in messages) + 3
+
+def record_call(stage: str, prompt_tokens: int, completion_tokens: int, latency_ms: float, truncated: bool = False):
+    """
+    Emit the token usage and latency of an AI call as a CloudWatch embedded metric
+
+    Args:
+        stage: Prompt stage
+        prompt_tokens: Prompt tokens (from the API usage, or counted locally)
+        completion_tokens: Completion tokens
+        latency_ms: Call latency in milliseconds
+        truncated: Whether the description was shortened to fit the budget
+    """
+    print(json.dumps({
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': 'JobAssistant/Prompts',
+                'Dimensions': [['Stage']],
+                'Metrics': [
+                    {'Name': 'PromptTokens', 'Unit': 'Count'},
+                    {'Name': 'CompletionTokens', 'Unit': 'Count'},
+                    {'Name': 'Latency', 'Unit': 'Milliseconds'},
+                    {'Name': 'Truncated', 'Unit': 'Count'}
+                ]
+            }]
+        },
+        'Stage': stage,
+        'PromptTokens': prompt_tokens,
+        'CompletionTokens': completion_tokens,
+        'Latency': round(latency_ms, 1),
+        'Truncated': 1 if truncated else 0
+    }))
+
+def create_completion(client, stage: str, messages: List[Dict[str, str]], prompt_info: Dict[str, Any] = None, **kwargs):
+    """
+    Call the chat completions API and record token and latency metrics
+
+    Args:
+        client: OpenAI client
+        stage: Prompt stage
+        messages: Chat messages
+        prompt_info: Info returned by format_job_prompt
+        **kwargs: Passed to chat.completions.create (not for streaming calls)
+
+    Returns:
+        API response
+    """
+    start = time.perf_counter()
+    response = client.chat.completions.create(messages=messages, **kwargs)
+    latency_ms = (time.perf_counter() - start) * 1000
+
+    usage = getattr(response, 'usage', None)
+    prompt_tokens = usage.prompt_tokens if usage else count_message_tokens(messages)
+    completion_tokens = usage.completion_tokens if usage else 0
+    record_call(stage, prompt_tokens, completion_tokens, latency_ms, (prompt_info or {}).get('truncated', False))
+    return response
@@ -1,10 +1,9 @@
 import json
-import boto3
 import os
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 import time
-import openai
+from .clients import get_client, get_table, get_openai_client
 
 def format_timestamp(dt: datetime) -> str:
     """Format datetime as ISO string"""
@@ -17,13 +16,11 @@ def create_workflow_id(job_id: str) -> str:
 
 def get_dynamodb_table():
     """Get DynamoDB table resource"""
-    dynamodb = boto3.resource('dynamodb')
-    table_name = os.environ['WORKFLOW_TABLE']
-    return dynamodb.Table(table_name)
+    return get_table()
 
 def send_sns_notification(topic_arn: str, subject: str, message: str):
     """Send SNS notification"""
-    sns = boto3.client('sns')
+    sns = get_client('sns')
     
     response = sns.publish(
         TopicArn=topic_arn,
@@ -129,7 +126,7 @@ def call_openai_with_retry(messages, max_retries=3, backoff_factor=2):
     
     while retries <= max_retries:
         try:
-            response = openai.chat.completions.create(
+            response = get_openai_client().chat.completions.create(
                 model="gpt-4",
                 messages=messages,
                 max_tokens=4000,
@@ -1,8 +1,8 @@
 import json
-import boto3
 import os
 from datetime import datetime
 import traceback
+from shared.clients import get_client, get_table
 
 def lambda_handler(event, context):
     """
@@ -22,8 +22,7 @@ def lambda_handler(event, context):
         current_time = datetime.now().isoformat()
         
         # Get DynamoDB table
-        dynamodb = boto3.resource('dynamodb')
-        table = dynamodb.Table(os.environ['WORKFLOW_TABLE'])
+        table = get_table()
         
         # Query for timed-out workflows
         response = table.scan(
@@ -39,6 +38,9 @@ def lambda_handler(event, context):
         
         timed_out_count = 0
         
+        # Digest workflows get one timeout notification per batch
+        timed_out_batches = {}
+        
         for item in response.get('Items', []):
             workflow_id = item['workflow_id']
             job_data = item.get('job_data', {})
@@ -61,10 +63,16 @@ def lambda_handler(event, context):
             )
             
             # Send timeout notification
-            send_timeout_notification(workflow_id, job_data)
+            if item.get('batch_id'):
+                timed_out_batches.setdefault(item['batch_id'], []).append(job_data)
+            else:
+                send_timeout_notification(workflow_id, job_data)
             
             timed_out_count += 1
         
+        for batch_id, jobs in timed_out_batches.items():
+            send_batch_timeout_notification(batch_id, jobs)
+        
         print(f"Processed {timed_out_count} timed-out workflows")
         
         return {
@@ -95,7 +103,7 @@ def send_timeout_notification(workflow_id, job_data):
         workflow_id: Workflow ID
         job_data: Job data
     """
-    sns = boto3.client('sns')
+    sns = get_client('sns')
     
     job_title = job_data.get('title', 'Unknown')
     company = job_data.get('company', 'Unknown')
@@ -125,6 +133,42 @@ def send_timeout_notification(workflow_id, job_data):
         print(f"Error sending timeout notification: {str(e)}")
         # Don't raise exception here to allow processing of other timed-out workflows
 
+def send_batch_timeout_notification(batch_id, jobs):
+    """
+    Send one notification for the timed-out workflows of a digest batch
+    
+    Args:
+        batch_id: Batch ID
+        jobs: Job data of the timed-out workflows
+    """
+    sns = get_client('sns')
+    
+    job_lines = '\n'.join(
+        f"    - {job.get('title', 'Unknown')} at {job.get('company', 'Unknown')}" for job in jobs
+    )
+    
+    message = f"""
+    The approval requests for the following {len(jobs)} jobs have timed out:
+    
+{job_lines}
+    
+    No further action will be taken for these jobs.
+    
+    Batch ID: {batch_id}
+    """
+    
+    try:
+        sns.publish(
+            TopicArn=os.environ['SNS_TOPIC_ARN'],
+            Message=message,
+            Subject=f"{len(jobs)} Job Requests Timed Out"
+        )
+        
+        print(f"Sent timeout notification for batch {batch_id} ({len(jobs)} workflows)")
+        
+    except Exception as e:
+        print(f"Error sending timeout notification: {str(e)}")
+
 def optimize_scan_for_production(table):
     """
     For production use, implement a more efficient scan with pagination
@@ -1,8 +1,25 @@
+import base64
+import html
 import json
-import boto3
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Any, Dict, List
+from urllib.parse import parse_qs
 import traceback
+from shared.clients import get_client, get_table
+from shared.utils import generate_api_response
+
+# Sparse index of digest workflows by batch (see NOTIFICATION_MODE in the job processor)
+BATCH_INDEX = 'BatchIndex'
+
+# Most items a single TransactWriteItems call accepts
+TRANSACTION_LIMIT = 100
+TRANSACTION_ATTEMPTS = 3
+
+# Concurrent document generator invokes during a bulk approval
+DOCUMENT_FANOUT_CONCURRENCY = int(os.environ.get('DOCUMENT_FANOUT_CONCURRENCY', 8))
 
 def lambda_handler(event, context):
     """
@@ -16,6 +33,12 @@ def lambda_handler(event, context):
         HTML response for the user
     """
     try:
+        path = event.get('path', '')
+        if path.endswith('/batch/approve'):
+            return handle_batch_approval(event)
+        if path.endswith('/batch'):
+            return render_batch_page(event)
+        
         # Get workflow ID from query parameters
         query_params = event.get('queryStringParameters', {}) or {}
         workflow_id = query_params.get('workflow_id')
@@ -30,8 +53,7 @@ def lambda_handler(event, context):
             )
         
         # Get workflow from DynamoDB
-        dynamodb = boto3.resource('dynamodb')
-        table = dynamodb.Table(os.environ['WORKFLOW_TABLE'])
+        table = get_table()
         
         try:
             response = table.get_item(
@@ -118,7 +140,7 @@ def lambda_handler(event, context):
             )
             
             # Trigger document generation
-            lambda_client = boto3.client('lambda')
+            lambda_client = get_client('lambda')
             
             try:
                 lambda_client.invoke(
@@ -267,6 +289,381 @@ def lambda_handler(event, context):
         </html>
         ''')
 
+def get_batch_workflows(batch_id: str) -> List[Dict[str, Any]]:
+    """
+    Get all workflows of a digest batch with one query on the batch index
+    
+    Args:
+        batch_id: Batch ID
+        
+    Returns:
+        Workflow items in creation order
+    """
+    table = get_table()
+    query = {
+        'IndexName': BATCH_INDEX,
+        'KeyConditionExpression': 'batch_id = :batch_id',
+        'ExpressionAttributeValues': {':batch_id': batch_id}
+    }
+    
+    items = []
+    while True:
+        response = table.query(**query)
+        items.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return items
+        query['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def approve_workflows(workflow_ids: List[str], current_time: str) -> Dict[str, str]:
+    """
+    Approve pending workflows with TransactWriteItems, up to TRANSACTION_LIMIT per call
+    
+    Each update is conditional on the workflow still pending and not timed out. A
+    transaction fails as a whole, so workflows whose condition failed are reported
+    and the rest of the chunk is retried without them.
+    
+    Args:
+        workflow_ids: Workflow IDs to approve
+        current_time: ISO timestamp of the response
+        
+    Returns:
+        Status per workflow ID: 'approved', 'not_pending' (already processed,
+        expired or not found) or 'error'
+    """
+    dynamodb = get_client('dynamodb')
+    table_name = get_table().name
+    statuses = {}
+    
+    # A transaction may not touch the same item twice
+    workflow_ids = list(dict.fromkeys(workflow_ids))
+    
+    for start in range(0, len(workflow_ids), TRANSACTION_LIMIT):
+        remaining = workflow_ids[start:start + TRANSACTION_LIMIT]
+        
+        for attempt in range(TRANSACTION_ATTEMPTS):
+            if not remaining:
+                break
+            try:
+                dynamodb.transact_write_items(TransactItems=[{
+                    'Update': {
+                        'TableName': table_name,
+                        'Key': {'workflow_id': {'S': workflow_id}},
+                        'UpdateExpression': 'set #status = :status, updated_at = :time',
+                        'ConditionExpression': '#status = :pending AND (attribute_not_exists(timeout_at) OR timeout_at >= :time)',
+                        'ExpressionAttributeNames': {'#status': 'status'},
+                        'ExpressionAttributeValues': {
+                            ':status': {'S': 'APPROVED'},
+                            ':pending': {'S': 'PENDING_APPROVAL'},
+                            ':time': {'S': current_time}
+                        }
+                    }
+                } for workflow_id in remaining])
+                statuses.update((workflow_id, 'approved') for workflow_id in remaining)
+                remaining = []
+            except Exception as e:
+                reasons = getattr(e, 'response', {}).get('CancellationReasons') or []
+                if len(reasons) != len(remaining):
+                    print(f"Error approving workflows: {str(e)}")
+                    time.sleep(0.1 * 2 ** attempt)
+                    continue
+                
+                # Drop the workflows that can no longer be approved; conflicts are retried
+                retry = []
+                for workflow_id, reason in zip(remaining, reasons):
+                    if reason.get('Code') == 'ConditionalCheckFailed':
+                        statuses[workflow_id] = 'not_pending'
+                    else:
+                        retry.append(workflow_id)
+                if len(retry) == len(remaining):
+                    time.sleep(0.1 * 2 ** attempt)
+                remaining = retry
+        
+        statuses.update((workflow_id, 'error') for workflow_id in remaining)
+    
+    return statuses
+
+def invoke_document_generator(workflow_id: str) -> str:
+    """
+    Trigger document generation for an approved workflow
+    
+    Args:
+        workflow_id: Workflow ID
+        
+    Returns:
+        'generating', or 'invoke_failed' if the document generator could not be invoked
+    """
+    try:
+        get_client('lambda').invoke(
+            FunctionName=os.environ['DOCUMENT_GENERATOR_FUNCTION'],
+            InvocationType='Event',  # Asynchronous invocation
+            Payload=json.dumps({
+                'workflow_id': workflow_id
+            })
+        )
+        print(f"Triggered document generation for workflow {workflow_id}")
+        return 'generating'
+        
+    except Exception as e:
+        print(f"Error invoking document generator for workflow {workflow_id}: {str(e)}")
+        # The workflow stays approved, as for a single approval
+        return 'invoke_failed'
+
+def fan_out_document_generation(workflow_ids: List[str], concurrency: int = None) -> Dict[str, str]:
+    """
+    Trigger document generation for many workflows, at most `concurrency` invokes at a time
+    
+    Args:
+        workflow_ids: Approved workflow IDs
+        concurrency: Concurrent invokes, defaults to DOCUMENT_FANOUT_CONCURRENCY
+        
+    Returns:
+        Status per workflow ID from invoke_document_generator
+    """
+    if not workflow_ids:
+        return {}
+    
+    concurrency = max(1, min(concurrency or DOCUMENT_FANOUT_CONCURRENCY, len(workflow_ids)))
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return dict(zip(workflow_ids, executor.map(invoke_document_generator, workflow_ids)))
+
+def bulk_approve(workflow_ids: List[str], current_time: str) -> Dict[str, str]:
+    """
+    Approve workflows and fan out document generation for the approved ones
+    
+    Args:
+        workflow_ids: Workflow IDs to approve
+        current_time: ISO timestamp of the response
+        
+    Returns:
+        Status per workflow ID: 'generating', 'invoke_failed', 'not_pending' or 'error'
+    """
+    statuses = approve_workflows(workflow_ids, current_time)
+    approved = [workflow_id for workflow_id, status in statuses.items() if status == 'approved']
+    statuses.update(fan_out_document_generation(approved))
+    return statuses
+
+def is_pending(workflow: Dict[str, Any], current_time: str) -> bool:
+    """Whether a workflow can still be approved"""
+    timeout_at = workflow.get('timeout_at', '')
+    return workflow.get('status') == 'PENDING_APPROVAL' and not (timeout_at and timeout_at < current_time)
+
+def render_batch_page(event) -> Dict[str, Any]:
+    """
+    Render the approval page of a digest batch
+    
+    Args:
+        event: API Gateway event with the batch_id query parameter
+        
+    Returns:
+        HTML response with a form posting the selected workflows to /batch/approve
+    """
+    query_params = event.get('queryStringParameters', {}) or {}
+    batch_id = query_params.get('batch_id')
+    
+    if not batch_id:
+        return generate_html_response(400, 
+            '<html><body><h1>Error</h1><p>Missing batch ID</p></body></html>'
+        )
+    
+    workflows = get_batch_workflows(batch_id)
+    if not workflows:
+        return generate_html_response(404, 
+            '<html><body><h1>Not Found</h1><p>Batch not found or has expired</p></body></html>'
+        )
+    
+    current_time = datetime.now().isoformat()
+    rows = []
+    for workflow in workflows:
+        job = workflow.get('job_data', {})
+        pending = is_pending(workflow, current_time)
+        status = workflow.get('status', 'UNKNOWN')
+        if status == 'PENDING_APPROVAL' and not pending:
+            status = 'TIMED_OUT'
+        checkbox = (
+            f'<input type="checkbox" name="workflow_id" value="{html.escape(workflow["workflow_id"])}" checked>'
+            if pending else ''
+        )
+        rows.append(f'''
+                <tr>
+                    <td>{checkbox}</td>
+                    <td><a href="{html.escape(job.get('job_url') or '#')}">{html.escape(job.get('title') or 'Unknown')}</a></td>
+                    <td>{html.escape(job.get('company') or 'Unknown')}</td>
+                    <td>{html.escape(job.get('location') or 'Unknown')}</td>
+                    <td>{status.replace('_', ' ').title()}</td>
+                </tr>''')
+    
+    pending_count = sum(1 for workflow in workflows if is_pending(workflow, current_time))
+    
+    return generate_html_response(200, f'''
+            <!DOCTYPE html>
+            <html>
+            <head>
+                <title>Job Opportunities</title>
+                <style>
+                    body {{
+                        font-family: Arial, sans-serif;
+                        line-height: 1.6;
+                        color: #333;
+                        max-width: 900px;
+                        margin: 0 auto;
+                        padding: 20px;
+                    }}
+                    h1 {{
+                        color: #2c7c3e;
+                        border-bottom: 2px solid #2c7c3e;
+                        padding-bottom: 10px;
+                    }}
+                    table {{
+                        width: 100%;
+                        border-collapse: collapse;
+                        margin: 20px 0;
+                    }}
+                    th, td {{
+                        text-align: left;
+                        padding: 8px;
+                        border-bottom: 1px solid #ddd;
+                    }}
+                    button {{
+                        background-color: #2c7c3e;
+                        color: #fff;
+                        border: none;
+                        padding: 10px 20px;
+                        border-radius: 5px;
+                    }}
+                </style>
+            </head>
+            <body>
+                <h1>Job Opportunities</h1>
+                <p>{len(workflows)} jobs in this batch, {pending_count} awaiting your approval.</p>
+                
+                <form method="post" action="batch/approve">
+                    <input type="hidden" name="batch_id" value="{html.escape(batch_id)}">
+                    <table>
+                        <tr><th></th><th>Title</th><th>Company</th><th>Location</th><th>Status</th></tr>{''.join(rows)}
+                    </table>
+                    <button type="submit"{'' if pending_count else ' disabled'}>Approve selected jobs</button>
+                </form>
+            </body>
+            </html>
+            ''')
+
+def handle_batch_approval(event) -> Dict[str, Any]:
+    """
+    Approve many workflows in one request
+    
+    Accepts the form posted by the batch page (batch_id and workflow_id values,
+    answered with an HTML page) or a JSON body {"workflow_ids": [...], "batch_id": ...}
+    (answered with JSON). If a batch ID is given, only workflows of that batch
+    are approved.
+    
+    Args:
+        event: API Gateway event
+        
+    Returns:
+        HTML or JSON response with the status of every workflow
+    """
+    body = event.get('body') or ''
+    if event.get('isBase64Encoded'):
+        body = base64.b64decode(body).decode('utf-8')
+    
+    is_json = body.lstrip().startswith('{')
+    if is_json:
+        try:
+            request = json.loads(body)
+        except ValueError:
+            return generate_api_response(400, {'error': 'Invalid JSON body'})
+        batch_id = request.get('batch_id')
+        selected = [str(workflow_id) for workflow_id in request.get('workflow_ids') or []]
+        if not selected:
+            return generate_api_response(400, {'error': 'Missing workflow_ids'})
+    else:
+        form = parse_qs(body)
+        batch_id = (form.get('batch_id') or [None])[0]
+        selected = form.get('workflow_id', [])
+        if not batch_id:
+            return generate_html_response(400, 
+                '<html><body><h1>Error</h1><p>Missing batch ID</p></body></html>'
+            )
+    
+    labels = {}
+    if batch_id:
+        # Only workflows of this batch can be approved through it
+        batch = {workflow['workflow_id']: workflow for workflow in get_batch_workflows(batch_id)}
+        for workflow_id, workflow in batch.items():
+            job = workflow.get('job_data', {})
+            labels[workflow_id] = f"{job.get('title') or 'Unknown'} at {job.get('company') or 'Unknown'}"
+        outside = [workflow_id for workflow_id in selected if workflow_id not in batch]
+        selected = [workflow_id for workflow_id in selected if workflow_id in batch]
+    else:
+        outside = []
+    
+    current_time = datetime.now().isoformat()
+    statuses = bulk_approve(selected, current_time)
+    statuses.update((workflow_id, 'not_in_batch') for workflow_id in outside)
+    
+    approved_count = sum(1 for status in statuses.values() if status in ('generating', 'invoke_failed'))
+    print(f"Bulk approval{f' of batch {batch_id}' if batch_id else ''}: approved {approved_count} of {len(statuses)} workflows")
+    
+    if is_json:
+        return generate_api_response(200, {
+            'batch_id': batch_id,
+            'approved_count': approved_count,
+            'results': [{'workflow_id': workflow_id, 'status': status} for workflow_id, status in statuses.items()]
+        })
+    
+    approved = [labels.get(workflow_id, workflow_id) for workflow_id, status in statuses.items() if status == 'generating']
+    failed = [labels.get(workflow_id, workflow_id) for workflow_id, status in statuses.items() if status == 'invoke_failed']
+    skipped = [labels.get(workflow_id, workflow_id) for workflow_id, status in statuses.items()
+               if status not in ('generating', 'invoke_failed')]
+    
+    approved_items = ''.join(f'<li>{html.escape(label)}</li>' for label in approved)
+    failed_items = ''.join(f'<li>{html.escape(label)}</li>' for label in failed)
+    skipped_items = ''.join(f'<li>{html.escape(label)}</li>' for label in skipped)
+    
+    return generate_html_response(200, f'''
+            <!DOCTYPE html>
+            <html>
+            <head>
+                <title>Jobs Approved</title>
+                <style>
+                    body {{
+                        font-family: Arial, sans-serif;
+                        line-height: 1.6;
+                        color: #333;
+                        max-width: 600px;
+                        margin: 0 auto;
+                        padding: 20px;
+                    }}
+                    h1 {{
+                        color: #2c7c3e;
+                        border-bottom: 2px solid #2c7c3e;
+                        padding-bottom: 10px;
+                    }}
+                    .success-message {{
+                        background-color: #e8f5e9;
+                        border-left: 4px solid #2c7c3e;
+                        padding: 10px 15px;
+                        margin: 20px 0;
+                    }}
+                </style>
+            </head>
+            <body>
+                <h1>Jobs Approved</h1>
+                
+                <div class="success-message">
+                    <p>You have approved {approved_count} jobs. We will now generate a detailed analysis document for each.</p>
+                    <p>You will receive a notification when each document is ready.</p>
+                </div>
+                
+                <ul>{approved_items}</ul>
+                {f'<p>Approved, but document generation could not be started:</p><ul>{failed_items}</ul>' if failed else ''}
+                {f'<p>Not approved (already processed or expired):</p><ul>{skipped_items}</ul>' if skipped else ''}
+                
+                <p>Thank you for your response!</p>
+            </body>
+            </html>
+            ''')
+
 def generate_html_response(status_code: int, html_content: str) -> dict:
     """
     Generate HTML response for API Gateway
@@ -0,0 +1,60 @@
+"""
+Helpers shared by the benchmark scripts
+"""
+import importlib.util
+import os
+import sys
+import time
+from http.server import ThreadingHTTPServer
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def import_models():
+    """
+    Import the shared models as `job_assistant_models`
+
+    The deploy workflows copy models/ into place under that name; for local
+    runs the package is loaded straight from the models/ directory.
+    """
+    if 'job_assistant_models' in sys.modules:
+        return sys.modules['job_assistant_models']
+
+    try:
+        import job_assistant_models
+        return job_assistant_models
+    except ImportError:
+        pass
+
+    models_dir = os.path.join(REPO_ROOT, 'models')
+    spec = importlib.util.spec_from_file_location(
+        'job_assistant_models',
+        os.path.join(models_dir, '__init__.py'),
+        submodule_search_locations=[models_dir]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['job_assistant_models'] = module
+    spec.loader.exec_module(module)
+    return module
+
+def rate(func, count, repeat=3):
+    """
+    Run func() `repeat` times and return the best items-per-second rate
+
+    Args:
+        func: Callable processing `count` items per call
+        count: Number of items processed per call
+        repeat: Number of timed calls
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+class QuietHTTPServer(ThreadingHTTPServer):
+    """Threading HTTP server for the fakes that ignores clients dropping keep-alive connections"""
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
@@ -0,0 +1,197 @@
+"""
+Verify and time bulk approval against local stand-ins
+
+DynamoDB is moto; Lambda invoke is a stand-in client that sleeps for a
+configurable latency and records the peak number of concurrent invokes.
+The batch mixes pending workflows with already approved, timed-out and
+missing ones, and the per-workflow statuses returned by the bulk endpoint
+are checked against what each should get. Then approving every pending
+workflow is compared, one approve request per workflow versus one bulk
+request at several fan-out concurrencies, by DynamoDB calls and time.
+moto copies the whole table for every transaction, so each run starts
+from a fresh table; its DynamoDB timings are indicative only.
+
+Usage:
+    python benchmarks/bulk_approval.py --workflows 250 --invoke-latency 0.05
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+AWS_DIR = os.path.join(os.path.dirname(__file__), '..', 'aws')
+sys.path.insert(0, AWS_DIR)
+
+import boto3
+from moto import mock_aws
+
+class StandInLambdaClient:
+    """Lambda client stand-in: invoke sleeps, counts calls and tracks peak concurrency"""
+
+    def __init__(self, latency, failing=()):
+        self.latency = latency
+        self.failing = set(failing)
+        self.lock = threading.Lock()
+        self.invoked = []
+        self.active = 0
+        self.peak = 0
+
+    def reset(self):
+        self.invoked = []
+        self.peak = 0
+
+    def invoke(self, FunctionName, InvocationType, Payload):
+        workflow_id = json.loads(Payload)['workflow_id']
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.latency)
+            if workflow_id in self.failing:
+                raise RuntimeError('TooManyRequestsException')
+            with self.lock:
+                self.invoked.append(workflow_id)
+            return {'StatusCode': 202}
+        finally:
+            with self.lock:
+                self.active -= 1
+
+def load_handler(name):
+    """Load <name>/app.py under a unique module name (every handler module is called app)"""
+    path = os.path.join(AWS_DIR, name, 'app.py')
+    spec = importlib.util.spec_from_file_location(f"{name}_app", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.path.insert(0, os.path.dirname(path))
+    spec.loader.exec_module(module)
+    return module
+
+def setup_table():
+    os.environ.update({
+        'AWS_DEFAULT_REGION': 'us-east-2',
+        'AWS_ACCESS_KEY_ID': 'testing',
+        'AWS_SECRET_ACCESS_KEY': 'testing',
+        'WORKFLOW_TABLE': 'workflows',
+        'DOCUMENT_GENERATOR_FUNCTION': 'document-generator'
+    })
+    return boto3.resource('dynamodb').create_table(
+        TableName='workflows',
+        KeySchema=[{'AttributeName': 'workflow_id', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'workflow_id', 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+def reset_table(table):
+    table.delete()
+    return setup_table()
+
+def seed(table, prefix, count):
+    """Put `count` pending workflows, plus one approved and one timed-out; returns the expected statuses"""
+    now = datetime.now()
+    expected = {}
+    with table.batch_writer() as writer:
+        for i in range(count):
+            workflow_id = f"{prefix}-{i}"
+            writer.put_item(Item={
+                'workflow_id': workflow_id,
+                'job_id': str(i),
+                'job_data': {'title': 'Engineer', 'company': f"Company {i}"},
+                'status': 'PENDING_APPROVAL',
+                'timeout_at': (now + timedelta(minutes=5)).isoformat()
+            })
+            expected[workflow_id] = 'generating'
+        writer.put_item(Item={'workflow_id': f"{prefix}-approved", 'status': 'APPROVED',
+                              'timeout_at': (now + timedelta(minutes=5)).isoformat()})
+        writer.put_item(Item={'workflow_id': f"{prefix}-expired", 'status': 'PENDING_APPROVAL',
+                              'timeout_at': (now - timedelta(minutes=1)).isoformat()})
+    expected[f"{prefix}-approved"] = 'not_pending'
+    expected[f"{prefix}-expired"] = 'not_pending'
+    expected[f"{prefix}-missing"] = 'not_pending'
+    return expected
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workflows', type=int, default=250)
+    parser.add_argument('--invoke-latency', type=float, default=0.05, help='Stand-in Lambda invoke latency (seconds)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    args = parser.parse_args()
+
+    with mock_aws():
+        table = setup_table()
+        user_response = load_handler('user_response')
+        from shared import clients
+
+        failing = {'verify-3'}
+        lambda_client = StandInLambdaClient(args.invoke_latency, failing)
+        clients._clients['lambda'] = lambda_client
+
+        transactions = []
+        clients.get_client('dynamodb').meta.events.register(
+            'before-call.dynamodb.TransactWriteItems', lambda **kwargs: transactions.append(1)
+        )
+        dynamodb_calls = []
+        for client in (clients.get_client('dynamodb'), clients.get_resource('dynamodb').meta.client):
+            client.meta.events.register('before-call.dynamodb', lambda **kwargs: dynamodb_calls.append(1))
+
+        # Correctness: statuses for pending, approved, expired, missing and a failing invoke
+        expected = seed(table, 'verify', args.workflows)
+        expected['verify-3'] = 'invoke_failed'
+        with contextlib.redirect_stdout(io.StringIO()):
+            response = user_response.lambda_handler({
+                'path': '/batch/approve',
+                'httpMethod': 'POST',
+                'body': json.dumps({'workflow_ids': list(expected)})
+            }, None)
+        results = {result['workflow_id']: result['status'] for result in json.loads(response['body'])['results']}
+        mismatches = {key: (results.get(key), status) for key, status in expected.items() if results.get(key) != status}
+        assert not mismatches, f"Unexpected statuses (got, expected): {mismatches}"
+        stored = table.get_item(Key={'workflow_id': 'verify-0'})['Item']['status']
+        assert stored == 'APPROVED', stored
+        assert table.get_item(Key={'workflow_id': 'verify-expired'})['Item']['status'] == 'PENDING_APPROVAL'
+        assert 'Item' not in table.get_item(Key={'workflow_id': 'verify-missing'})
+        print(f"statuses verified for {len(expected)} workflows "
+              f"({len(transactions)} TransactWriteItems calls, limit {user_response.TRANSACTION_LIMIT} items each)\n")
+
+        print(f"{args.workflows} pending workflows, invoke latency {args.invoke_latency * 1000:.0f} ms\n")
+        print(f"{'mode':<28}{'requests':>10}{'DynamoDB calls':>16}{'seconds':>10}{'peak invokes':>14}")
+
+        # One approve request per workflow (previous behaviour)
+        table = reset_table(table)
+        seed(table, 'single', args.workflows)
+        lambda_client.reset()
+        dynamodb_calls.clear()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(args.workflows):
+                user_response.lambda_handler(
+                    {'path': '/approve', 'queryStringParameters': {'workflow_id': f"single-{i}"}}, None
+                )
+        print(f"{'per-workflow requests':<28}{args.workflows:>10}{len(dynamodb_calls):>16}"
+              f"{time.perf_counter() - start:>10.2f}{lambda_client.peak:>14}")
+
+        for concurrency in args.concurrency:
+            prefix = f"bulk{concurrency}"
+            table = reset_table(table)
+            seed(table, prefix, args.workflows)
+            user_response.DOCUMENT_FANOUT_CONCURRENCY = concurrency
+            lambda_client.reset()
+            dynamodb_calls.clear()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                user_response.lambda_handler({
+                    'path': '/batch/approve',
+                    'httpMethod': 'POST',
+                    'body': json.dumps({'workflow_ids': [f"{prefix}-{i}" for i in range(args.workflows)]})
+                }, None)
+            elapsed = time.perf_counter() - start
+            assert len(lambda_client.invoked) == args.workflows
+            print(f"{f'bulk, concurrency {concurrency}':<28}{1:>10}{len(dynamodb_calls):>16}"
+                  f"{elapsed:>10.2f}{lambda_client.peak:>14}")
+
+if __name__ == '__main__':
+    main()
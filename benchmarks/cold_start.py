@@ -0,0 +1,91 @@
+"""
+Cold-start profile of the Lambda handlers
+
+For every function, imports its app module in a fresh interpreter with
+`-X importtime` and reports the init duration (wall time above a bare
+interpreter start), the cumulative import time of the handler module and
+its heaviest imports. --with-sdks additionally loads the SDKs the handler
+defers (boto3, openai), showing what a cold start pays once a code path
+actually needs them.
+
+Usage:
+    python benchmarks/cold_start.py --top 8
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+AWS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'aws'))
+FUNCTIONS = ['job_processor', 'document_generator', 'user_response', 'timeout_checker']
+
+# Modules each function loads lazily on its main code path
+DEFERRED_SDKS = {
+    'job_processor': ['boto3', 'openai'],
+    'document_generator': ['boto3', 'openai'],
+    'user_response': ['boto3'],
+    'timeout_checker': ['boto3']
+}
+
+def run_python(code, function, importtime=False):
+    """Run code in a fresh interpreter set up like the Lambda for `function`"""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([os.path.join(AWS_DIR, function), AWS_DIR])
+    args = [sys.executable]
+    if importtime:
+        args += ['-X', 'importtime']
+    args += ['-c', code]
+
+    start = time.perf_counter()
+    result = subprocess.run(args, env=env, capture_output=True, text=True, cwd=os.path.join(AWS_DIR, function))
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if result.returncode != 0:
+        raise RuntimeError(f"{function}: {result.stderr.strip().splitlines()[-1]}")
+    return elapsed, result.stderr
+
+def parse_importtime(stderr):
+    """Parse -X importtime output into {module: (self_us, cumulative_us)}"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+def profile(function, runs, top, with_sdks):
+    code = 'import app'
+    if with_sdks:
+        code += ''.join(f'; import {module}' for module in DEFERRED_SDKS[function])
+
+    baseline = statistics.median(run_python('pass', function)[0] for _ in range(runs))
+    init = statistics.median(run_python(code, function)[0] for _ in range(runs)) - baseline
+
+    _, stderr = run_python(code, function, importtime=True)
+    modules = parse_importtime(stderr)
+
+    print(f"\n{function}: init duration {init:.1f} ms "
+          f"(app import {modules.get('app', (0, 0))[1] / 1000:.1f} ms)")
+
+    # Only report top-level packages so a heavy SDK shows up once
+    top_level = {name: times for name, times in modules.items() if '.' not in name and name != 'app'}
+    heaviest = sorted(top_level.items(), key=lambda item: item[1][1], reverse=True)[:top]
+    for name, (_, cumulative) in heaviest:
+        print(f"    {cumulative / 1000:8.1f} ms  {name}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='Interpreter starts per measurement')
+    parser.add_argument('--top', type=int, default=8, help='Heaviest imports to list')
+    parser.add_argument('--with-sdks', action='store_true', help='Also import the lazily loaded SDKs')
+    parser.add_argument('functions', nargs='*', default=FUNCTIONS)
+    args = parser.parse_args()
+
+    for function in args.functions:
+        profile(function, args.runs, args.top, args.with_sdks)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Peak memory of a scraper run with the list-based DataManager vs. spilling to disk
+
+Each store runs in its own subprocess so ru_maxrss is its own peak. A run
+collects --jobs jobs (normalized descriptions from the fixtures plus their
+original markup, made unique per job), then does what main.py does on save:
+converts them to Supabase rows --buffer-size at a time, and exports them to
+CSV and Parquet.
+
+- list: DataManager() keeping every job in memory, as before
+- spill: DataManager(spill_path=...) keeping at most --buffer-size jobs in
+  memory and the rest in an Arrow IPC stream file
+
+The baseline is the RSS after the imports, before the first job is added.
+Requires pyarrow.
+
+Usage:
+    python benchmarks/data_manager_memory.py --jobs 10000 --buffer-size 500
+"""
+import argparse
+import csv
+import contextlib
+import io
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scraper'))
+
+from bench_utils import import_models
+
+import_models()
+
+import pyarrow.parquet as pq
+
+from src.data.data_manager import DataManager
+from src.scraper.job_data import EnhancedJobData
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'descriptions')
+
+def peak_rss_mib():
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10)
+
+def generate_jobs(count, seed):
+    """Scraped jobs, one at a time, as the scraper hands them to the DataManager"""
+    rng = random.Random(seed)
+    markup = []
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+            markup.append(f.read())
+    for i in range(count):
+        html = rng.choice(markup).replace('</div>', f" Requisition {i}-{rng.getrandbits(64):x}.</div>", 1)
+        yield EnhancedJobData({
+            'id': '',
+            'job_url': f"https://www.linkedin.com/jobs/view/{3900000000 + i}/",
+            'title': rng.choice(['Backend Engineer', 'Data Scientist', 'Platform Engineer']),
+            'company': f"Company {rng.randrange(300)}",
+            'location': rng.choice(['Remote', 'New York, NY', 'Berlin, Germany']),
+            'posted_time': f"{rng.randrange(1, 23)} hours ago",
+            'applicants': f"{rng.randrange(1, 200)} applicants",
+            'description': html.replace('<', ' <')
+        }, description_html=html)
+
+def worker(store, jobs, buffer_size, workdir, seed):
+    """One run in this process; prints its measurements as JSON"""
+    baseline = peak_rss_mib()
+    spill_path = os.path.join(workdir, 'jobs.arrow') if store == 'spill' else None
+    data_manager = DataManager(spill_path=spill_path, buffer_size=buffer_size)
+
+    start = time.perf_counter()
+    for job in generate_jobs(jobs, seed):
+        data_manager.add_job(job)
+    collected = time.perf_counter() - start
+    after_collect = peak_rss_mib()
+
+    # What save_jobs sends to upsert_jobs, one buffer at a time
+    start = time.perf_counter()
+    rows = 0
+    hashes = set()
+    for chunk in data_manager.iter_batches(buffer_size):
+        for job in chunk:
+            hashes.add(job.to_supabase_format()['content_hash'])
+            job.to_archive_format()
+            rows += 1
+    saved = time.perf_counter() - start
+
+    csv_path = os.path.join(workdir, f"{store}.csv")
+    parquet_path = os.path.join(workdir, f"{store}.parquet")
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        data_manager.save_to_csv(csv_path)
+        data_manager.save_to_parquet(parquet_path)
+    exported = time.perf_counter() - start
+    data_manager.close()
+
+    csv.field_size_limit(2 ** 30)
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        csv_rows = sum(1 for _ in csv.reader(f)) - 1
+    assert rows == jobs and len(hashes) == jobs, f"{store}: saved {rows} jobs, {len(hashes)} distinct hashes"
+    assert csv_rows == jobs and pq.ParquetFile(parquet_path).metadata.num_rows == jobs, f"{store}: exports differ"
+
+    print(json.dumps({
+        'baseline': baseline,
+        'collect': after_collect,
+        'peak': peak_rss_mib(),
+        'collect_s': collected,
+        'save_s': saved,
+        'export_s': exported,
+        'spill_mib': os.path.getsize(spill_path) / 2 ** 20 if spill_path else 0.0
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=10000)
+    parser.add_argument('--buffer-size', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--worker', choices=['list', 'spill'], help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.jobs, args.buffer_size, args.workdir, args.seed)
+        return
+
+    workdir = tempfile.mkdtemp(prefix='data-manager-bench-')
+    try:
+        results = {}
+        for store in ('list', 'spill'):
+            output = subprocess.run(
+                [sys.executable, __file__, '--worker', store, '--workdir', workdir, '--jobs', str(args.jobs),
+                 '--buffer-size', str(args.buffer_size), '--seed', str(args.seed)],
+                check=True, capture_output=True, text=True).stdout
+            results[store] = json.loads(output.strip().splitlines()[-1])
+
+        print(f"{args.jobs:,} jobs, buffer of {args.buffer_size}\n")
+        print(f"{'store':<8}{'baseline MiB':>14}{'collected MiB':>15}{'peak MiB':>10}"
+              f"{'above baseline':>16}{'collect s':>11}{'save s':>8}{'export s':>10}")
+        for store, result in results.items():
+            print(f"{store:<8}{result['baseline']:>14.1f}{result['collect']:>15.1f}{result['peak']:>10.1f}"
+                  f"{result['peak'] - result['baseline']:>16.1f}{result['collect_s']:>11.2f}"
+                  f"{result['save_s']:>8.2f}{result['export_s']:>10.2f}")
+        print(f"\nspill file: {results['spill']['spill_mib']:.1f} MiB")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
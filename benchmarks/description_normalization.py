@@ -0,0 +1,102 @@
+"""
+Byte and prompt token reduction of the description normalizer
+
+For every description in the fixture corpus (LinkedIn innerHTML of
+article.jobs-description__container), reports the raw markup size, the
+normalized text size, the zstd-compressed archive size and the tokens of
+the job filtering prompt built from the raw vs. the normalized description.
+Tokens are counted with tiktoken when installed, otherwise estimated at
+four characters per token.
+
+Usage:
+    python benchmarks/description_normalization.py
+    python benchmarks/description_normalization.py --corpus path/to/html/dir
+"""
+import argparse
+import glob
+import importlib.util
+import os
+import time
+
+from bench_utils import REPO_ROOT
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'descriptions')
+
+def load_normalizer():
+    path = os.path.join(REPO_ROOT, 'scraper', 'src', 'scraper', 'description_normalizer.py')
+    spec = importlib.util.spec_from_file_location('description_normalizer', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def token_counter():
+    try:
+        import tiktoken
+        encoding = tiktoken.encoding_for_model('gpt-4')
+        return lambda text: len(encoding.encode(text)), 'tiktoken'
+    except ImportError:
+        return lambda text: (len(text) + 3) // 4, 'estimated'
+
+def filter_prompt(description):
+    """User prompt of filter_jobs_with_ai for a job with this description"""
+    return (
+        "Does this job match our criteria for a good opportunity? Consider factors like job title, "
+        "company reputation, location, and job description. Respond with only YES or NO.\n\n"
+        f"Title: Software Engineer\nCompany: Example\nLocation: Remote\nDescription: {description}\n"
+        "URL: https://www.linkedin.com/jobs/view/0"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', default=FIXTURES_DIR, help='Directory of .html description fixtures')
+    args = parser.parse_args()
+
+    normalizer = load_normalizer()
+    count_tokens, token_method = token_counter()
+
+    paths = sorted(glob.glob(os.path.join(args.corpus, '*.html')))
+    if not paths:
+        raise SystemExit(f"No .html fixtures in {args.corpus}")
+
+    totals = {'raw': 0, 'text': 0, 'zstd': 0, 'raw_tokens': 0, 'text_tokens': 0}
+    normalize_seconds = 0.0
+
+    print(f"{'fixture':<28}{'raw B':>9}{'text B':>9}{'zstd B':>9}{'reduction':>11}{'prompt tok':>12}{'compact tok':>13}")
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+
+        start = time.perf_counter()
+        text = normalizer.normalize_description(html)
+        normalize_seconds += time.perf_counter() - start
+
+        compressed = normalizer.compress_description(html)
+        raw_bytes = len(html.encode('utf-8'))
+        text_bytes = len(text.encode('utf-8'))
+        zstd_bytes = len(compressed) if compressed is not None else 0
+        raw_tokens = count_tokens(filter_prompt(html))
+        text_tokens = count_tokens(filter_prompt(text))
+
+        totals['raw'] += raw_bytes
+        totals['text'] += text_bytes
+        totals['zstd'] += zstd_bytes
+        totals['raw_tokens'] += raw_tokens
+        totals['text_tokens'] += text_tokens
+
+        print(f"{os.path.basename(path):<28}{raw_bytes:>9,}{text_bytes:>9,}{zstd_bytes or '-':>9}"
+              f"{1 - text_bytes / raw_bytes:>10.0%}{raw_tokens:>12,}{text_tokens:>13,}")
+
+    count = len(paths)
+    print()
+    print(f"average bytes per job: {totals['raw'] / count:,.0f} raw -> {totals['text'] / count:,.0f} normalized "
+          f"({1 - totals['text'] / totals['raw']:.0%} smaller)")
+    if totals['zstd']:
+        print(f"archived original: {totals['zstd'] / count:,.0f} bytes per job zstd-compressed")
+    else:
+        print("zstandard not installed, archive size not measured")
+    print(f"filter prompt tokens ({token_method}): {totals['raw_tokens'] / count:,.0f} -> "
+          f"{totals['text_tokens'] / count:,.0f} per job ({1 - totals['text_tokens'] / totals['raw_tokens']:.0%} saved)")
+    print(f"normalization: {normalize_seconds / count * 1000:.2f} ms per job")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Compare monolithic streamed generation with parallel section generation
+
+Runs the document generator against the fake OpenAI server and reports
+end-to-end latency, time to first byte and token usage for both modes.
+
+Usage:
+    python benchmarks/document_generation.py --runs 3 --section-tokens 400
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'aws'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'aws', 'document_generator'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_openai_server import FakeOpenAIServer
+
+SAMPLE_JOB = {
+    'id': 'bench-job',
+    'title': 'Senior Backend Engineer',
+    'company': 'Example Corp',
+    'location': 'Remote',
+    'job_url': 'https://www.linkedin.com/jobs/view/0',
+    'description': 'We are looking for an engineer to build and operate data pipelines. ' * 40
+}
+
+def run_mode(app, fake, mode, runs):
+    """Generate the sample document `runs` times in the given mode"""
+    app.DOCUMENT_GENERATION_MODE = mode
+    fake.reset_stats()
+    latencies = []
+    first_bytes = []
+
+    for _ in range(runs):
+        start = time.monotonic()
+        _, stats = app.generate_document('wf-bench', SAMPLE_JOB)
+        latencies.append(time.monotonic() - start)
+        first_bytes.append(stats['first_token_ms'])
+
+    return {
+        'mode': mode,
+        'latency_s': statistics.median(latencies),
+        'first_byte_ms': statistics.median(first_bytes),
+        'requests': fake.stats['requests'] / runs,
+        'prompt_tokens': fake.stats['prompt_tokens'] / runs,
+        'completion_tokens': fake.stats['completion_tokens'] / runs
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--section-tokens', type=int, default=400, help='Tokens generated per section')
+    parser.add_argument('--token-latency', type=float, default=0.01)
+    parser.add_argument('--first-token-latency', type=float, default=0.5)
+    parser.add_argument('--concurrency', type=int, default=4)
+    args = parser.parse_args()
+
+    section_count = 7
+
+    def reply(messages, max_tokens):
+        # The monolithic prompt produces all sections in one completion
+        tokens = args.section_tokens * (section_count if max_tokens >= 4000 else 1)
+        return ' '.join(['lorem'] * tokens)
+
+    fake = FakeOpenAIServer(
+        first_token_latency=args.first_token_latency,
+        token_latency=args.token_latency,
+        reply=reply
+    ).start()
+
+    os.environ['OPENAI_BASE_URL'] = fake.base_url
+    os.environ.setdefault('OPENAI_API_KEY', 'fake-key')
+    os.environ['DOCUMENT_OUTPUT_DIR'] = tempfile.mkdtemp(prefix='doc-bench-')
+    os.environ['SECTION_CONCURRENCY'] = str(args.concurrency)
+
+    import app
+
+    try:
+        results = [run_mode(app, fake, mode, args.runs) for mode in ('stream', 'sections')]
+    finally:
+        fake.stop()
+
+    print(f"{'mode':<10}{'latency (s)':>14}{'first byte (ms)':>18}{'requests':>10}{'prompt tok':>12}{'completion tok':>16}")
+    for r in results:
+        print(f"{r['mode']:<10}{r['latency_s']:>14.2f}{r['first_byte_ms']:>18}{r['requests']:>10.0f}"
+              f"{r['prompt_tokens']:>12.0f}{r['completion_tokens']:>16.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,610 @@
+"""
+End-to-end pipeline harness against local stand-ins
+
+Boots the fake Supabase server (PostgREST over SQLite, with jobs table
+webhooks), the fake OpenAI server, moto for DynamoDB / SNS / S3, the Flask
+API on a local port and an in-process Lambda stand-in for the document
+generator, then replays a job corpus through the real code:
+
+    scraper DatabaseManager.upsert_jobs -> Supabase webhook -> API webhook
+    queue -> process_job_batch -> job_processor -> user_response approvals
+    -> document_generator, and timeout_checker for the rest.
+
+The API's process_job_batch does not call the job processor yet, so the
+harness forwards each flushed batch to job_processor.lambda_handler, the
+way the deployed pipeline would.
+
+Reports count, throughput and p50/p95/p99 latency per stage, end-to-end
+latency per job (upsert to workflow created, upsert to document completed)
+and a cost proxy: OpenAI tokens per stage at GPT-4 prices plus Supabase,
+SNS, DynamoDB, S3 and Lambda call counts. With --report the results are
+written as JSON; with --baseline they are compared against an earlier
+report and the script exits 1 if any stage regressed beyond --tolerance.
+
+Usage:
+    python benchmarks/e2e_pipeline.py --jobs 200 --rate 50 --batch-size 25 --report e2e.json
+    python benchmarks/e2e_pipeline.py --jobs 200 --baseline e2e.json --tolerance 0.25
+"""
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_utils import REPO_ROOT, import_models
+from fake_openai_server import FakeOpenAIServer, estimate_tokens
+from fake_supabase_server import FAKE_SERVICE_KEY, FakeSupabaseServer
+
+AWS_DIR = os.path.join(REPO_ROOT, 'aws')
+API_DIR = os.path.join(REPO_ROOT, 'api')
+SCRAPER_DIR = os.path.join(REPO_ROOT, 'scraper')
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures', 'descriptions')
+sys.path.insert(0, AWS_DIR)
+sys.path.insert(0, SCRAPER_DIR)
+
+import_models()
+
+import boto3
+from moto import mock_aws
+
+# GPT-4 list prices in dollars per million tokens, for the cost proxy
+PROMPT_PRICE = 30.0
+COMPLETION_PRICE = 60.0
+
+STAGES = ('supabase_upsert', 'webhook_delivery', 'api_queue', 'job_processor', 'user_response',
+          'document_generator', 'timeout_checker')
+
+TITLES = ['Software Engineer', 'Backend Engineer', 'Data Scientist', 'Frontend Developer', 'Platform Engineer',
+          'Machine Learning Engineer', 'Site Reliability Engineer', 'Product Manager']
+LOCATIONS = ['Remote', 'New York, NY', 'Austin, TX', 'San Francisco, CA', 'Berlin, Germany']
+
+class Recorder:
+    """Thread-safe latency samples per stage and timestamps per job"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {stage: [] for stage in STAGES}
+        self.items = {stage: 0 for stage in STAGES}
+        self.spans = {}
+        self.marks = {}
+
+    def add(self, stage, seconds, items=1, start=None):
+        end = time.perf_counter()
+        start = start if start is not None else end - seconds
+        with self.lock:
+            self.samples[stage].append(seconds)
+            self.items[stage] += items
+            first, last = self.spans.get(stage, (start, end))
+            self.spans[stage] = (min(first, start), max(last, end))
+
+    def mark(self, key, event, when=None):
+        with self.lock:
+            self.marks.setdefault(key, {}).setdefault(event, when if when is not None else time.perf_counter())
+
+def summarize(samples, items=None, span=None):
+    """Count, throughput and percentiles (milliseconds) of latency samples"""
+    ordered = sorted(samples)
+    quantile = lambda q: ordered[min(int(q * len(ordered)), len(ordered) - 1)] * 1000 if ordered else 0.0
+    summary = {
+        'count': len(ordered),
+        'p50_ms': round(quantile(0.5), 2),
+        'p95_ms': round(quantile(0.95), 2),
+        'p99_ms': round(quantile(0.99), 2)
+    }
+    if items is not None:
+        summary['items'] = items
+        summary['items_per_second'] = round(items / max(span[1] - span[0], 1e-9), 2) if span else 0.0
+    return summary
+
+class StageTokens:
+    """Fake OpenAI reply that answers the filter prompt and counts tokens per stage"""
+
+    def __init__(self, match_rate, seed):
+        self.match_rate = match_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.tokens = {'filter': [0, 0], 'document': [0, 0]}
+
+    def __call__(self, messages, max_tokens):
+        system = messages[0].get('content') or '' if messages else ''
+        stage = 'filter' if 'job filtering assistant' in system else 'document'
+        with self.lock:
+            if stage == 'filter':
+                text = 'YES' if self.rng.random() < self.match_rate else 'NO'
+            else:
+                text = ' '.join(['lorem'] * min(max_tokens or 600, 600))
+            self.tokens[stage][0] += sum(estimate_tokens(m.get('content') or '') for m in messages)
+            self.tokens[stage][1] += len(text.split(' '))
+        return text
+
+class StandInLambdaClient:
+    """Lambda client stand-in: async invokes run the document generator handler in a thread pool"""
+
+    def __init__(self, document_generator, recorder, concurrency):
+        self.document_generator = document_generator
+        self.recorder = recorder
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.lock = threading.Lock()
+        self.pending = []
+        self.invokes = 0
+
+    def invoke(self, FunctionName, InvocationType, Payload):
+        event = json.loads(Payload)
+        with self.lock:
+            self.invokes += 1
+            self.pending.append(self.executor.submit(self._run, event))
+        return {'StatusCode': 202}
+
+    def _run(self, event):
+        start = time.perf_counter()
+        response = self.document_generator.lambda_handler(event, None)
+        self.recorder.add('document_generator', time.perf_counter() - start, start=start)
+        if response.get('statusCode') == 200:
+            self.recorder.mark(event['workflow_id'], 'completed')
+
+    def wait(self):
+        while True:
+            with self.lock:
+                pending, self.pending = self.pending, []
+            if not pending:
+                return
+            for future in pending:
+                future.result()
+
+def load_module(name, path):
+    """Load a file under a unique module name (every handler module is called app)"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.path.insert(0, os.path.dirname(path))
+    spec.loader.exec_module(module)
+    return module
+
+def load_corpus(path, count, seed):
+    """
+    Job records to replay
+
+    A corpus is JSONL of jobs table rows or recorded webhook payloads (the
+    row under "record"); without one, postings are generated around the
+    description fixtures.
+    """
+    if path:
+        jobs = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    data = json.loads(line)
+                    jobs.append(data.get('record') or data)
+        return jobs[:count] if count else jobs
+
+    rng = random.Random(seed)
+    fixtures = []
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+            fixtures.append(f.read())
+
+    jobs = []
+    for i in range(count):
+        jobs.append({
+            'title': rng.choice(TITLES),
+            'company': f"Company {rng.randrange(count)}",
+            'location': rng.choice(LOCATIONS),
+            'job_url': f"https://www.linkedin.com/jobs/view/{4000000000 + i}",
+            'posted_time': f"{rng.randrange(1, 24)} hours ago",
+            'applicants': f"{rng.randrange(200)} applicants",
+            'description_html': fixtures[i % len(fixtures)].replace('</p>', f" Requisition {i}.</p>", 1)
+        })
+    return jobs
+
+def to_job_data(record):
+    from src.scraper.description_normalizer import normalize_description
+    from src.scraper.job_data import EnhancedJobData
+
+    html = record.get('description_html')
+    fields = dict(record, id=record.get('id') or '', description=record.get('description') or normalize_description(html))
+    fields.pop('description_html', None)
+    return EnhancedJobData(fields, description_html=html)
+
+def setup_aws():
+    """Create the workflow table (with the batch index), the topic and the bucket in moto"""
+    boto3.resource('dynamodb').create_table(
+        TableName=os.environ['WORKFLOW_TABLE'],
+        KeySchema=[{'AttributeName': 'workflow_id', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[
+            {'AttributeName': 'workflow_id', 'AttributeType': 'S'},
+            {'AttributeName': 'batch_id', 'AttributeType': 'S'},
+            {'AttributeName': 'created_at', 'AttributeType': 'S'}
+        ],
+        GlobalSecondaryIndexes=[{
+            'IndexName': 'BatchIndex',
+            'KeySchema': [
+                {'AttributeName': 'batch_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'created_at', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    boto3.client('s3').create_bucket(
+        Bucket=os.environ['DOCUMENT_BUCKET'],
+        CreateBucketConfiguration={'LocationConstraint': os.environ['AWS_DEFAULT_REGION']}
+    )
+    os.environ['SNS_TOPIC_ARN'] = boto3.client('sns').create_topic(Name='job-notifications')['TopicArn']
+
+def count_aws_calls(clients):
+    """Count botocore calls per service on the shared clients"""
+    counts = {'dynamodb': 0, 'sns': 0, 's3': 0}
+    lock = threading.Lock()
+
+    def counter(service):
+        def count(**kwargs):
+            with lock:
+                counts[service] += 1
+        return count
+
+    for client in (clients.get_client('dynamodb'), clients.get_resource('dynamodb').meta.client):
+        client.meta.events.register('before-call.dynamodb', counter('dynamodb'))
+    clients.get_client('sns').meta.events.register('before-call.sns', counter('sns'))
+    clients.get_client('s3').meta.events.register('before-call.s3', counter('s3'))
+    return counts
+
+def start_api(job_processor, recorder, quiet_period):
+    """
+    Run the Flask API on a local port, forwarding flushed webhook batches to the job processor
+
+    Returns:
+        Tuple of (werkzeug server, webhook service)
+    """
+    from werkzeug.serving import make_server
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    api = load_module('api_app', os.path.join(API_DIR, 'app.py'))
+    from services.supabase_service import webhook_service
+
+    webhook_service.quiet_period = quiet_period
+    receive = webhook_service.process_webhook
+    process_batch = webhook_service.process_job_batch
+
+    def process_webhook(data):
+        recorder.mark((data.get('record') or {}).get('job_url'), 'webhook')
+        return receive(data)
+
+    def process_job_batch(payloads):
+        start = time.perf_counter()
+        for payload in payloads:
+            received = recorder.marks.get(payload.record.job_url, {}).get('webhook', start)
+            recorder.add('api_queue', start - received, start=received)
+        process_batch(payloads)
+
+        response = job_processor.lambda_handler({'payloads': [payload.to_dict() for payload in payloads]}, None)
+        processed = time.perf_counter()
+        recorder.add('job_processor', processed - start, items=len(payloads), start=start)
+
+        body = json.loads(response['body'])
+        for workflow_id in body.get('workflow_ids', []):
+            recorder.mark(workflow_id, 'created', processed)
+
+    webhook_service.process_webhook = process_webhook
+    webhook_service.process_job_batch = process_job_batch
+
+    server = make_server('127.0.0.1', 0, api.FlaskApplication().get_app(), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, webhook_service
+
+def drain(supabase, webhook_service, timeout=300):
+    """
+    Wait until every webhook is delivered and every queued payload is processed
+
+    Returns:
+        Number of payloads left in the API queue after its quiet timer had fired
+        (it skips the flush while a batch is still processing)
+    """
+    supabase.wait_for_webhooks(timeout)
+    stranded = 0
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        time.sleep(webhook_service.quiet_period * 2)
+        thread = webhook_service.processing_thread
+        busy = thread is not None and thread.is_alive()
+        timer = webhook_service.quiet_timer
+        waiting = timer is not None and timer.is_alive()
+        with webhook_service.queue_lock:
+            queued = len(webhook_service.webhook_queue)
+        if busy or waiting:
+            continue
+        if not queued:
+            return stranded
+        stranded += queued
+        webhook_service.process_queue_after_quiet_period()
+    return stranded
+
+def approve(user_response, table, recorder, approve_rate, rng):
+    """
+    Approve a share of the pending workflows, the way the notifications link to it
+
+    Per-job workflows are approved with one GET each; digest workflows with
+    one bulk POST per batch.
+
+    Returns:
+        Number of workflows approved
+    """
+    items = []
+    kwargs = {}
+    while True:
+        page = table.scan(**kwargs)
+        items.extend(page['Items'])
+        if 'LastEvaluatedKey' not in page:
+            break
+        kwargs['ExclusiveStartKey'] = page['LastEvaluatedKey']
+
+    chosen = [item for item in items if item.get('status') == 'PENDING_APPROVAL' and rng.random() < approve_rate]
+    for item in items:
+        job_url = (item.get('job_data') or {}).get('job_url')
+        if job_url:
+            recorder.mark(item['workflow_id'], 'job_url', job_url)
+
+    batches = {}
+    for item in chosen:
+        if item.get('batch_id'):
+            batches.setdefault(item['batch_id'], []).append(item['workflow_id'])
+        else:
+            start = time.perf_counter()
+            user_response.lambda_handler(
+                {'path': '/approve', 'httpMethod': 'GET', 'queryStringParameters': {'workflow_id': item['workflow_id']}},
+                None
+            )
+            recorder.add('user_response', time.perf_counter() - start, start=start)
+
+    for batch_id, workflow_ids in batches.items():
+        start = time.perf_counter()
+        user_response.lambda_handler({
+            'path': '/batch/approve',
+            'httpMethod': 'POST',
+            'body': json.dumps({'batch_id': batch_id, 'workflow_ids': workflow_ids})
+        }, None)
+        recorder.add('user_response', time.perf_counter() - start, items=len(workflow_ids), start=start)
+
+    return len(chosen)
+
+def expire_pending(table):
+    """Move the timeout of every pending workflow into the past"""
+    past = (datetime.now() - timedelta(minutes=1)).isoformat()
+    items = table.scan(
+        FilterExpression='#status = :pending',
+        ExpressionAttributeNames={'#status': 'status'},
+        ExpressionAttributeValues={':pending': 'PENDING_APPROVAL'}
+    )['Items']
+    for item in items:
+        table.update_item(
+            Key={'workflow_id': item['workflow_id']},
+            UpdateExpression='set timeout_at = :past',
+            ExpressionAttributeValues={':past': past}
+        )
+    return len(items)
+
+def end_to_end(recorder):
+    """Upsert-to-created and upsert-to-completed latencies per job"""
+    created, completed = [], []
+    for workflow_id, marks in list(recorder.marks.items()):
+        upserted = recorder.marks.get(marks.get('job_url'), {}).get('upserted')
+        if upserted is None:
+            continue
+        if 'created' in marks:
+            created.append(marks['created'] - upserted)
+        if 'completed' in marks:
+            completed.append(marks['completed'] - upserted)
+    return {'upsert_to_workflow': summarize(created), 'upsert_to_document': summarize(completed)}
+
+def compare(report, baseline, tolerance):
+    """Regressions of a report against a baseline report"""
+    regressions = []
+    for stage, current in report['stages'].items():
+        previous = baseline.get('stages', {}).get(stage)
+        if not previous or not current['count'] or not previous['count']:
+            continue
+        for metric in ('p50_ms', 'p95_ms'):
+            if current[metric] > previous[metric] * (1 + tolerance) and current[metric] - previous[metric] > 1:
+                regressions.append(f"{stage} {metric}: {previous[metric]} -> {current[metric]}")
+        if 'items_per_second' in current and current['items_per_second'] < previous['items_per_second'] * (1 - tolerance):
+            regressions.append(f"{stage} items/s: {previous['items_per_second']} -> {current['items_per_second']}")
+
+    # Costs are compared per replayed job so baselines of different sizes stay comparable
+    for key, value in report['cost'].items():
+        previous = baseline.get('cost', {}).get(key)
+        if not previous or key.endswith('_per_job'):
+            continue
+        current_per_job = value / max(report['jobs'], 1)
+        previous_per_job = previous / max(baseline.get('jobs', 1), 1)
+        if current_per_job > previous_per_job * (1 + tolerance):
+            regressions.append(f"cost {key} per job: {previous_per_job:.4g} -> {current_per_job:.4g}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', help='JSONL of job rows or recorded webhook payloads (generated if omitted)')
+    parser.add_argument('--jobs', type=int, default=200, help='Jobs to replay (0 replays the whole corpus)')
+    parser.add_argument('--rate', type=float, default=50.0, help='Jobs upserted per second (0 for no pacing)')
+    parser.add_argument('--batch-size', type=int, default=25, help='Jobs per upsert_jobs call')
+    parser.add_argument('--match-rate', type=float, default=0.3, help='Share of jobs the fake filter answers YES to')
+    parser.add_argument('--approve-rate', type=float, default=0.5, help='Share of workflows approved, the rest time out')
+    parser.add_argument('--notification-mode', choices=['per_job', 'digest'], default='digest')
+    parser.add_argument('--llm-latency', type=float, default=0.05, help='Fake OpenAI latency to first token (seconds)')
+    parser.add_argument('--token-latency', type=float, default=0.0, help='Fake OpenAI latency per token (seconds)')
+    parser.add_argument('--supabase-latency', type=float, default=0.0, help='Fake Supabase latency per request (seconds)')
+    parser.add_argument('--quiet-period', type=float, default=0.5, help='API webhook quiet period (seconds)')
+    parser.add_argument('--lambda-concurrency', type=int, default=8, help='Concurrent document generator invocations')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--log', default=os.devnull, help='File for the handlers\' output')
+    parser.add_argument('--report', help='Write the report as JSON to this file')
+    parser.add_argument('--baseline', help='Earlier report to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative regression')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = load_corpus(args.corpus, args.jobs, args.seed)
+    recorder = Recorder()
+
+    tokens = StageTokens(args.match_rate, args.seed)
+    openai_server = FakeOpenAIServer(first_token_latency=args.llm_latency, token_latency=args.token_latency,
+                                     reply=tokens).start()
+
+    os.environ.update({
+        'AWS_DEFAULT_REGION': 'us-east-2',
+        'AWS_ACCESS_KEY_ID': 'testing',
+        'AWS_SECRET_ACCESS_KEY': 'testing',
+        'WORKFLOW_TABLE': 'workflows',
+        'DOCUMENT_BUCKET': 'job-documents',
+        'DOCUMENT_GENERATOR_FUNCTION': 'document-generator',
+        'API_BASE_URL': 'https://example.execute-api.us-east-2.amazonaws.com/dev',
+        'NOTIFICATION_MODE': args.notification_mode,
+        'OPENAI_BASE_URL': openai_server.base_url,
+        'OPENAI_API_KEY': 'test'
+    })
+
+    log = open(args.log, 'w')
+    stdout = sys.stdout
+    supabase = None
+    api_server = None
+    lambda_client = None
+
+    try:
+        with mock_aws():
+            setup_aws()
+            from shared import clients
+            aws_calls = count_aws_calls(clients)
+
+            job_processor = load_module('job_processor_app', os.path.join(AWS_DIR, 'job_processor', 'app.py'))
+            user_response = load_module('user_response_app', os.path.join(AWS_DIR, 'user_response', 'app.py'))
+            document_generator = load_module('document_generator_app',
+                                             os.path.join(AWS_DIR, 'document_generator', 'app.py'))
+            timeout_checker = load_module('timeout_checker_app', os.path.join(AWS_DIR, 'timeout_checker', 'app.py'))
+
+            lambda_client = StandInLambdaClient(document_generator, recorder, args.lambda_concurrency)
+            clients._clients['lambda'] = lambda_client
+
+            sys.stdout = log
+            api_server, webhook_service = start_api(job_processor, recorder, args.quiet_period)
+            supabase = FakeSupabaseServer(
+                webhook_url=f"http://127.0.0.1:{api_server.server_port}/webhook/supabase",
+                latency=args.supabase_latency
+            ).start()
+
+            from src.database.database_manager import DatabaseManager
+            database = DatabaseManager(supabase.url, FAKE_SERVICE_KEY)
+            database.initialize_database()
+            supabase.reset_stats()
+
+            # Replay the corpus at the requested rate
+            started = time.perf_counter()
+            for offset in range(0, len(corpus), args.batch_size):
+                batch = [to_job_data(record) for record in corpus[offset:offset + args.batch_size]]
+                start = time.perf_counter()
+                for job in batch:
+                    recorder.mark(job.job_url, 'upserted', start)
+                database.upsert_jobs(batch)
+                recorder.add('supabase_upsert', time.perf_counter() - start, items=len(batch), start=start)
+
+                if args.rate:
+                    delay = started + (offset + len(batch)) / args.rate - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+
+            stranded = drain(supabase, webhook_service)
+            with supabase.lock:
+                for latency in supabase.webhook_latencies:
+                    recorder.add('webhook_delivery', latency)
+
+            table = clients.get_table()
+            approved = approve(user_response, table, recorder, args.approve_rate, rng)
+            lambda_client.wait()
+
+            expired = expire_pending(table)
+            start = time.perf_counter()
+            timeout_checker.lambda_handler({}, None)
+            recorder.add('timeout_checker', time.perf_counter() - start, items=expired, start=start)
+            elapsed = time.perf_counter() - started
+
+            sys.stdout = stdout
+            openai_cost = sum(
+                (prompt * PROMPT_PRICE + completion * COMPLETION_PRICE) / 1e6
+                for prompt, completion in tokens.tokens.values()
+            )
+            report = {
+                'config': {key: value for key, value in vars(args).items()
+                           if key not in ('log', 'report', 'baseline', 'tolerance')},
+                'elapsed_seconds': round(elapsed, 2),
+                'jobs': len(corpus),
+                'workflows': sum(1 for key, marks in recorder.marks.items() if 'created' in marks),
+                'approved': approved,
+                'timed_out': expired,
+                'stranded_payloads': stranded,
+                'stages': {stage: summarize(recorder.samples[stage], recorder.items[stage], recorder.spans.get(stage))
+                           for stage in STAGES},
+                'end_to_end': end_to_end(recorder),
+                'cost': {
+                    'openai_filter_tokens': sum(tokens.tokens['filter']),
+                    'openai_document_tokens': sum(tokens.tokens['document']),
+                    'openai_dollars': round(openai_cost, 4),
+                    'openai_dollars_per_job': round(openai_cost / max(len(corpus), 1), 6),
+                    'supabase_requests': supabase.stats['requests'],
+                    'webhooks': supabase.stats['webhooks_sent'],
+                    'sns_publishes': aws_calls['sns'],
+                    'dynamodb_calls': aws_calls['dynamodb'],
+                    's3_calls': aws_calls['s3'],
+                    'lambda_invokes': lambda_client.invokes
+                }
+            }
+    finally:
+        sys.stdout = stdout
+        log.close()
+        if supabase:
+            supabase.stop()
+        if api_server:
+            api_server.shutdown()
+        if lambda_client:
+            lambda_client.executor.shutdown(wait=False)
+        openai_server.stop()
+
+    print(f"{report['jobs']} jobs, {report['workflows']} workflows, {report['approved']} approved, "
+          f"{report['timed_out']} timed out in {report['elapsed_seconds']} s "
+          f"({args.notification_mode}, {args.rate:g} jobs/s in batches of {args.batch_size})\n")
+    print(f"{'stage':<22}{'count':>8}{'items/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for stage, summary in report['stages'].items():
+        print(f"{stage:<22}{summary['count']:>8}{summary['items_per_second']:>10.1f}"
+              f"{summary['p50_ms']:>10.1f}{summary['p95_ms']:>10.1f}{summary['p99_ms']:>10.1f}")
+    for name, summary in report['end_to_end'].items():
+        print(f"{name:<22}{summary['count']:>8}{'':>10}"
+              f"{summary['p50_ms']:>10.1f}{summary['p95_ms']:>10.1f}{summary['p99_ms']:>10.1f}")
+
+    print('\ncost proxy:')
+    for key, value in report['cost'].items():
+        print(f"  {key:<26}{value}")
+    if report['stranded_payloads']:
+        print(f"\n{report['stranded_payloads']} payloads were left in the API queue after its quiet timer "
+              f"fired during a batch and were flushed by the harness")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.report}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%} against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+"""
+Latency-configurable fake of the OpenAI chat completions API
+
+Serves /v1/chat/completions (plain and streamed) on a local port so the
+Lambdas can be benchmarked without calling OpenAI. Point the client at it
+with OPENAI_BASE_URL=http://127.0.0.1:<port>/v1.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler
+
+from bench_utils import QuietHTTPServer
+
+def estimate_tokens(text):
+    """Rough token estimate used for the fake usage numbers (~4 characters per token)"""
+    return max(1, len(text) // 4)
+
+class FakeOpenAIServer:
+    """
+    Fake OpenAI server running in a background thread
+
+    Args:
+        first_token_latency: Seconds before the first token is produced
+        token_latency: Seconds per generated token
+        completion_tokens: Tokens generated per completion (capped by max_tokens)
+        failure_rate: Fraction of requests answered with HTTP 500
+        reply: Callable (messages, max_tokens) -> str, overrides the generated text
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, first_token_latency=0.3, token_latency=0.01,
+                 completion_tokens=600, failure_rate=0.0, reply=None):
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+        self.completion_tokens = completion_tokens
+        self.failure_rate = failure_rate
+        self.reply = reply
+        self.lock = threading.Lock()
+        self.reset_stats()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                server._handle(self)
+
+        self.httpd = QuietHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def reset_stats(self):
+        """Reset the request and token counters"""
+        with self.lock:
+            self.stats = {'requests': 0, 'failures': 0, 'prompt_tokens': 0, 'completion_tokens': 0}
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _generate(self, messages, max_tokens):
+        if self.reply:
+            return self.reply(messages, max_tokens)
+        count = min(max_tokens or self.completion_tokens, self.completion_tokens)
+        return ' '.join(['lorem'] * count)
+
+    def _handle(self, request):
+        length = int(request.headers.get('Content-Length', 0))
+        body = json.loads(request.rfile.read(length) or b'{}')
+
+        with self.lock:
+            self.stats['requests'] += 1
+            failed = random.random() < self.failure_rate
+            if failed:
+                self.stats['failures'] += 1
+
+        if failed:
+            payload = json.dumps({'error': {'message': 'injected failure', 'type': 'server_error'}}).encode()
+            request.send_response(500)
+            request.send_header('Content-Type', 'application/json')
+            request.send_header('Content-Length', str(len(payload)))
+            request.end_headers()
+            request.wfile.write(payload)
+            return
+
+        messages = body.get('messages', [])
+        prompt_tokens = sum(estimate_tokens(m.get('content') or '') for m in messages)
+        text = self._generate(messages, body.get('max_tokens'))
+        words = text.split(' ')
+
+        with self.lock:
+            self.stats['prompt_tokens'] += prompt_tokens
+            self.stats['completion_tokens'] += len(words)
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        model = body.get('model', 'gpt-4')
+
+        time.sleep(self.first_token_latency)
+
+        if not body.get('stream'):
+            time.sleep(self.token_latency * len(words))
+            payload = json.dumps({
+                'id': completion_id,
+                'object': 'chat.completion',
+                'created': created,
+                'model': model,
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': text},
+                    'finish_reason': 'stop'
+                }],
+                'usage': {
+                    'prompt_tokens': prompt_tokens,
+                    'completion_tokens': len(words),
+                    'total_tokens': prompt_tokens + len(words)
+                }
+            }).encode()
+            request.send_response(200)
+            request.send_header('Content-Type', 'application/json')
+            request.send_header('Content-Length', str(len(payload)))
+            request.end_headers()
+            request.wfile.write(payload)
+            return
+
+        request.send_response(200)
+        request.send_header('Content-Type', 'text/event-stream')
+        request.send_header('Transfer-Encoding', 'chunked')
+        request.end_headers()
+
+        def send_event(data):
+            chunk = f"data: {data}\n\n".encode()
+            request.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+            request.wfile.flush()
+
+        for i, word in enumerate(words):
+            send_event(json.dumps({
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': created,
+                'model': model,
+                'choices': [{
+                    'index': 0,
+                    'delta': {'content': word if i == 0 else ' ' + word},
+                    'finish_reason': None
+                }]
+            }))
+            time.sleep(self.token_latency)
+
+        send_event('[DONE]')
+        request.wfile.write(b"0\r\n\r\n")
+        request.wfile.flush()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run a fake OpenAI chat completions server')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--first-token-latency', type=float, default=0.3)
+    parser.add_argument('--token-latency', type=float, default=0.01)
+    parser.add_argument('--completion-tokens', type=int, default=600)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    fake = FakeOpenAIServer(
+        port=args.port,
+        first_token_latency=args.first_token_latency,
+        token_latency=args.token_latency,
+        completion_tokens=args.completion_tokens,
+        failure_rate=args.failure_rate
+    )
+    print(f"Fake OpenAI server listening on {fake.base_url}")
+    fake.httpd.serve_forever()
@@ -0,0 +1,130 @@
+"""
+Compare bulk filtering and dedup on a list of JobRecords with JobBatch
+
+Runs the same workload (keep jobs at a set of companies and locations,
+then drop repeated job URLs) over per-row records and over the columnar
+batch, plus the vectorized NumPy / Arrow paths when those are installed.
+Also reports build throughput and retained memory of both representations.
+
+Usage:
+    python benchmarks/job_batch.py --count 100000
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+
+from bench_utils import import_models, rate
+
+import_models()
+from job_assistant_models import JobRecord, JobBatch
+
+def make_records(count):
+    locations = ['Remote', 'New York, NY', 'San Francisco, CA', 'Austin, TX', 'Seattle, WA', None]
+    return [JobRecord(
+        id=f"id-{i}",
+        # Roughly one in ten postings is a repost of an earlier URL
+        job_url=f"https://www.linkedin.com/jobs/view/{i if i % 10 else i // 2}",
+        title='Software Engineer',
+        company=f"Company {i % 1000}",
+        location=locations[i % len(locations)],
+        posted_time='2 days ago',
+        applicants='100 applicants',
+        description='<p>Build and operate backend services.</p>' * 40
+    ) for i in range(count)]
+
+def retained_bytes(func):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = func()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del result
+    return size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    records = make_records(args.count)
+    companies = {f"Company {i}" for i in range(0, 1000, 3)}
+    locations = {'Remote', 'New York, NY'}
+
+    # Decode from JSON lines so both representations own their field values
+    lines = [json.dumps(record.to_dict()) for record in records]
+    row_bytes = retained_bytes(lambda: [JobRecord.from_dict(json.loads(line)) for line in lines])
+    batch_bytes = retained_bytes(lambda: JobBatch.from_records(json.loads(line) for line in lines))
+    print(f"{args.count} records")
+    print(f"{'retained MB (records)':<34}{row_bytes / 1e6:>12.1f}")
+    print(f"{'retained MB (JobBatch)':<34}{batch_bytes / 1e6:>12.1f}")
+    print(f"{'JobBatch.from_records':<34}{rate(lambda: JobBatch.from_records(records), args.count):>12,.0f} records/s\n")
+
+    batch = JobBatch.from_records(records)
+
+    def rows_workload():
+        seen = set()
+        result = []
+        for record in records:
+            if record.company in companies and record.location in locations and record.job_url not in seen:
+                seen.add(record.job_url)
+                result.append(record)
+        return result
+
+    def batch_workload():
+        return batch.filter_values('company', companies).filter_values('location', locations).dedup('job_url')
+
+    expected = len(rows_workload())
+    assert len(batch_workload()) == expected, "JobBatch result does not match the per-row result"
+    print(f"filter + dedup keeps {expected} records")
+
+    candidates = [
+        ('list of JobRecord', rows_workload),
+        ('JobBatch', batch_workload),
+    ]
+
+    try:
+        import numpy as np
+        columns = batch.to_numpy()
+
+        def numpy_workload():
+            company_codes = [i for i, value in enumerate(columns['company_vocabulary']) if value in companies]
+            location_codes = [i for i, value in enumerate(columns['location_vocabulary']) if value in locations]
+            mask = np.isin(columns['company'], company_codes) & np.isin(columns['location'], location_codes)
+            selected = np.flatnonzero(mask)
+            _, first = np.unique(columns['job_url'][selected].astype(str), return_index=True)
+            return selected[np.sort(first)]
+
+        assert len(numpy_workload()) == expected, "NumPy result does not match the per-row result"
+        candidates.append(('JobBatch.to_numpy (vectorized)', numpy_workload))
+        candidates.append(('JobBatch.to_numpy (conversion)', batch.to_numpy))
+    except ImportError:
+        print("numpy not installed, skipping the NumPy path")
+
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        table = batch.to_arrow()
+
+        def arrow_workload():
+            mask = pc.and_(
+                pc.is_in(table['company'], value_set=pa.array(sorted(companies), pa.string())),
+                pc.is_in(table['location'], value_set=pa.array(sorted(locations), pa.string()))
+            )
+            selected = table.filter(mask)
+            return selected.group_by('job_url', use_threads=False).aggregate([])
+
+        assert arrow_workload().num_rows == expected, "Arrow result does not match the per-row result"
+        candidates.append(('JobBatch.to_arrow (vectorized)', arrow_workload))
+        candidates.append(('JobBatch.to_arrow (conversion)', batch.to_arrow))
+    except ImportError:
+        print("pyarrow not installed, skipping the Arrow path")
+
+    print()
+    for label, func in candidates:
+        print(f"{label:<34}{rate(func, args.count):>12,.0f} records/s")
+
+if __name__ == '__main__':
+    main()
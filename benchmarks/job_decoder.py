@@ -0,0 +1,118 @@
+"""
+Benchmark the shared job record decoder against the previous parsers
+
+The previous parsers (the API's field-by-field parse_job_record and the
+dataclass from_dict with per-call timestamp parsing) are reproduced here
+as reference implementations. Payloads are read from a JSON-lines corpus
+of recorded webhooks, or generated when no corpus is given.
+
+Usage:
+    python benchmarks/job_decoder.py --corpus webhooks.jsonl
+    python benchmarks/job_decoder.py --count 50000
+"""
+import argparse
+import json
+from datetime import datetime
+
+from bench_utils import import_models, rate
+
+import_models()
+from job_assistant_models import JobRecord, SlottedJobRecord, decode_job_record, decode_webhook_payload
+
+def legacy_parse_job_record(record_data):
+    """Previous SupabaseWebhookService.parse_job_record"""
+    created_at = None
+    if 'created_at' in record_data and record_data['created_at']:
+        try:
+            created_at = datetime.fromisoformat(record_data['created_at'].replace('Z', '+00:00'))
+        except (ValueError, TypeError):
+            pass
+    updated_at = None
+    if 'updated_at' in record_data and record_data['updated_at']:
+        try:
+            updated_at = datetime.fromisoformat(record_data['updated_at'].replace('Z', '+00:00'))
+        except (ValueError, TypeError):
+            pass
+    return JobRecord(
+        id=record_data.get('id', ''),
+        job_url=record_data.get('job_url', ''),
+        title=record_data.get('title', ''),
+        company=record_data.get('company', ''),
+        location=record_data.get('location'),
+        posted_time=record_data.get('posted_time'),
+        applicants=record_data.get('applicants'),
+        description=record_data.get('description'),
+        created_at=created_at,
+        updated_at=updated_at
+    )
+
+def legacy_from_dict(data):
+    """Previous JobRecord.from_dict"""
+    if 'created_at' in data and data['created_at'] and isinstance(data['created_at'], str):
+        try:
+            data = data.copy()
+            data['created_at'] = datetime.fromisoformat(data['created_at'].replace('Z', '+00:00'))
+        except (ValueError, TypeError):
+            data['created_at'] = None
+    if 'updated_at' in data and data['updated_at'] and isinstance(data['updated_at'], str):
+        try:
+            data = data.copy() if 'created_at' not in data else data
+            data['updated_at'] = datetime.fromisoformat(data['updated_at'].replace('Z', '+00:00'))
+        except (ValueError, TypeError):
+            data['updated_at'] = None
+    return JobRecord(**data)
+
+def generate_corpus(count):
+    timestamps = [f"2025-03-{day:02d}T{hour:02d}:00:00.123456+00:00" for day in range(1, 29) for hour in range(0, 24, 6)]
+    payloads = []
+    for i in range(count):
+        record = {
+            'id': f"0b6c{i:08d}-0000-0000-0000-000000000000",
+            'job_url': f"https://www.linkedin.com/jobs/view/{4000000000 + i}",
+            'title': 'Senior Software Engineer',
+            'company': f"Company {i % 700}",
+            'location': 'New York, NY',
+            'posted_time': '3 hours ago',
+            'applicants': 'Over 100 applicants',
+            'description': '<p>About the job</p>' * 20,
+            'created_at': timestamps[i % len(timestamps)],
+            'updated_at': timestamps[(i * 7) % len(timestamps)]
+        }
+        payloads.append({
+            'type': 'UPDATE' if i % 3 else 'INSERT',
+            'table': 'jobs',
+            'schema': 'public',
+            'record': record,
+            'old_record': record if i % 3 else None
+        })
+    return payloads
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', help='JSON-lines file of recorded webhook payloads')
+    parser.add_argument('--count', type=int, default=50000, help='Generated payloads when no corpus is given')
+    args = parser.parse_args()
+
+    if args.corpus:
+        with open(args.corpus) as f:
+            payloads = [json.loads(line) for line in f if line.strip()]
+    else:
+        payloads = generate_corpus(args.count)
+
+    records = [p['record'] for p in payloads if p.get('record')]
+    print(f"{len(payloads)} payloads, {len(records)} records\n")
+
+    candidates = [
+        ('legacy parse_job_record', lambda: [legacy_parse_job_record(r) for r in records]),
+        ('legacy JobRecord.from_dict', lambda: [legacy_from_dict(r) for r in records]),
+        ('decode_job_record', lambda: [decode_job_record(r) for r in records]),
+        ('decode_job_record (slotted)', lambda: [decode_job_record(r, SlottedJobRecord) for r in records]),
+    ]
+    for label, func in candidates:
+        print(f"{label:<30}{rate(func, len(records)):>14,.0f} records/s")
+
+    payload_rate = rate(lambda: [decode_webhook_payload(p) for p in payloads], len(payloads))
+    print(f"{'decode_webhook_payload':<30}{payload_rate:>14,.0f} payloads/s")
+
+if __name__ == '__main__':
+    main()
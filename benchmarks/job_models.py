@@ -0,0 +1,73 @@
+"""
+Compare the dataclass models with the slotted variants
+
+Reports objects per second for from_dict / to_dict, retained bytes per
+object and serialization throughput for the available codecs.
+
+Usage:
+    python benchmarks/job_models.py --count 100000
+"""
+import argparse
+import gc
+import tracemalloc
+
+from bench_utils import import_models, rate
+
+models = import_models()
+from job_assistant_models import JobRecord
+from job_assistant_models.compact_models import (
+    SlottedJobRecord, FrozenJobRecord, dumps_records, loads_records, msgpack
+)
+
+def make_dicts(count):
+    timestamps = [f"2025-03-{day:02d}T12:00:00.000000Z" for day in range(1, 29)]
+    return [{
+        'id': f"id-{i}",
+        'job_url': f"https://www.linkedin.com/jobs/view/{i}",
+        'title': 'Software Engineer',
+        'company': f"Company {i % 500}",
+        'location': 'Remote',
+        'posted_time': '2 days ago',
+        'applicants': '100 applicants',
+        'description': 'Build things.',
+        'created_at': timestamps[i % len(timestamps)],
+        'updated_at': timestamps[(i + 1) % len(timestamps)]
+    } for i in range(count)]
+
+def bytes_per_object(cls, dicts):
+    """Average memory retained by the decoded objects (excluding shared field values)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [cls.from_dict(d) for d in dicts]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del objects
+    return size / len(dicts)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    dicts = make_dicts(args.count)
+
+    print(f"{'class':<18}{'from_dict/s':>14}{'to_dict/s':>14}{'bytes/object':>14}")
+    for cls in (JobRecord, SlottedJobRecord, FrozenJobRecord):
+        objects = [cls.from_dict(d) for d in dicts]
+        decode = rate(lambda: [cls.from_dict(d) for d in dicts], args.count)
+        encode = rate(lambda: [o.to_dict() for o in objects], args.count)
+        print(f"{cls.__name__:<18}{decode:>14,.0f}{encode:>14,.0f}{bytes_per_object(cls, dicts):>14,.0f}")
+
+    records = [SlottedJobRecord.from_dict(d) for d in dicts]
+    formats = ['json'] + (['msgpack'] if msgpack is not None else [])
+    print(f"\n{'format':<18}{'dumps/s':>14}{'loads/s':>14}{'bytes/object':>14}")
+    for fmt in formats:
+        data = dumps_records(records, fmt)
+        dumps = rate(lambda: dumps_records(records, fmt), args.count)
+        loads = rate(lambda: loads_records(data, SlottedJobRecord, fmt), args.count)
+        print(f"{fmt:<18}{dumps:>14,.0f}{loads:>14,.0f}{len(data) / args.count:>14,.0f}")
+
+if __name__ == '__main__':
+    main()
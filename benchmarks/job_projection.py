@@ -0,0 +1,116 @@
+"""
+Bytes transferred and latency of listing the stored jobs
+
+Fills the fake Supabase server's jobs table with --jobs rows (descriptions
+from the fixtures) and lists every job three ways, at --latency seconds
+per request:
+
+- full rows with offset pagination: select * page by page, what a caller
+  had to do before DatabaseManager had a read API
+- the key columns with offset pagination
+- DatabaseManager.iter_job_keys: the key columns with keyset pagination
+  (job_url greater than the last one seen)
+
+On Postgres the keyset pages are range scans of the jobs_job_url_keys_idx
+covering index, while every offset page scans and discards all the rows
+before it. The fake is SQLite with an index on job_url, so it shows the
+same shape at a smaller scale.
+
+Usage:
+    python benchmarks/job_projection.py --jobs 50000 --page-size 1000 --latency 0.02
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scraper'))
+
+from bench_utils import import_models
+from fake_supabase_server import FAKE_SERVICE_KEY, FakeSupabaseServer
+
+import_models()
+
+from src.database.database_manager import JOB_KEY_COLUMNS, DatabaseManager
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'descriptions')
+
+def seed_jobs(server, count, seed):
+    rng = random.Random(seed)
+    descriptions = []
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+            descriptions.append(f.read())
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(count):
+        description = rng.choice(descriptions)
+        rows.append({
+            'id': f"{i:08d}-0000-4000-8000-000000000000",
+            'job_url': f"https://www.linkedin.com/jobs/view/{rng.randrange(3 * 10 ** 9, 4 * 10 ** 9)}/",
+            'title': 'Software Engineer',
+            'company': f"Company {i % 500}",
+            'location': 'Remote',
+            'posted_time': '3 hours ago',
+            'applicants': '45 applicants',
+            'description': description,
+            'content_hash': hashlib.sha256(f"{i}{description}".encode()).hexdigest(),
+            'created_at': (now - timedelta(minutes=i)).isoformat(),
+            'updated_at': now.isoformat()
+        })
+    for start in range(0, len(rows), 5000):
+        server.upsert_rows('jobs', rows[start:start + 5000], on_conflict='job_url')
+    return {row['job_url'] for row in rows}
+
+def offset_pages(database, select, page_size):
+    """Rows of every page read with limit/offset"""
+    offset = 0
+    while True:
+        rows = database.supabase.table('jobs').select(select).order('job_url') \
+            .range(offset, offset + page_size - 1).execute().data
+        yield from rows
+        if len(rows) < page_size:
+            return
+        offset += page_size
+
+def measure(label, server, rows, job_urls):
+    server.reset_stats()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        listed = [row['job_url'] for row in rows]
+    elapsed = time.perf_counter() - start
+    assert len(listed) == len(job_urls) and set(listed) == job_urls, f"{label}: listed {len(listed)} jobs"
+    print(f"{label:<34}{server.stats['requests']:>10}{server.stats['bytes_sent'] / 2 ** 20:>10.1f}"
+          f"{elapsed:>10.2f}{len(listed) / elapsed:>12,.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=50000)
+    parser.add_argument('--page-size', type=int, default=1000)
+    parser.add_argument('--latency', type=float, default=0.02, help='Seconds added to every Supabase request')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    server = FakeSupabaseServer().start()
+    try:
+        job_urls = seed_jobs(server, args.jobs, args.seed)
+        server.latency = args.latency
+        database = DatabaseManager(server.url, FAKE_SERVICE_KEY)
+        keys = ','.join(JOB_KEY_COLUMNS)
+
+        print(f"{len(job_urls):,} jobs, {args.page_size} per page, {args.latency * 1000:g} ms per request\n")
+        print(f"{'listing':<34}{'requests':>10}{'MiB':>10}{'s':>10}{'rows/s':>12}")
+        measure('full rows, offset', server, offset_pages(database, '*', args.page_size), job_urls)
+        measure('key columns, offset', server, offset_pages(database, keys, args.page_size), job_urls)
+        measure('iter_job_keys (keyset)', server, database.iter_job_keys(args.page_size), job_urls)
+    finally:
+        server.stop()
+
+if __name__ == '__main__':
+    main()
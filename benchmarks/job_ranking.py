@@ -0,0 +1,88 @@
+"""
+Throughput and quality of the job processor's profile ranking
+
+Generates postings for a mix of roles, ranks them against a profile
+describing one of them, and reports jobs scored per second (split into
+feature hashing and the NumPy scoring), top-K selection throughput and
+precision@K of the target role among the kept jobs.
+
+Usage:
+    python benchmarks/job_ranking.py --count 100000 --top-k 50
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'aws'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'aws', 'job_processor'))
+
+from bench_utils import rate
+from ranking import CandidateProfile, JobRanker
+
+ROLES = {
+    'backend': ('Backend Engineer', 'python django postgresql rest apis microservices aws kubernetes docker ci/cd'),
+    'frontend': ('Frontend Engineer', 'react typescript css accessibility design systems next.js webpack browser performance'),
+    'data': ('Data Engineer', 'spark airflow sql data pipelines warehouse dbt kafka etl snowflake'),
+    'mobile': ('iOS Engineer', 'swift swiftui xcode mobile app store uikit core data objective-c'),
+    'sales': ('Account Executive', 'quota pipeline saas sales crm salesforce prospecting negotiation enterprise deals')
+}
+
+FILLER = ('team collaborate fast-paced environment growth opportunity benefits health insurance '
+          'flexible hours culture mission customers product impact ownership communication').split()
+
+def make_jobs(count, rng):
+    jobs = []
+    names = sorted(ROLES)
+    for i in range(count):
+        role = names[i % len(names)]
+        title, skills = ROLES[role]
+        words = skills.split()
+        # Each posting mentions a random subset of its role's skills amid shared filler
+        body = rng.sample(words, 6) + rng.sample(FILLER, 12) + rng.sample(words, 3)
+        rng.shuffle(body)
+        jobs.append({
+            'id': f"job-{i}",
+            'role': role,
+            'title': f"{rng.choice(['', 'Senior ', 'Staff '])}{title}",
+            'company': f"Company {rng.randrange(2000)}",
+            'location': rng.choice(['Remote', 'New York, NY', 'Austin, TX']),
+            'description': ' '.join(body * 8)
+        })
+    return jobs
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=100000)
+    parser.add_argument('--top-k', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.count, random.Random(args.seed))
+    profile = CandidateProfile.from_dict({'documents': [
+        {'text': 'Backend engineer building python and django services, rest apis and microservices '
+                 'on aws with postgresql, docker and kubernetes', 'weight': 1.0},
+        {'text': 'Platform engineer: kubernetes, docker, ci/cd, aws', 'weight': 0.8}
+    ]})
+    ranker = JobRanker(profile)
+
+    print(f"{args.count} jobs, profile with {len(profile.documents)} documents\n")
+    start = time.perf_counter()
+    encoded = ranker._encode(jobs)
+    encode_seconds = time.perf_counter() - start
+    print(f"{'feature hashing':<24}{args.count / encode_seconds:>12,.0f} jobs/s")
+    print(f"{'  nonzeros per job':<24}{len(encoded[1]) / args.count:>12,.0f}")
+
+    print(f"{'NumPy scoring':<24}{rate(lambda: ranker._score_encoded(*encoded), args.count):>12,.0f} jobs/s")
+    print(f"{'score (end to end)':<24}{rate(lambda: ranker.score(jobs), args.count):>12,.0f} jobs/s")
+    print(f"{'top_k':<24}{rate(lambda: ranker.top_k(jobs, args.top_k), args.count):>12,.0f} jobs/s")
+
+    ranked = ranker.top_k(jobs, args.top_k)
+    relevant = sum(1 for _, job in ranked if job['role'] == 'backend')
+    print(f"\nprecision@{args.top_k}: {relevant / max(len(ranked), 1):.2f} "
+          f"(target role is {1 / len(ROLES):.0%} of the jobs)")
+    print(f"LLM calls: {len(ranked)} instead of {args.count}")
+
+if __name__ == '__main__':
+    main()
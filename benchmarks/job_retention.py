@@ -0,0 +1,138 @@
+"""
+Scraper startup latency and rows deleted per second of the job retention
+
+Before, initialize_database called delete_old_jobs on every startup: one
+unbounded delete on the critical path before the first page is scraped.
+Retention now runs separately (scraper/retention.py) as bounded
+delete_old_jobs_batch calls. This benchmark runs both against the fake
+Supabase server with --latency per request, on a jobs table of --jobs rows
+of which --old-fraction are past the retention period:
+
+- startup: initialize_database with an unchanged migrations manifest, and
+  the same plus the previous delete_old_jobs call
+- retention: DatabaseManager.delete_old_jobs at several batch sizes, with
+  rows deleted per second, calls made and the longest call (how long one
+  transaction holds its row locks), checking that exactly the old rows go
+
+The fake is SQLite with an index on created_at, so rows/s measures the
+client loop and request overhead rather than Postgres itself.
+
+Usage:
+    python benchmarks/job_retention.py --jobs 50000 --old-fraction 0.5 --latency 0.05
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scraper'))
+
+from bench_utils import import_models
+from fake_supabase_server import FAKE_SERVICE_KEY, FakeSupabaseServer
+from migration_startup import track_migrations
+
+import_models()
+
+from src.database.database_manager import DatabaseManager
+
+def seed_jobs(server, count, old_fraction, seed):
+    """Replace the jobs table with count jobs; returns how many are past the retention period"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    with server.db_lock:
+        server.db.execute("delete from rows where tbl = 'jobs'")
+        server.db.commit()
+    rows = []
+    old = 0
+    for i in range(count):
+        is_old = rng.random() < old_fraction
+        old += is_old
+        age = timedelta(hours=rng.uniform(25, 24 * 14) if is_old else rng.uniform(0, 23))
+        rows.append({
+            'id': f"job-{i}",
+            'job_url': f"https://www.linkedin.com/jobs/view/{3900000000 + i}/",
+            'title': 'Software Engineer',
+            'company': f"Company {i % 500}",
+            'created_at': (now - age).isoformat()
+        })
+    for start in range(0, len(rows), 5000):
+        server.upsert_rows('jobs', rows[start:start + 5000], on_conflict='job_url')
+    return old
+
+def timed(func):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func()
+    return result, time.perf_counter() - start
+
+class TimedCalls:
+    """Records how long each delete_old_jobs_batch call takes"""
+
+    def __init__(self, server):
+        self.durations = []
+        self._batch = server.rpc['delete_old_jobs_batch']
+        server.rpc['delete_old_jobs_batch'] = self
+
+    def __call__(self, args):
+        start = time.perf_counter()
+        result = self._batch(args)
+        self.durations.append(time.perf_counter() - start)
+        return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=50000)
+    parser.add_argument('--old-fraction', type=float, default=0.5)
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds added to every Supabase request')
+    parser.add_argument('--batch-sizes', default='1000,5000,20000')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='retention-bench-')
+    manifest = os.path.join(workdir, 'migrations.json')
+    server = FakeSupabaseServer(latency=args.latency).start()
+    track_migrations(server)
+    try:
+        database = DatabaseManager(server.url, FAKE_SERVICE_KEY, migration_manifest=manifest)
+        timed(database.initialize_database)  # apply the migrations and write the manifest
+
+        print(f"{args.jobs:,} jobs, {args.old_fraction:.0%} past retention, {args.latency * 1000:g} ms per request\n")
+
+        seed_jobs(server, args.jobs, args.old_fraction, args.seed)
+        _, startup = timed(database.initialize_database)
+        _, previous_delete = timed(lambda: database.supabase.rpc('delete_old_jobs').execute())
+        print(f"{'startup':<34}{'ms':>10}")
+        print(f"{'initialize_database':<34}{startup * 1000:>10.0f}")
+        print(f"{'  previously, with delete_old_jobs':<34}{(startup + previous_delete) * 1000:>10.0f}")
+        print(f"{'  saved per scraper run':<34}{previous_delete * 1000:>10.0f}\n")
+
+        print(f"{'retention':<34}{'deleted':>10}{'calls':>8}{'rows/s':>12}{'longest call ms':>18}")
+        old = seed_jobs(server, args.jobs, args.old_fraction, args.seed)
+        _, elapsed = timed(lambda: database.supabase.rpc('delete_old_jobs').execute())
+        print(f"{'delete_old_jobs (one call)':<34}{old:>10,}{1:>8}{old / elapsed:>12,.0f}{elapsed * 1000:>18.0f}")
+
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+        for batch_size in (int(size) for size in args.batch_sizes.split(',')):
+            old = seed_jobs(server, args.jobs, args.old_fraction, args.seed)
+            calls = TimedCalls(server)
+            deleted, elapsed = timed(lambda: database.delete_old_jobs(1, batch_size, max_batches=10 ** 6))
+            server.rpc['delete_old_jobs_batch'] = calls._batch
+
+            remaining = server.rows('jobs')
+            assert deleted == old, f"deleted {deleted} of {old} old jobs"
+            assert len(remaining) == args.jobs - old and all(row['created_at'] >= cutoff for row in remaining)
+            print(f"{f'delete_old_jobs_batch({batch_size})':<34}{deleted:>10,}{len(calls.durations):>8}"
+                  f"{deleted / elapsed:>12,.0f}{(max(calls.durations) + args.latency) * 1000:>18.0f}")
+    finally:
+        server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
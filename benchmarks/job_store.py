@@ -0,0 +1,186 @@
+"""
+Indexing throughput and query latency of the local job store at 1M rows
+
+Fills a JobStore (SQLite with an FTS5 index) with --jobs generated
+postings, seen over --months of history, through the same add path the
+DataManager uses. Descriptions are built from the sentences of the
+fixtures plus skills, companies and titles drawn from Zipf-like
+distributions, so common and rare terms have realistic posting lists.
+
+Reports:
+
+- indexing: jobs/s of new jobs, of rescrapes with unchanged content (only
+  last_seen moves) and of rescrapes with an edited description
+- queries: p50/p95 latency over --queries runs of each search_jobs.py
+  query shape, before and after optimizing the index, with matches counted
+  separately for the common terms
+
+Usage:
+    python benchmarks/job_store.py --jobs 1000000 --months 6 --queries 50
+"""
+import argparse
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scraper'))
+
+from bench_utils import import_models
+
+import_models()
+
+from src.data.job_store import JobStore
+from src.scraper.description_normalizer import normalize_description
+from src.scraper.job_data import EnhancedJobData
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'descriptions')
+
+SENIORITY = ['', 'Senior ', 'Staff ', 'Lead ', 'Junior ', 'Principal ']
+ROLES = ['Backend Engineer', 'Software Engineer', 'Data Scientist', 'Platform Engineer', 'Frontend Developer',
+         'Machine Learning Engineer', 'Site Reliability Engineer', 'Data Engineer', 'Product Manager',
+         'Security Engineer', 'Mobile Developer', 'Engineering Manager']
+LOCATIONS = ['Remote', 'New York, NY', 'Berlin, Germany', 'London, United Kingdom', 'San Francisco, CA',
+             'Toronto, Canada', 'Austin, TX', 'Amsterdam, Netherlands', 'Paris, France', 'Zürich, Switzerland']
+SKILLS = ['python', 'java', 'go', 'rust', 'typescript', 'react', 'kubernetes', 'docker', 'aws', 'gcp', 'azure',
+          'terraform', 'postgres', 'kafka', 'spark', 'airflow', 'pytorch', 'tensorflow', 'graphql', 'redis',
+          'elasticsearch', 'django', 'flask', 'fastapi', 'scala', 'kotlin', 'swift', 'snowflake', 'dbt', 'linux']
+
+def zipf_choice(rng, items):
+    """An item with probability roughly proportional to 1 / rank"""
+    return items[min(int(len(items) ** rng.random()) - 1, len(items) - 1)]
+
+class PostingGenerator:
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        sentences = []
+        for name in sorted(os.listdir(FIXTURES_DIR)):
+            with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+                text = normalize_description(f.read())
+            sentences += [s.strip() for s in re.split(r'(?<=[.!?])\s+|\n+', text) if len(s.strip()) > 20]
+        self.sentences = sentences
+        # Long tail of rare terms, e.g. niche tools and certifications
+        self.skills = SKILLS + [f"tool{i}" for i in range(5000)]
+        self.companies = [f"{self.rng.choice(['Acme', 'Globex', 'Initech', 'Umbrella', 'Stark', 'Wayne'])} "
+                          f"{self.rng.choice(['Labs', 'Systems', 'Analytics', 'Health', 'Robotics'])} {i}"
+                          for i in range(20000)]
+
+    def job(self, i):
+        rng = self.rng
+        skills = {zipf_choice(rng, self.skills) for _ in range(8)}
+        description = '\n\n'.join(rng.sample(self.sentences, min(12, len(self.sentences))))
+        description += f"\n\nRequirements: {', '.join(sorted(skills))}.\n\nRequisition {rng.getrandbits(48):x}"
+        return EnhancedJobData({
+            'id': '',
+            'job_url': f"https://www.linkedin.com/jobs/view/{3000000000 + i}/",
+            'title': f"{rng.choice(SENIORITY)}{zipf_choice(rng, ROLES)}",
+            'company': zipf_choice(rng, self.companies),
+            'location': rng.choice(LOCATIONS),
+            'posted_time': f"{rng.randrange(1, 23)} hours ago",
+            'applicants': f"{rng.randrange(1, 200)} applicants",
+            'description': description
+        })
+
+def fill(store, generator, start, count, months, chunk_size):
+    """Add jobs start..start+count as chunks seen over the history; returns the seconds spent writing"""
+    now = datetime.now(timezone.utc)
+    elapsed = 0.0
+    chunks = max(1, count // chunk_size)
+    for n, offset in enumerate(range(start, start + count, chunk_size)):
+        jobs = [generator.job(i) for i in range(offset, min(offset + chunk_size, start + count))]
+        seen_at = (now - timedelta(days=months * 30 * (1 - n / chunks))).isoformat(timespec='seconds')
+        begin = time.perf_counter()
+        store.add_jobs(jobs, seen_at=seen_at)
+        elapsed += time.perf_counter() - begin
+    return elapsed
+
+def rescrape(store, total, count, edit):
+    """Write count stored jobs again, optionally with an edited description"""
+    rng = random.Random(1)
+    jobs = []
+    for i in rng.sample(range(total), count):
+        job = store.connection.execute("select * from jobs where job_url = ?",
+                                       (f"https://www.linkedin.com/jobs/view/{3000000000 + i}/",)).fetchone()
+        job = EnhancedJobData({name: job[name] for name in ('job_url', 'title', 'company', 'location',
+                                                            'posted_time', 'applicants', 'description')})
+        if edit:
+            job.description += "\n\nThis role was updated."
+        jobs.append(job)
+    begin = time.perf_counter()
+    store.add_jobs(jobs)
+    return count / (time.perf_counter() - begin)
+
+def query_shapes(generator):
+    """(label, callable producing search kwargs) for every query shape"""
+    rare = [skill for skill in generator.skills[len(SKILLS):]]
+    return [
+        ('keyword, common term', lambda rng: {'keywords': 'python'}),
+        ('keyword, rare term', lambda rng: {'keywords': rng.choice(rare)}),
+        ('boolean keywords', lambda rng: {'keywords': f"{rng.choice(SKILLS)} AND ({rng.choice(SKILLS)} OR "
+                                                      f"{rng.choice(SKILLS)})"}),
+        ('title phrase', lambda rng: {'title': rng.choice(ROLES)}),
+        ('company', lambda rng: {'company': zipf_choice(rng, generator.companies)}),
+        ('title + keyword + 30 days', lambda rng: {'title': rng.choice(ROLES), 'keywords': rng.choice(SKILLS),
+                                                   'days': 30}),
+        ('no text, last 7 days', lambda rng: {'days': 7}),
+        ('keyword, ranked (bm25)', lambda rng: {'keywords': rng.choice(SKILLS), 'rank': True}),
+    ]
+
+def run_queries(store, generator, runs, seed):
+    rng = random.Random(seed)
+    print(f"{'query':<30}{'p50 ms':>9}{'p95 ms':>9}{'results':>9}")
+    for label, make in query_shapes(generator):
+        latencies = []
+        results = 0
+        for _ in range(runs):
+            kwargs = make(rng)
+            begin = time.perf_counter()
+            results += len(store.search(**kwargs, limit=20))
+            latencies.append(time.perf_counter() - begin)
+        latencies.sort()
+        quantile = lambda q: latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000
+        print(f"{label:<30}{quantile(0.5):>9.2f}{quantile(0.95):>9.2f}{results / runs:>9.1f}")
+
+    begin = time.perf_counter()
+    matches = store.count(keywords='python')
+    print(f"{'count, common term':<30}{(time.perf_counter() - begin) * 1000:>9.2f}{'':>9}{matches:>9,}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=1000000)
+    parser.add_argument('--months', type=float, default=6, help='History the jobs are spread over')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='Jobs per write')
+    parser.add_argument('--queries', type=int, default=50, help='Runs of each query shape')
+    parser.add_argument('--rescrape', type=int, default=10000, help='Stored jobs written again')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='job-store-bench-')
+    path = os.path.join(workdir, 'jobs.db')
+    generator = PostingGenerator(args.seed)
+    try:
+        with JobStore(path) as store:
+            elapsed = fill(store, generator, 0, args.jobs, args.months, args.chunk_size)
+            size = sum(os.path.getsize(os.path.join(workdir, name)) for name in os.listdir(workdir))
+            print(f"{args.jobs:,} jobs over {args.months:g} months, {size / 2 ** 20:,.0f} MiB on disk\n")
+            print(f"{'indexing':<30}{'jobs/s':>10}")
+            print(f"{'new jobs':<30}{args.jobs / elapsed:>10,.0f}")
+            print(f"{'rescrape, unchanged':<30}{rescrape(store, args.jobs, args.rescrape, False):>10,.0f}")
+            print(f"{'rescrape, edited':<30}{rescrape(store, args.jobs, args.rescrape, True):>10,.0f}")
+
+            print(f"\nbefore optimize")
+            run_queries(store, generator, args.queries, args.seed)
+            begin = time.perf_counter()
+            store.optimize()
+            print(f"\nafter optimize ({time.perf_counter() - begin:.1f}s)")
+            run_queries(store, generator, args.queries, args.seed)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Database requests and latency of the scraper's migration check at startup
+
+Runs MigrationManager.run_migrations against the fake Supabase server
+with an injected per-request latency (a remote Supabase project is tens
+of milliseconds away) in four situations:
+
+- a fresh database
+- an unchanged restart
+- a restart without the local manifest
+- a restart after one migration file changed
+
+For comparison, the previous runner's request count is derived from the
+same files. That runner made one exec_sql call per statement, one
+upsert per recorded file and two requests (create table, full-content
+select) on every startup.
+
+Usage:
+    python benchmarks/migration_startup.py --latency 0.05
+"""
+import argparse
+import contextlib
+import io
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scraper'))
+
+from bench_utils import import_models
+from fake_supabase_server import FAKE_SERVICE_KEY, FakeSupabaseServer
+from sql_splitter import legacy_split_sql_statements
+
+import_models()
+
+from src.database.database_manager import DatabaseManager
+
+RECORD_STATEMENT = re.compile(
+    r"insert into migrations \(version, content, checksum, applied_at\)\s*values \('([^']*)', "
+    r"(\$migration_[0-9a-f]+\$)(.*?)\2, '([0-9a-f]+)'",
+    re.DOTALL
+)
+
+def track_migrations(server):
+    """Let the fake's exec_sql keep the migrations rows the real function would write"""
+    def exec_sql(args):
+        with server.lock:
+            server.stats['exec_sql_statements'] += 1
+        for version, _, content, checksum in RECORD_STATEMENT.findall(args.get('query', '')):
+            server.upsert_rows('migrations', [{'version': version, 'content': content, 'checksum': checksum}],
+                               on_conflict='version')
+    server.rpc['exec_sql'] = exec_sql
+
+def previous_requests(manager, pending):
+    """Requests the per-statement runner made: create + select, then each statement and a record per file"""
+    requests = 2
+    for migration_file in pending:
+        with open(os.path.join(manager.migrations_dir, migration_file)) as f:
+            requests += len(legacy_split_sql_statements(f.read())) + 1
+    return requests
+
+def run(label, server, manifest, migrations_dir, pending):
+    database = DatabaseManager(server.url, FAKE_SERVICE_KEY, migration_manifest=manifest)
+    manager = database.migration_manager
+    manager.migrations_dir = migrations_dir
+    server.reset_stats()
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.run_migrations()
+    elapsed = time.perf_counter() - start
+
+    print(f"{label:<30}{server.stats['requests']:>10}{elapsed * 1000:>10.0f}"
+          f"{previous_requests(manager, pending):>14}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds added to every Supabase request')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='migration-bench-')
+    migrations_dir = os.path.join(workdir, 'versions')
+    source_dir = os.path.join(os.path.dirname(__file__), '..', 'scraper', 'src', 'database', 'migrations', 'versions')
+    shutil.copytree(source_dir, migrations_dir)
+    files = sorted(f for f in os.listdir(migrations_dir) if f.endswith('.sql'))
+    manifest = os.path.join(workdir, 'migrations.json')
+
+    server = FakeSupabaseServer(latency=args.latency).start()
+    track_migrations(server)
+    try:
+        print(f"{len(files)} migration files, {args.latency * 1000:g} ms per request\n")
+        print(f"{'startup':<30}{'requests':>10}{'ms':>10}{'previously':>14}")
+        run('fresh database', server, manifest, migrations_dir, files)
+        run('unchanged', server, manifest, migrations_dir, [])
+
+        os.remove(manifest)
+        run('unchanged, no local manifest', server, manifest, migrations_dir, [])
+
+        with open(os.path.join(migrations_dir, files[-1]), 'a') as f:
+            f.write('\n-- touched\n')
+        run('one file modified', server, manifest, migrations_dir, files[-1:])
+    finally:
+        server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
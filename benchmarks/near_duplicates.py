@@ -0,0 +1,114 @@
+"""
+Build and query latency of the near-duplicate index on synthetic postings
+
+Generates postings from a pool of role templates with random filler, and
+injects reposts (same posting with light edits under a new URL) plus
+unrelated postings that share boilerplate. Reports signature throughput,
+index build rate, query latency percentiles, detection precision / recall
+against the injected reposts, and save / load time of the persisted index.
+
+Usage:
+    python benchmarks/near_duplicates.py --count 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from bench_utils import REPO_ROOT
+
+sys.path.insert(0, os.path.join(REPO_ROOT, 'scraper'))
+from src.data.near_duplicates import NearDuplicateIndex
+
+TITLES = ['Software Engineer', 'Senior Backend Engineer', 'Data Scientist', 'Frontend Engineer',
+          'Machine Learning Engineer', 'DevOps Engineer', 'Product Manager', 'Data Engineer']
+SKILLS = ['python', 'go', 'rust', 'java', 'typescript', 'react', 'aws', 'gcp', 'kubernetes', 'terraform',
+          'postgresql', 'kafka', 'spark', 'airflow', 'pytorch', 'sql', 'graphql', 'docker', 'redis', 'linux']
+WORDS = ['build', 'scale', 'design', 'own', 'ship', 'improve', 'platform', 'customers', 'team', 'services',
+         'reliable', 'data', 'product', 'growth', 'mission', 'impact', 'quality', 'systems', 'users', 'fast']
+BOILERPLATE = "## Benefits\n- Medical, dental and vision\n- 401(k) match\n- Flexible PTO"
+
+def make_posting(rng, i):
+    skills = rng.sample(SKILLS, 6)
+    body = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(150, 400)))
+    description = (
+        f"We are hiring to {body}.\n## Requirements\n" +
+        '\n'.join(f"- {rng.randint(2, 8)}+ years with {skill}" for skill in skills) +
+        f"\n{BOILERPLATE}"
+    )
+    return (f"https://www.linkedin.com/jobs/view/{i}", rng.choice(TITLES), f"Company {rng.randint(0, 5000)}", description)
+
+def repost(rng, posting, i):
+    """Same posting under a new URL with a few words changed"""
+    _, title, company, description = posting
+    words = description.split(' ')
+    for _ in range(3):
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return (f"https://www.linkedin.com/jobs/view/{i}", title, company, ' '.join(words))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=100000, help='Total postings, including reposts')
+    parser.add_argument('--repost-rate', type=float, default=0.1)
+    parser.add_argument('--threshold', type=float, default=0.8)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    postings, reposts = [], set()
+    for i in range(args.count):
+        if postings and rng.random() < args.repost_rate:
+            postings.append(repost(rng, rng.choice(postings), i))
+            reposts.add(postings[-1][0])
+        else:
+            postings.append(make_posting(rng, i))
+    print(f"{len(postings)} postings, {len(reposts)} injected reposts")
+
+    index = NearDuplicateIndex(threshold=args.threshold)
+
+    start = time.perf_counter()
+    signatures = [index.signature(title, company, description) for _, title, company, description in postings]
+    sign_seconds = time.perf_counter() - start
+    print(f"{'signatures':<22}{len(postings) / sign_seconds:>12,.0f} postings/s")
+
+    # Build the index the way the scraper does: query, then add non-duplicates
+    flagged = set()
+    latencies = []
+    start = time.perf_counter()
+    for (url, _, _, _), signature in zip(postings, signatures):
+        query_start = time.perf_counter()
+        matches = index.query(signature, exclude=url)
+        latencies.append(time.perf_counter() - query_start)
+        if matches:
+            flagged.add(url)
+        else:
+            index.add(url, signature)
+    build_seconds = time.perf_counter() - start
+    print(f"{'build (query + add)':<22}{len(postings) / build_seconds:>12,.0f} postings/s")
+
+    latencies.sort()
+    quantile = lambda q: latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1e6
+    print(f"{'query latency':<22}p50 {quantile(0.5):.0f} us, p95 {quantile(0.95):.0f} us, "
+          f"p99 {quantile(0.99):.0f} us, mean {statistics.mean(latencies) * 1e6:.0f} us")
+
+    true_positives = len(flagged & reposts)
+    precision = true_positives / len(flagged) if flagged else 1.0
+    recall = true_positives / len(reposts) if reposts else 1.0
+    print(f"{'detection':<22}precision {precision:.3f}, recall {recall:.3f} ({len(flagged)} flagged)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'near_duplicates.idx')
+        start = time.perf_counter()
+        index.save(path)
+        save_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        loaded = NearDuplicateIndex.load(path, threshold=args.threshold)
+        load_seconds = time.perf_counter() - start
+        print(f"{'persisted index':<22}{os.path.getsize(path) / 1e6:.1f} MB, "
+              f"save {save_seconds:.2f} s, load {load_seconds:.2f} s ({len(loaded)} postings)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+Compare per-job notifications with digest notifications
+
+Runs the job processor on one batch of matching jobs against moto and the
+fake OpenAI server (which answers YES to every job), then approves every
+job the way the user would: one approve link per job in per-job mode, one
+batch page load and one bulk approve in digest mode. Reports SNS publishes
+per run, user requests needed to approve the batch and the end-to-end
+latency from the processing request to the last approval (excluding the
+user's reading time).
+
+Usage:
+    python benchmarks/notification_digest.py --jobs 30
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import time
+from urllib.parse import urlencode
+
+AWS_DIR = os.path.join(os.path.dirname(__file__), '..', 'aws')
+sys.path.insert(0, AWS_DIR)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import boto3
+from moto import mock_aws
+
+from bench_utils import import_models
+from fake_openai_server import FakeOpenAIServer
+
+import_models()
+
+def load_handler(name):
+    """Load <name>/app.py under a unique module name (every handler module is called app)"""
+    path = os.path.join(AWS_DIR, name, 'app.py')
+    spec = importlib.util.spec_from_file_location(f"{name}_app", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.path.insert(0, os.path.dirname(path))
+    spec.loader.exec_module(module)
+    return module
+
+def setup_aws():
+    """Create the workflow table (with the batch index) and the topic in moto"""
+    os.environ.update({
+        'AWS_DEFAULT_REGION': 'us-east-2',
+        'AWS_ACCESS_KEY_ID': 'testing',
+        'AWS_SECRET_ACCESS_KEY': 'testing',
+        'WORKFLOW_TABLE': 'workflows',
+        'DOCUMENT_GENERATOR_FUNCTION': 'document-generator',
+        'API_BASE_URL': 'https://example.execute-api.us-east-2.amazonaws.com/dev'
+    })
+    boto3.resource('dynamodb').create_table(
+        TableName='workflows',
+        KeySchema=[{'AttributeName': 'workflow_id', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[
+            {'AttributeName': 'workflow_id', 'AttributeType': 'S'},
+            {'AttributeName': 'batch_id', 'AttributeType': 'S'},
+            {'AttributeName': 'created_at', 'AttributeType': 'S'}
+        ],
+        GlobalSecondaryIndexes=[{
+            'IndexName': 'BatchIndex',
+            'KeySchema': [
+                {'AttributeName': 'batch_id', 'KeyType': 'HASH'},
+                {'AttributeName': 'created_at', 'KeyType': 'RANGE'}
+            ],
+            'Projection': {'ProjectionType': 'ALL'}
+        }],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    topic = boto3.client('sns').create_topic(Name='notifications')
+    os.environ['SNS_TOPIC_ARN'] = topic['TopicArn']
+
+def make_payloads(count, offset):
+    return [{
+        'type': 'INSERT',
+        'table': 'jobs',
+        'record': {
+            'id': f"job-{offset + i}",
+            'job_url': f"https://www.linkedin.com/jobs/view/{offset + i}",
+            'title': 'Software Engineer',
+            'company': f"Company {i}",
+            'location': 'Remote',
+            'description': 'Build and operate backend services.'
+        }
+    } for i in range(count)]
+
+def run(mode, jobs, offset, job_processor, user_response, publishes):
+    os.environ['NOTIFICATION_MODE'] = mode
+    publishes.clear()
+    quiet = io.StringIO()
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(quiet):
+        response = job_processor.lambda_handler({'payloads': make_payloads(jobs, offset)}, None)
+    processed = time.perf_counter()
+    body = json.loads(response['body'])
+
+    user_requests = 0
+    with contextlib.redirect_stdout(quiet):
+        if mode == 'digest':
+            page = user_response.lambda_handler(
+                {'path': '/batch', 'httpMethod': 'GET', 'queryStringParameters': {'batch_id': body['batch_id']}}, None
+            )
+            assert page['statusCode'] == 200, page['body']
+            form = urlencode([('batch_id', body['batch_id'])] + [('workflow_id', w) for w in body['workflow_ids']])
+            result = user_response.lambda_handler({'path': '/batch/approve', 'httpMethod': 'POST', 'body': form}, None)
+            assert result['statusCode'] == 200, result['body']
+            user_requests = 2
+        else:
+            for workflow_id in body['workflow_ids']:
+                result = user_response.lambda_handler(
+                    {'path': '/approve', 'queryStringParameters': {'workflow_id': workflow_id}}, None
+                )
+                assert result['statusCode'] == 200, result['body']
+                user_requests += 1
+    approved = time.perf_counter()
+
+    print(f"{mode:<10}{len(publishes):>10}{user_requests:>15}{(processed - start) * 1000:>15.0f}"
+          f"{(approved - processed) * 1000:>15.0f}{(approved - start) * 1000:>15.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=30, help='Matching jobs in the batch')
+    parser.add_argument('--llm-latency', type=float, default=0.05, help='Fake OpenAI latency per call (seconds)')
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(first_token_latency=args.llm_latency, token_latency=0, reply=lambda messages, max_tokens: 'YES')
+    server.start()
+    os.environ.update({'OPENAI_BASE_URL': server.base_url, 'OPENAI_API_KEY': 'test'})
+
+    try:
+        with mock_aws():
+            setup_aws()
+            from shared.clients import get_client
+
+            publishes = []
+            get_client('sns').meta.events.register('before-call.sns.Publish', lambda **kwargs: publishes.append(1))
+
+            job_processor = load_handler('job_processor')
+            user_response = load_handler('user_response')
+
+            print(f"{args.jobs} matching jobs per run\n")
+            print(f"{'mode':<10}{'publishes':>10}{'user requests':>15}{'process ms':>15}{'approve ms':>15}{'total ms':>15}")
+            run('per_job', args.jobs, 0, job_processor, user_response, publishes)
+            run('digest', args.jobs, args.jobs, job_processor, user_response, publishes)
+    finally:
+        server.stop()
+
+if __name__ == '__main__':
+    main()
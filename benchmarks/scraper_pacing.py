@@ -0,0 +1,171 @@
+"""
+Jobs per minute and throttle events of the scraper's pacing strategies
+
+LinkedIn's rate limits are not published, so they are modelled as a leaky
+bucket: every job detail request adds one to the level, which drains at
+the current capacity (jobs per minute, changing over the run with
+--schedule). Below --burst a detail loads in --base-load seconds
+(lognormal); every request above it adds --excess-penalty seconds, a load
+over 10 seconds is a timeout (the scraper's wait_for_job_details_loading)
+and a level --checkpoint-excess above the burst is a security checkpoint,
+which costs --checkpoint-cost seconds of manual solving and empties the
+bucket. Every loaded job also takes --overhead seconds of other WebDriver
+commands.
+
+Each strategy scrapes until --jobs jobs have loaded, on a simulated clock:
+
+- no delay: main.py before pacing (its random delays were commented out)
+- random 0.5-1 s before and after: those delays enabled
+- fixed 3 s: a conservative fixed delay
+- AdaptivePacer: AIMD with the default configuration
+
+Before the simulation, LinkedInScraper runs over a replayed archive with a
+pacer to check that every loaded job is reported to it.
+
+Usage:
+    python benchmarks/scraper_pacing.py --jobs 1000 --schedule 0:24,20:10,40:24
+"""
+import argparse
+import contextlib
+import io
+import math
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scraper'))
+
+from bench_utils import import_models
+
+import_models()
+
+from scraper_replay import build_archive, crawl
+from src.scraper.linkedin_scraper import LinkedInScraper
+from src.scraper.pacing import AdaptivePacer
+from src.scraper.replay import ReplayDriver
+
+# wait_for_job_details_loading's timeout
+LOAD_TIMEOUT = 10.0
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += max(0.0, seconds)
+
+class ThrottlingModel:
+    """Leaky bucket of LinkedIn's job detail requests"""
+
+    def __init__(self, schedule, burst, base_load, excess_penalty, checkpoint_excess, rng):
+        self.schedule = schedule
+        self.burst = burst
+        self.base_load = base_load
+        self.excess_penalty = excess_penalty
+        self.checkpoint_excess = checkpoint_excess
+        self.rng = rng
+        self.level = 0.0
+        self.updated = 0.0
+
+    def capacity(self, now):
+        """Jobs per minute served without throttling at a time"""
+        return [capacity for start, capacity in self.schedule if start * 60 <= now][-1]
+
+    def request(self, now):
+        """('loaded' | 'timeout' | 'checkpoint', seconds until the outcome is known)"""
+        self.level = max(0.0, self.level - (now - self.updated) * self.capacity(now) / 60)
+        self.updated = now
+        self.level += 1
+        excess = self.level - self.burst
+        if excess > self.checkpoint_excess:
+            self.level = 0.0
+            return 'checkpoint', LOAD_TIMEOUT
+        load = self.base_load * math.exp(self.rng.gauss(0, 0.3)) + max(0.0, excess) * self.excess_penalty
+        if load > LOAD_TIMEOUT:
+            return 'timeout', LOAD_TIMEOUT
+        return 'loaded', load
+
+def simulate(strategy, args):
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+    clock = SimulatedClock()
+    model = ThrottlingModel(args.schedule, args.burst, args.base_load, args.excess_penalty,
+                            args.checkpoint_excess, rng)
+    pacer = AdaptivePacer(clock=clock.time, sleep=clock.sleep) if strategy == 'AdaptivePacer' else None
+    loaded = slow = timeouts = checkpoints = 0
+    while loaded < args.jobs:
+        if pacer is not None:
+            pacer.wait()
+        elif strategy == 'random 0.5-1 s before and after':
+            clock.sleep(rng.uniform(0.5, 1.0))
+        elif strategy == 'fixed 3 s':
+            clock.sleep(3.0)
+
+        outcome, seconds = model.request(clock.now)
+        clock.sleep(seconds)
+        if outcome == 'loaded':
+            loaded += 1
+            slow += seconds > 3.0
+            if pacer is not None:
+                pacer.record_load(seconds)
+            clock.sleep(args.overhead)
+            if strategy == 'random 0.5-1 s before and after':
+                clock.sleep(rng.uniform(0.5, 1.0))
+        elif outcome == 'timeout':
+            timeouts += 1
+            if pacer is not None:
+                pacer.record_timeout()
+        else:
+            checkpoints += 1
+            if pacer is not None:
+                pacer.record_checkpoint()
+            clock.sleep(args.checkpoint_cost)
+
+    minutes = clock.now / 60
+    print(f"{strategy:<34}{minutes:>9.1f}{loaded / minutes:>10.1f}{slow:>7}{timeouts:>10}{checkpoints:>13}")
+    if pacer is not None:
+        print(f"  {pacer.summary()}")
+
+def check_integration(workdir):
+    """LinkedInScraper reports every loaded job of a replayed run to its pacer"""
+    archive = os.path.join(workdir, 'run.zip')
+    expected = build_archive(archive, pages=2, per_page=5, seed=7)
+    driver = ReplayDriver(archive)
+    pacer = AdaptivePacer(initial_rate=6000, max_rate=60000, slow_load=1.0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        jobs = crawl(driver, LinkedInScraper(driver, None, pacer=pacer))
+    assert len(jobs) == len(expected) == pacer.jobs, f"{len(jobs)} jobs extracted, {pacer.jobs} reported"
+    assert pacer.rate > 6000 and not any(pacer.events.values()), pacer.summary()
+    print(f"replay check: {len(jobs)} jobs extracted and reported to the pacer\n")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=1000)
+    parser.add_argument('--schedule', default='0:24,20:10,40:24',
+                        help='minute:capacity pairs, jobs per minute served from that minute on')
+    parser.add_argument('--burst', type=float, default=10)
+    parser.add_argument('--base-load', type=float, default=1.2, help='Median seconds of an unthrottled load')
+    parser.add_argument('--excess-penalty', type=float, default=0.3, help='Seconds per request above the burst')
+    parser.add_argument('--checkpoint-excess', type=float, default=10)
+    parser.add_argument('--checkpoint-cost', type=float, default=180)
+    parser.add_argument('--overhead', type=float, default=1.0, help='Seconds of other commands per job')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    args.schedule = [tuple(float(value) for value in pair.split(':')) for pair in args.schedule.split(',')]
+
+    with tempfile.TemporaryDirectory(prefix='pacing-bench-') as workdir:
+        check_integration(workdir)
+
+    capacity = ', '.join(f"{capacity:g}/min from minute {start:g}" for start, capacity in args.schedule)
+    print(f"{args.jobs} jobs, capacity {capacity}\n")
+    print(f"{'strategy':<34}{'minutes':>9}{'jobs/min':>10}{'slow':>7}{'timeouts':>10}{'checkpoints':>13}")
+    for strategy in ('no delay', 'random 0.5-1 s before and after', 'fixed 3 s', 'AdaptivePacer'):
+        simulate(strategy, args)
+
+if __name__ == '__main__':
+    main()
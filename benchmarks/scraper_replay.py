@@ -0,0 +1,230 @@
+"""
+Offline scraper extraction over a replayed archive
+
+Builds an archive in the recorder's format from the description fixtures
+(LinkedIn-like list and detail panes), or uses a real recording
+(--archive), and runs LinkedInScraper.extract_job_details over every
+card of every page through the ReplayDriver, as main.py does.
+
+The fields extracted are checked against the generated postings, and the
+archive is recorded again while it is being replayed to check that the
+second recording extracts the same jobs.
+
+The current extraction, which makes several WebDriver commands per field,
+is compared with a snapshot strategy: fetch the detail pane's outerHTML
+once and run the same selectors locally. Results are reported as jobs/s
+and driver commands per job at the given injected command latency.
+
+Usage:
+    python benchmarks/scraper_replay.py --pages 4 --per-page 25 --command-latency 0.002
+    python benchmarks/scraper_replay.py --archive data/run.zip
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import zipfile
+from html import escape
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scraper'))
+
+from bench_utils import import_models, rate
+
+import_models()
+
+from selenium.webdriver.common.by import By
+from src.scraper import dom
+from src.scraper.description_normalizer import normalize_description
+from src.scraper.linkedin_scraper import LinkedInScraper, LinkedInSelectors
+from src.scraper.replay import ARCHIVE_FORMAT_VERSION, DETAIL_PANE_SELECTOR, ReplayDriver, SnapshotRecorder
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'descriptions')
+
+TITLES = ['Senior Backend Engineer', 'Data Scientist', 'Frontend Developer (Contract)', 'Platform Engineer',
+          'Staff Software Engineer', 'Machine Learning Engineer']
+LOCATIONS = ['New York, NY', 'Remote', 'Austin, TX', 'Berlin, Germany']
+
+def card_html(job):
+    return (f'<li class="jobs-search-results__list-item"><div class="job-card-container relative" '
+            f'data-job-id="{job["id"]}"><a class="job-card-list__title--link" aria-label="{escape(job["title"])}" '
+            f'href="/jobs/view/{job["id"]}/"><strong>{escape(job["title"])}</strong></a>'
+            f'<div class="artdeco-entity-lockup__subtitle"><span>{escape(job["company"])}</span></div></div></li>')
+
+def detail_html(job, description):
+    return (f'<div class="scaffold-layout__detail"><div class="job-details-jobs-unified-top-card__company-name">'
+            f'<a href="/company/{job["id"]}/">{escape(job["company"])}</a></div>'
+            f'<div class="job-details-jobs-unified-top-card__primary-description-container">'
+            f'<div class="t-black--light"><span class="tvm__text tvm__text--low-emphasis">{escape(job["location"])}</span>'
+            f'<span class="tvm__text"> · </span><span class="tvm__text tvm__text--positive"><strong>'
+            f'<span>Reposted </span><span>{job["posted_time"]}</span></strong></span>'
+            f'<span class="tvm__text"> · </span><span class="tvm__text">{job["applicants"]}</span></div></div>'
+            f'<article class="jobs-description__container">{description}</article></div>')
+
+def build_archive(path, pages, per_page, seed):
+    """Write a generated archive in the recorder's format; returns the expected job fields by ID"""
+    rng = random.Random(seed)
+    fixtures = []
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+            fixtures.append(f.read())
+
+    expected = {}
+    manifest = {'version': ARCHIVE_FORMAT_VERSION, 'recorded_at': 'generated', 'pages': []}
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for page in range(1, pages + 1):
+            jobs = []
+            for i in range(per_page):
+                job = {
+                    'id': str(3900000000 + page * 1000 + i),
+                    'title': rng.choice(TITLES),
+                    'company': f"Company {rng.randrange(500)}",
+                    'location': rng.choice(LOCATIONS),
+                    'posted_time': f"{rng.randrange(1, 23)} hours ago",
+                    'applicants': f"{rng.randrange(1, 200)} applicants"
+                }
+                description = fixtures[i % len(fixtures)]
+                archive.writestr(f"jobs/{job['id']}.html", detail_html(job, description))
+                expected[job['id']] = dict(job, description=normalize_description(description))
+                jobs.append(job)
+            archive.writestr(f"pages/{page:04d}.html",
+                             f'<div class="scaffold-layout__list"><ul>{"".join(card_html(job) for job in jobs)}</ul></div>')
+            manifest['pages'].append({
+                'page': page,
+                'url': f"https://www.linkedin.com/jobs/search/?currentJobId={jobs[0]['id']}&start={(page - 1) * per_page}",
+                'job_ids': [job['id'] for job in jobs]
+            })
+        archive.writestr('manifest.json', json.dumps(manifest))
+    return expected
+
+def crawl(driver, scraper, recorder=None):
+    """Extract every job of every page, following the pagination like main.py"""
+    selectors = LinkedInSelectors.JOB_LIST
+    jobs = []
+    driver.get('https://www.linkedin.com/jobs/collections/recommended/')
+    page = 1
+    while True:
+        job_list = driver.find_element(By.CSS_SELECTOR, selectors['container'].selector)
+        count = len(job_list.find_elements(By.CSS_SELECTOR, selectors['job_cards'].selector))
+        for i in range(count):
+            job, success = scraper.extract_job_details(i)
+            if success:
+                jobs.append(job)
+        if recorder is not None:
+            recorder.record_page(driver, page)
+        buttons = driver.find_elements(By.CSS_SELECTOR, f"button[aria-label='Page {page + 1}']")
+        if not buttons:
+            return jobs
+        driver.execute_script("arguments[0].click();", buttons[0])
+        page += 1
+
+def extract_from_snapshot(driver, job_index):
+    """Snapshot strategy: one outerHTML fetch of the detail pane, selectors run locally"""
+    selectors = LinkedInSelectors.JOB_LIST
+    cards = driver.find_elements(By.CSS_SELECTOR, f"{selectors['container'].selector} {selectors['job_cards'].selector}")
+    card = cards[job_index]
+    title = card.find_element(By.CSS_SELECTOR, selectors['title'].selector)
+    driver.execute_script("arguments[0].click();", title)
+
+    pane = dom.parse_html(driver.execute_script(
+        "return arguments[0].outerHTML", driver.find_element(By.CSS_SELECTOR, DETAIL_PANE_SELECTOR)
+    ))
+    clean = LinkedInScraper.clean_text
+    metadata = dom.select_one(pane, selectors['metadata_container'].selector)
+    fields = {nested['type']: clean(getattr(dom.select_one(metadata, nested['selector']), 'rendered_text', lambda: '')())
+              for nested in selectors['metadata_container'].nested_selectors}
+    description = dom.select_one(pane, selectors['description'].selector).inner_html()
+    return dict(
+        fields,
+        title=clean(title.get_attribute('aria-label')),
+        company=clean(dom.select_one(pane, selectors['company'].selector).rendered_text()),
+        description=normalize_description(description)
+    )
+
+def check(jobs, expected):
+    mismatches = []
+    for job in jobs:
+        truth = expected[job.job_url.rsplit('/', 1)[-1]]
+        for field in ('title', 'company', 'location', 'posted_time', 'applicants', 'description'):
+            if getattr(job, field) != truth[field]:
+                mismatches.append((job.job_url, field, getattr(job, field), truth[field]))
+    return mismatches
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--archive', help='Recorded archive to replay (generated if omitted)')
+    parser.add_argument('--pages', type=int, default=4)
+    parser.add_argument('--per-page', type=int, default=25)
+    parser.add_argument('--command-latency', type=float, default=0.002,
+                        help='Injected seconds per WebDriver command (a local chromedriver round trip is ~1-5 ms)')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='scraper-replay-')
+    expected = None
+    archive = args.archive
+    if not archive:
+        archive = os.path.join(workdir, 'generated.zip')
+        expected = build_archive(archive, args.pages, args.per_page, args.seed)
+    print(f"archive {archive} ({os.path.getsize(archive) / 1024:.0f} KiB)\n")
+
+    quiet = io.StringIO()
+
+    # Correctness, and a recording made while replaying
+    rerecorded = os.path.join(workdir, 'rerecorded.zip')
+    driver = ReplayDriver(archive)
+    recorder = SnapshotRecorder(rerecorded)
+    with contextlib.redirect_stdout(quiet):
+        jobs = crawl(driver, LinkedInScraper(driver, None, recorder), recorder)
+        recorder.close()
+    print(f"extracted {len(jobs)} jobs")
+    if expected is not None:
+        mismatches = check(jobs, expected)
+        assert not mismatches, f"{len(mismatches)} fields differ, e.g. {mismatches[:3]}"
+        print(f"all fields match the generated postings")
+
+    driver = ReplayDriver(rerecorded)
+    with contextlib.redirect_stdout(quiet):
+        replayed = crawl(driver, LinkedInScraper(driver, None))
+    assert [job.to_dict() for job in replayed] == [job.to_dict() for job in jobs], "re-recorded archive differs"
+    print(f"re-recorded archive extracts the same {len(replayed)} jobs\n")
+
+    # Selector engine on its own
+    pane = dom.parse_html(ReplayDriver(archive).archive.job_html(jobs[0].job_url.rsplit('/', 1)[-1]))
+    selector = LinkedInSelectors.JOB_LIST['metadata_container'].selector
+    print(f"{'selector match':<34}{rate(lambda: [dom.select_one(pane, selector) for _ in range(1000)], 1000):>12,.0f} /s")
+
+    # Extraction strategies at the injected command latency
+    print(f"\ncommand latency {args.command_latency * 1000:g} ms\n")
+    print(f"{'strategy':<34}{'jobs/s':>12}{'commands/job':>14}")
+
+    driver = ReplayDriver(archive, command_latency=args.command_latency)
+    scraper = LinkedInScraper(driver, None)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(quiet):
+        count = len(crawl(driver, scraper))
+    elapsed = time.perf_counter() - start
+    print(f"{'WebDriver per field (current)':<34}{count / elapsed:>12,.1f}{driver.commands / count:>14.1f}")
+
+    driver = ReplayDriver(archive, command_latency=args.command_latency)
+    driver.get('https://www.linkedin.com/jobs/collections/recommended/')
+    snapshot_jobs = []
+    start = time.perf_counter()
+    while True:
+        cards = driver.find_elements(By.CSS_SELECTOR, LinkedInSelectors.JOB_LIST['job_cards'].selector)
+        snapshot_jobs.extend(extract_from_snapshot(driver, i) for i in range(len(cards)))
+        buttons = driver.find_elements(By.CSS_SELECTOR, f"button[aria-label='Page {driver.page + 1}']")
+        if not buttons:
+            break
+        driver.execute_script("arguments[0].click();", buttons[0])
+    elapsed = time.perf_counter() - start
+    assert [job['description'] for job in snapshot_jobs] == [job.description for job in jobs]
+    print(f"{'detail pane snapshot':<34}{len(snapshot_jobs) / elapsed:>12,.1f}{driver.commands / len(snapshot_jobs):>14.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""
+Time to full coverage of a search after an interrupted scraper run
+
+Runs scraper/main.py (LinkedInJobScraper) in subprocesses over a replayed
+archive (--pages pages of --per-page jobs built from the fixtures, with
+--load-latency per page / job detail and --command-latency per WebDriver
+command) against the fake Supabase server, and injects two failures:
+
+- crash: the process is killed (os._exit, no cleanup) when it is about to
+  open job --crash-after
+- page transition: clicking through to page --fail-page raises, which
+  main.py handles by saving the jobs and ending the run
+
+After the failure main.py is run again. Without a checkpoint
+(RUN_CHECKPOINT empty) the second run starts from page 1; with one it
+resumes on the interrupted page, restoring the jobs that were not saved.
+Reported per scenario: wall time of the runs until every job of the
+search is in the jobs table, job details opened and jobs saved, next to
+an uninterrupted run. The cost of writing the checkpoint after every job
+is measured separately, early and late in a run of --checkpoint-jobs jobs.
+
+Usage:
+    python benchmarks/scraper_resume.py --pages 5 --per-page 10 --crash-after 35 --fail-page 3
+"""
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scraper'))
+
+from bench_utils import import_models
+from fake_supabase_server import FAKE_SERVICE_KEY, FakeSupabaseServer
+
+import_models()
+
+from scraper_replay import FIXTURES_DIR, build_archive
+from src.data.run_checkpoint import RunCheckpoint
+from src.database.database_manager import DatabaseManager
+from src.scraper.job_data import EnhancedJobData
+
+SCRAPER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scraper')
+SEARCH_URL = 'https://www.linkedin.com/jobs/collections/recommended/'
+
+def worker(crash_after, fail_page):
+    """Run main.py in this process with the injected failure"""
+    os.chdir(SCRAPER_DIR)
+    sys.path.insert(0, SCRAPER_DIR)
+    import main
+
+    extract = main.LinkedInScraper.extract_job_details
+    opened = [0]
+
+    def extract_job_details(self, job_index):
+        if crash_after and opened[0] == crash_after:
+            sys.stdout.flush()
+            os._exit(137)
+        opened[0] += 1
+        return extract(self, job_index)
+
+    main.LinkedInScraper.extract_job_details = extract_job_details
+    scraper = main.LinkedInJobScraper()
+
+    if fail_page:
+        execute_script = scraper.driver.execute_script
+
+        def failing_execute_script(script, *args):
+            label = args[0].get_attribute('aria-label') if args and hasattr(args[0], 'get_attribute') else None
+            if label == f"Page {fail_page}" and not os.environ.get('FAILED_ONCE'):
+                os.environ['FAILED_ONCE'] = '1'
+                raise RuntimeError(f"Injected failure clicking {label}")
+            return execute_script(script, *args)
+
+        scraper.driver.execute_script = failing_execute_script
+    scraper.run()
+
+def run_scraper(env, crash_after=0, fail_page=0):
+    """One main.py run; returns (seconds, job details opened)"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--worker', '--crash-after', str(crash_after),
+         '--fail-page', str(fail_page)],
+        env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode not in (0, 137):
+        raise RuntimeError(f"scraper run failed:\n{result.stdout[-3000:]}\n{result.stderr[-3000:]}")
+    opened = sum(line.startswith('Processing job ') for line in result.stdout.splitlines())
+    return elapsed, opened
+
+def scenario(label, server, env, expected, runs):
+    with server.db_lock:
+        server.db.execute("delete from rows where tbl in ('jobs', 'job_description_archive')")
+        server.db.commit()
+    if env['RUN_CHECKPOINT']:
+        for path in (env['RUN_CHECKPOINT'], env['RUN_CHECKPOINT'] + '.jobs'):
+            if os.path.exists(path):
+                os.remove(path)
+
+    elapsed = opened = 0
+    for crash_after, fail_page in runs:
+        seconds, count = run_scraper(env, crash_after, fail_page)
+        elapsed += seconds
+        opened += count
+    saved = {row['job_url'] for row in server.rows('jobs')}
+    assert saved == expected, f"{label}: {len(saved)} of {len(expected)} jobs saved"
+    print(f"{label:<44}{len(runs):>6}{elapsed:>10.1f}{opened:>9}{len(saved):>8}")
+    return elapsed
+
+def checkpoint_cost(workdir, jobs):
+    """Microseconds per record_job and bytes written, with fixture descriptions"""
+    descriptions = []
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+            descriptions.append(f.read())
+    records = [EnhancedJobData({
+        'id': '', 'job_url': f"https://www.linkedin.com/jobs/view/{3900000000 + i}", 'title': 'Backend Engineer',
+        'company': 'Company', 'location': 'Remote', 'posted_time': '1 hour ago', 'applicants': '10 applicants',
+        'description': descriptions[i % len(descriptions)]
+    }, description_html=descriptions[i % len(descriptions)]) for i in range(jobs)]
+
+    checkpoint = RunCheckpoint(os.path.join(workdir, 'cost.json'), SEARCH_URL)
+    first = last = 0.0
+    for i, job in enumerate(records):
+        start = time.perf_counter()
+        checkpoint.record_job(job)
+        elapsed = time.perf_counter() - start
+        if i < jobs // 10:
+            first += elapsed
+        elif i >= jobs - jobs // 10:
+            last += elapsed
+    journal = checkpoint.journal_size
+    start = time.perf_counter()
+    checkpoint.record_page(2, SEARCH_URL)
+    page = time.perf_counter() - start
+    checkpoint.close()
+    state = os.path.getsize(checkpoint.path)
+
+    resumed = RunCheckpoint.load(checkpoint.path, SEARCH_URL, max_age_hours=1)
+    assert len(resumed.pending_jobs()) == jobs and resumed.jobs_processed == jobs
+    assert all(resumed.is_processed(RunCheckpoint.job_id(job.job_url)) for job in records)
+    print(f"\ncheckpoint per job: {first / (jobs // 10) * 1e6:.0f} us for the first {jobs // 10} jobs, "
+          f"{last / (jobs // 10) * 1e6:.0f} us for the last {jobs // 10}; journal {journal / 2 ** 20:.1f} MiB "
+          f"after {jobs} jobs, state {state / 1024:.1f} KiB written in {page * 1e3:.1f} ms on the next page")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=5)
+    parser.add_argument('--per-page', type=int, default=10)
+    parser.add_argument('--crash-after', type=int, default=35, help='Jobs opened before the process is killed')
+    parser.add_argument('--fail-page', type=int, default=3, help='Page whose transition fails')
+    parser.add_argument('--load-latency', type=float, default=0.2)
+    parser.add_argument('--command-latency', type=float, default=0.002)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--checkpoint-jobs', type=int, default=1000, help='Jobs recorded to measure the checkpoint cost')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.crash_after, args.fail_page)
+        return
+
+    workdir = tempfile.mkdtemp(prefix='resume-bench-')
+    server = FakeSupabaseServer().start()
+    try:
+        archive = os.path.join(workdir, 'run.zip')
+        expected = {f"https://www.linkedin.com/jobs/view/{job_id}" for job_id in
+                    build_archive(archive, args.pages, args.per_page, args.seed)}
+        manifest = os.path.join(workdir, 'migrations.json')
+        with contextlib.redirect_stdout(io.StringIO()):
+            DatabaseManager(server.url, FAKE_SERVICE_KEY, migration_manifest=manifest).initialize_database()
+
+        base_env = dict(
+            os.environ,
+            REPLAY_ARCHIVE=archive,
+            REPLAY_LOAD_LATENCY=str(args.load_latency),
+            REPLAY_COMMAND_LATENCY=str(args.command_latency),
+            SUPABASE_URL=server.url,
+            SUPABASE_KEY=FAKE_SERVICE_KEY,
+            JOB_ALERT_URL=SEARCH_URL,
+            MAX_PROCESS_JOBS=str(args.pages * args.per_page * 2),
+            MIGRATION_MANIFEST=manifest,
+            NEAR_DUPLICATE_DETECTION='false',
+            JOB_STORE='',
+            JOB_SPILL_FILE=''
+        )
+        without = dict(base_env, RUN_CHECKPOINT='')
+        with_checkpoint = dict(base_env, RUN_CHECKPOINT=os.path.join(workdir, 'run_checkpoint.json'))
+
+        print(f"{args.pages} pages of {args.per_page} jobs, {args.load_latency * 1000:g} ms per load, "
+              f"{args.command_latency * 1000:g} ms per command\n")
+        print(f"{'scenario':<44}{'runs':>6}{'seconds':>10}{'opened':>9}{'saved':>8}")
+        scenario('uninterrupted', server, with_checkpoint, expected, [(0, 0)])
+        crash = [(args.crash_after, 0), (0, 0)]
+        before = scenario(f"killed at job {args.crash_after}, no checkpoint", server, without, expected, crash)
+        after = scenario(f"killed at job {args.crash_after}, resumed", server, with_checkpoint, expected, crash)
+        print(f"{'':<44}{'':>6}{before / after:>9.2f}x")
+        transition = [(0, args.fail_page), (0, 0)]
+        before = scenario(f"page {args.fail_page} transition fails, no checkpoint", server, without, expected,
+                          transition)
+        after = scenario(f"page {args.fail_page} transition fails, resumed", server, with_checkpoint, expected,
+                         transition)
+        print(f"{'':<44}{'':>6}{before / after:>9.2f}x")
+
+        checkpoint_cost(workdir, args.checkpoint_jobs)
+    finally:
+        server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
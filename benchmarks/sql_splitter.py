@@ -0,0 +1,241 @@
+"""
+Correctness and throughput of the migration SQL statement splitter
+
+Checks split_sql_statements on the repository's migration files (statement
+counts, terminators, re-splitting its own output), then on generated
+scripts whose statement boundaries are known: string and E'' literals,
+quoted identifiers, nested dollar quotes, line and nested block comments,
+BEGIN ATOMIC bodies with CASE ... END and identifiers such as end_date or
+do_update that contain keywords, all carrying semicolons. Random byte soup
+built from the same characters is split to check that it never raises and
+that statements come back in input order.
+
+Throughput is measured on large generated scripts, in migration-like
+layout (short lines) and as one long line (a bulk insert), next to the
+previous line-based splitter, which is reproduced here as a reference
+implementation. The previous splitter slices the rest of the line at every
+character, so it is only run up to --legacy-max-kib on long lines.
+
+Usage:
+    python benchmarks/sql_splitter.py --fuzz 2000 --size-mib 8
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scraper'))
+
+from src.database.migrations.sql_splitter import split_sql_statements
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), '..', 'scraper', 'src', 'database', 'migrations', 'versions')
+
+EXPECTED_COUNTS = {
+    '001_initial_schema.sql': 3,
+    '002_add_service_role_policy.sql': 2,
+    '003_remove_error_column.sql': 1,
+    '004_add_description_archive.sql': 3,
+    '999_delete_old_jobs.sql': 2
+}
+
+def legacy_split_sql_statements(sql):
+    """Previous MigrationManager._split_sql_statements"""
+    statements = []
+    current_statement = []
+    in_quotes = False
+    quote_char = None
+    in_dollar_quote = False
+    dollar_quote_tag = None
+    in_do_block = False
+    nested_level = 0
+
+    lines = sql.splitlines(True)
+
+    for line in lines:
+        i = 0
+        while i < len(line):
+            if not in_quotes and not in_dollar_quote and line[i:].strip().upper().startswith('DO'):
+                in_do_block = True
+
+            if line[i:i+1] == '$':
+                end_tag = line.find('$', i+1)
+                if end_tag != -1:
+                    tag = line[i:end_tag+1]
+                    if not in_dollar_quote:
+                        in_dollar_quote = True
+                        dollar_quote_tag = tag
+                    elif tag == dollar_quote_tag:
+                        in_dollar_quote = False
+                        dollar_quote_tag = None
+                    i = end_tag
+
+            elif not in_dollar_quote and line[i] in ["'", '"']:
+                if not in_quotes:
+                    in_quotes = True
+                    quote_char = line[i]
+                elif line[i] == quote_char:
+                    in_quotes = False
+                    quote_char = None
+
+            elif not in_quotes and not in_dollar_quote:
+                if line[i:].strip().startswith('begin'):
+                    nested_level += 1
+                elif line[i:].strip().startswith('end'):
+                    nested_level -= 1
+                    if nested_level == 0:
+                        in_do_block = False
+
+            elif (line[i] == ';' and
+                  not in_quotes and
+                  not in_dollar_quote and
+                  not in_do_block):
+                current_statement.append(line[:i+1])
+                statements.append(''.join(current_statement))
+                current_statement = []
+                line = line[i+1:]
+                i = 0
+                continue
+
+            i += 1
+
+        if line:
+            current_statement.append(line)
+
+    if current_statement:
+        statements.append(''.join(current_statement))
+
+    return [stmt.strip() for stmt in statements if stmt.strip()]
+
+def check_migrations():
+    for name in sorted(os.listdir(MIGRATIONS_DIR)):
+        if not name.endswith('.sql'):
+            continue
+        with open(os.path.join(MIGRATIONS_DIR, name)) as f:
+            sql = f.read()
+        statements = split_sql_statements(sql)
+        if name in EXPECTED_COUNTS:
+            assert len(statements) == EXPECTED_COUNTS[name], f"{name}: {len(statements)} statements"
+        assert all(statement.endswith(';') for statement in statements), name
+        assert split_sql_statements('\n'.join(statements)) == statements, name
+        print(f"{name:<40}{len(statements):>3} statements (previously {len(legacy_split_sql_statements(sql))})")
+
+# Fragments of generated statements; every one carries a semicolon that must not split
+def _fragments(rng):
+    tag = rng.choice(['', 'body', 'fn_1'])
+    inner = rng.choice(['inner', 'x'])
+    return [
+        "'a;b'", "'it''s; fine'", "E'\\'; still a string'", "e'\\\\'", "U&'d\\0061t;a'",
+        '"semi;colon"', '"quote""d;"', 'end_date', 'do_update', 'begin_at', 'a$begin', 'ended', '"end"',
+        f"${tag}$ begin; perform 1; end; ${tag}$",
+        f"${tag}$ select ${inner}$ ; $not_the_end$ ${inner}$; ${tag}$",
+        '-- trailing; comment\n', '/* block; comment */', '/* nested /* ; */ still; comment */',
+        '$1', '(1, 2)', 'x::text', '1e5', 'case when true then 1 else 2 end'
+    ]
+
+def generate_statement(rng):
+    kind = rng.random()
+    parts = [rng.choice(['select', 'do', 'insert into t values', 'update t set c =', 'create table t'])]
+    parts.extend(rng.choice(_fragments(rng)) for _ in range(rng.randrange(1, 6)))
+    if kind < 0.2:
+        body = '; '.join(
+            f"select {rng.choice(['1', 'case when x then 1 else 2 end', 'end_date', repr('a;b')])}"
+            for _ in range(rng.randrange(1, 4))
+        )
+        parts = ['create function f() returns int language sql', rng.choice(['begin atomic', 'BEGIN\n  ATOMIC']),
+                 f"{body};", 'end']
+    return ' '.join(parts) + ';'
+
+def generate_script(rng, count):
+    """Script and the statements it must split into"""
+    chunks = []
+    expected = []
+    for _ in range(count):
+        statement = generate_statement(rng)
+        if rng.random() < 0.3:
+            statement = rng.choice(['-- about; this\n', '/* about; this */ ']) + statement
+        expected.append(statement.strip())
+        chunks.append(statement)
+        chunks.append(rng.choice(['\n', '\n\n', ' ', '\t\n', '\n;\n']))
+    if rng.random() < 0.5:
+        chunks.append('-- trailing comment only;')
+    return ''.join(chunks), expected
+
+def check_generated(runs, seed):
+    rng = random.Random(seed)
+    statements = 0
+    for run in range(runs):
+        script, expected = generate_script(rng, rng.randrange(1, 12))
+        actual = split_sql_statements(script)
+        assert actual == expected, f"run {run}:\n{script}\n{actual}\n{expected}"
+        statements += len(expected)
+    print(f"{runs} generated scripts, {statements} statements split at the expected boundaries")
+
+def check_random(runs, seed):
+    rng = random.Random(seed)
+    alphabet = ['a', 'e', 'E', ' ', '\n', ';', "'", '"', '$', '$a$', '-', '*', '/', '\\', 'begin', ' atomic ', 'end', 'case']
+    for _ in range(runs):
+        script = ''.join(rng.choice(alphabet) for _ in range(rng.randrange(0, 200)))
+        statements = split_sql_statements(script)
+        position = 0
+        for statement in statements:
+            found = script.find(statement, position)
+            assert found >= 0, (script, statements)
+            position = found + len(statement)
+    print(f"{runs} random scripts split without errors, statements in input order")
+
+def migration_like_script(size, rng):
+    with open(os.path.join(MIGRATIONS_DIR, '001_initial_schema.sql')) as f:
+        base = f.read().rstrip() + '\n\n'
+    parts = []
+    total = 0
+    while total < size:
+        block = base.replace('jobs', f"jobs_{rng.randrange(10 ** 6)}")
+        parts.append(block)
+        total += len(block)
+    return ''.join(parts)
+
+def long_line_script(size, rng):
+    values = []
+    total = 0
+    while total < size:
+        value = f"('{rng.randrange(10 ** 9)}', 'Title; with '' quote', E'line\\n{rng.random()}', 'end_date')"
+        values.append(value)
+        total += len(value) + 2
+    return 'insert into jobs (id, title, description, note) values ' + ', '.join(values) + ';'
+
+def throughput(split, script, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        split(script)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(script) / best / 2 ** 20
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fuzz', type=int, default=2000, help='Generated and random scripts to check')
+    parser.add_argument('--size-mib', type=float, default=8, help='Size of the large generated scripts')
+    parser.add_argument('--legacy-max-kib', type=int, default=64, help='Largest long line given to the previous splitter')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    check_migrations()
+    check_generated(args.fuzz, args.seed)
+    check_random(args.fuzz, args.seed)
+
+    rng = random.Random(args.seed)
+    size = int(args.size_mib * 2 ** 20)
+    print(f"\n{'script':<34}{'MiB/s':>10}{'previously':>12}")
+    script = migration_like_script(size, rng)
+    print(f"{f'migration-like, {len(script) / 2 ** 20:.1f} MiB':<34}"
+          f"{throughput(split_sql_statements, script):>10.1f}{throughput(legacy_split_sql_statements, script, 1):>12.2f}")
+    for kib in (16, 64, 256, size // 1024):
+        script = long_line_script(kib * 1024, rng)
+        legacy = (f"{throughput(legacy_split_sql_statements, script, 1):>12.3f}"
+                  if kib <= args.legacy_max_kib else f"{'skipped':>12}")
+        print(f"{f'one line, {kib:,} KiB':<34}{throughput(split_sql_statements, script):>10.1f}{legacy}")
+
+if __name__ == '__main__':
+    main()
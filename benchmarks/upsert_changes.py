@@ -0,0 +1,187 @@
+"""
+Rows written and webhooks sent per scraper run, with and without content hashes
+
+Simulates consecutive scraper runs over an overlapping set of postings:
+each run scrapes --per-run jobs, of which --repeat were scraped before
+(with a new posted_time and applicant count, as LinkedIn shows them) and
+--changed of those repeats have an edited description; the rest are new.
+
+Every run is saved twice against the fake Supabase server, whose jobs
+table webhooks go to the API's SupabaseWebhookService:
+
+- previously: a plain upsert of every job on job_url, plus an archive row
+  for every job, with every webhook queued by the API
+- the previous upsert with the API ignoring no-op UPDATEs (content
+  unchanged), as a check of the webhook side on its own
+- now: DatabaseManager.upsert_jobs through upsert_jobs_if_changed, which
+  writes new and changed jobs only, and the API ignoring no-op UPDATEs
+
+Archive rows are only written when zstandard is installed.
+
+Usage:
+    python benchmarks/upsert_changes.py --runs 5 --per-run 200 --repeat 0.8 --changed 0.05
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+from http.server import BaseHTTPRequestHandler
+import threading
+
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scraper'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
+
+from bench_utils import QuietHTTPServer, import_models
+from fake_supabase_server import FAKE_SERVICE_KEY, FakeSupabaseServer
+
+import_models()
+
+from job_assistant_models import JobBatch
+import services.supabase_service as supabase_service
+from services.supabase_service import SupabaseWebhookService
+from src.database.database_manager import DatabaseManager
+from src.scraper.job_data import EnhancedJobData
+
+# The webhook service logs every payload; redirect_stdout is not thread-safe across handler threads
+supabase_service.print = lambda *args, **kwargs: None
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'descriptions')
+
+def start_receiver(service):
+    """HTTP endpoint passing webhooks to the API's webhook service"""
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_POST(self):
+            service.process_webhook(json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0)))))
+            self.send_response(200)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+    httpd = QuietHTTPServer(('127.0.0.1', 0), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    host, port = httpd.server_address[:2]
+    return httpd, f"http://{host}:{port}/webhook/supabase"
+
+def generate_runs(runs, per_run, repeat, changed, seed):
+    """Jobs scraped in each run, as EnhancedJobData with the original markup"""
+    rng = random.Random(seed)
+    descriptions = []
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+            descriptions.append(f.read())
+
+    postings = {}
+    result = []
+    for run in range(runs):
+        seen = list(postings)
+        repeats = rng.sample(seen, min(len(seen), int(per_run * repeat))) if seen else []
+        for job_url in repeats:
+            if rng.random() < changed:
+                postings[job_url]['description'] += f"\n\nUpdated in run {run}."
+        while len(repeats) < per_run:
+            job_url = f"https://www.linkedin.com/jobs/view/{3900000000 + len(postings)}/"
+            postings[job_url] = {
+                'title': rng.choice(['Backend Engineer', 'Data Scientist', 'Platform Engineer']),
+                'company': f"Company {rng.randrange(300)}",
+                'location': rng.choice(['Remote', 'New York, NY', 'Berlin, Germany']),
+                'description': rng.choice(descriptions)
+            }
+            repeats.append(job_url)
+
+        jobs = []
+        for job_url in repeats:
+            posting = postings[job_url]
+            jobs.append(EnhancedJobData({
+                'id': '',
+                'job_url': job_url,
+                'title': posting['title'],
+                'company': posting['company'],
+                'location': posting['location'],
+                'posted_time': f"{rng.randrange(1, 23)} hours ago",
+                'applicants': f"{rng.randrange(1, 200)} applicants",
+                'description': posting['description']
+            }, description_html=f"<div>{posting['description']}</div>"))
+        result.append(jobs)
+    return result
+
+def legacy_upsert_jobs(database, jobs):
+    """Previous DatabaseManager.upsert_jobs: every job and archive row written on every run"""
+    batch = JobBatch.from_records(jobs)
+    batch = batch.filter_values('job_url', ["Not available"], exclude=True).dedup('job_url')
+    job_dicts = [jobs[i].to_supabase_format() for i in batch.indices()]
+    for job in job_dicts:
+        job.pop('content_hash')
+    database.supabase.table('jobs').upsert(job_dicts, on_conflict='job_url').execute()
+    archive_rows = [row for row in (jobs[i].to_archive_format() for i in batch.indices()) if row]
+    if archive_rows:
+        database.supabase.table('job_description_archive').upsert(archive_rows, on_conflict='job_url').execute()
+
+def simulate(label, runs, save, ignore_noop):
+    """Save every run; returns per-run counts"""
+    service = SupabaseWebhookService(quiet_period=3600)
+    receiver, webhook_url = start_receiver(service)
+    server = FakeSupabaseServer(webhook_url=webhook_url).start()
+    database = DatabaseManager(server.url, FAKE_SERVICE_KEY)
+    counts = []
+    try:
+        print(label)
+        for run, jobs in enumerate(runs, 1):
+            server.reset_stats()
+            service.ignored_updates = 0
+            service.webhook_queue.clear()
+            with contextlib.redirect_stdout(io.StringIO()):
+                save(database, jobs)
+            server.wait_for_webhooks()
+
+            # Every jobs table write is delivered as one webhook
+            webhooks = server.stats['webhooks_sent']
+            count = {
+                'jobs written / webhooks': webhooks,
+                'archive rows': server.stats['rows_written'] - webhooks,
+                'queued by the API': len(service.webhook_queue) + (0 if ignore_noop else service.ignored_updates),
+                'requests': server.stats['requests']
+            }
+            counts.append(count)
+            print(f"  run {run:<4}{len(jobs):>10}" + ''.join(f"{value:>{len(name) + 2}}" for name, value in count.items()))
+    finally:
+        if service.quiet_timer:
+            service.quiet_timer.cancel()
+        server.stop()
+        receiver.shutdown()
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--per-run', type=int, default=200)
+    parser.add_argument('--repeat', type=float, default=0.8, help='Share of each run scraped in an earlier run')
+    parser.add_argument('--changed', type=float, default=0.05, help='Share of repeats whose content changed')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    runs = generate_runs(args.runs, args.per_run, args.repeat, args.changed, args.seed)
+    names = ('jobs written / webhooks', 'archive rows', 'queued by the API', 'requests')
+    print(f"{'':<10}{'scraped':>10}" + ''.join(f"{name:>{len(name) + 2}}" for name in names))
+    before = simulate('previously (upsert every job)', runs, legacy_upsert_jobs, ignore_noop=False)
+    simulate('upsert every job, API ignoring no-op UPDATEs', runs, legacy_upsert_jobs, ignore_noop=True)
+    after = simulate('upsert_jobs_if_changed', runs, DatabaseManager.upsert_jobs, ignore_noop=True)
+
+    # The first run only inserts; later runs show the steady state
+    if args.runs > 1:
+        print(f"\nper run after the first")
+        for name in names[:3]:
+            previous = sum(count[name] for count in before[1:]) / (args.runs - 1)
+            current = sum(count[name] for count in after[1:]) / (args.runs - 1)
+            print(f"  {name:<26}{previous:>8.0f} -> {current:.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Measure warm-invocation latency of the Lambda handlers against moto
+
+Each handler is invoked repeatedly in one process, like a warm Lambda
+container. With --per-invocation-clients the shared client registry is
+reset before every call, which reproduces constructing boto3 clients
+inside the handlers on every invocation.
+
+Usage:
+    python benchmarks/warm_invocation.py --invocations 50
+    python benchmarks/warm_invocation.py --invocations 50 --per-invocation-clients
+"""
+import argparse
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+AWS_DIR = os.path.join(os.path.dirname(__file__), '..', 'aws')
+sys.path.insert(0, AWS_DIR)
+
+import boto3
+from moto import mock_aws
+
+def load_handler(name):
+    """Load <name>/app.py under a unique module name (every handler module is called app)"""
+    path = os.path.join(AWS_DIR, name, 'app.py')
+    spec = importlib.util.spec_from_file_location(f"{name}_app", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.path.insert(0, os.path.dirname(path))
+    spec.loader.exec_module(module)
+    return module
+
+def setup_aws():
+    """Create the workflow table, topic and a pending workflow in moto"""
+    os.environ.update({
+        'AWS_DEFAULT_REGION': 'us-east-2',
+        'AWS_ACCESS_KEY_ID': 'testing',
+        'AWS_SECRET_ACCESS_KEY': 'testing',
+        'WORKFLOW_TABLE': 'workflows',
+        'DOCUMENT_GENERATOR_FUNCTION': 'document-generator'
+    })
+    dynamodb = boto3.resource('dynamodb')
+    table = dynamodb.create_table(
+        TableName='workflows',
+        KeySchema=[{'AttributeName': 'workflow_id', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'workflow_id', 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    topic = boto3.client('sns').create_topic(Name='notifications')
+    os.environ['SNS_TOPIC_ARN'] = topic['TopicArn']
+    table.put_item(Item={
+        'workflow_id': 'wf-bench',
+        'job_id': 'bench',
+        'job_data': {'title': 'Engineer', 'company': 'Example'},
+        'status': 'REJECTED',
+        'timeout_at': (datetime.now() + timedelta(minutes=5)).isoformat()
+    })
+
+def measure(label, handler, event, invocations, per_invocation_clients, clients):
+    latencies = []
+    for _ in range(invocations):
+        if per_invocation_clients:
+            clients.reset_clients()
+        start = time.perf_counter()
+        handler(event, None)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    warm = latencies[1:] or latencies
+    print(f"{label:<18} first {latencies[0]:8.2f} ms   warm p50 {statistics.median(warm):7.2f} ms   "
+          f"warm max {max(warm):7.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--invocations', type=int, default=50)
+    parser.add_argument('--per-invocation-clients', action='store_true',
+                        help='Reset the client registry before each call (previous behaviour)')
+    args = parser.parse_args()
+
+    with mock_aws():
+        setup_aws()
+        from shared import clients
+
+        timeout_checker = load_handler('timeout_checker')
+        user_response = load_handler('user_response')
+
+        measure('timeout_checker', timeout_checker.lambda_handler, {}, args.invocations,
+                args.per_invocation_clients, clients)
+        measure('user_response', user_response.lambda_handler,
+                {'path': '/approve', 'queryStringParameters': {'workflow_id': 'wf-bench'}},
+                args.invocations, args.per_invocation_clients, clients)
+
+        print(f"client constructions: {json.dumps(clients.construction_counts)}")
+
+if __name__ == '__main__':
+    main()
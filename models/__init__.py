@@ -1,3 +1,19 @@
 from .job_models import JobRecord, WebhookPayload, Workflow
+from .compact_models import (
+    SlottedJobRecord, FrozenJobRecord, SlottedWebhookPayload, SlottedWorkflow,
+    parse_timestamp, dumps_records, loads_records
+)
+from .decoder import (
+    JobRecordValidationError, decode_job_fields, decode_job_record, decode_webhook_payload,
+    CONTENT_HASH_FIELDS, compute_content_hash, is_noop_update
+)
+from .job_batch import JobBatch
 
-__all__ = ["JobRecord", "WebhookPayload", "Workflow"]
\ No newline at end of file
+__all__ = [
+    "JobRecord", "WebhookPayload", "Workflow",
+    "SlottedJobRecord", "FrozenJobRecord", "SlottedWebhookPayload", "SlottedWorkflow",
+    "parse_timestamp", "dumps_records", "loads_records",
+    "JobRecordValidationError", "decode_job_fields", "decode_job_record", "decode_webhook_payload",
+    "CONTENT_HASH_FIELDS", "compute_content_hash", "is_noop_update",
+    "JobBatch"
+]
\ No newline at end of file
@@ -0,0 +1,256 @@
+from dataclasses import FrozenInstanceError
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Optional, List, Tuple
+import json
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Date and time, fraction and UTC offset of an ISO 8601 / Postgres timestamp
+_ISO_TIMESTAMP = re.compile(
+    r'(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2})?)(?:\.(\d+))?(Z|[+-]\d{2}(?::?\d{2})?)?$'
+)
+
+@lru_cache(maxsize=4096)
+def _parse_iso_timestamp(value: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        pass
+
+    # Before Python 3.11 fromisoformat only takes 3 or 6 fraction digits and +HH:MM
+    # offsets, while Postgres drops trailing zeros (.12345) and may write +00
+    match = _ISO_TIMESTAMP.match(value)
+    if not match:
+        return None
+    value, fraction, offset = match.groups()
+    if fraction:
+        value += '.' + fraction[:6].ljust(6, '0')
+    if offset == 'Z':
+        value += '+00:00'
+    elif offset:
+        value += offset if ':' in offset else f"{offset[:3]}:{offset[3:] or '00'}"
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """
+    Parse an ISO timestamp, caching results
+
+    Records in a batch usually share a handful of timestamps, so repeated
+    strings are parsed once. datetime values are returned unchanged and
+    unparseable values become None.
+    """
+    if value is None or isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        return _parse_iso_timestamp(value) if value else None
+    return None
+
+def _compile_codecs(cls, fields: List[Tuple[str, bool]], datetime_fields=(), nested_fields=None, frozen=False):
+    """
+    Generate __init__, to_dict, from_dict, __repr__ and __eq__ for a slotted class
+
+    The methods are compiled once per class with the field names inlined, so
+    there is no per-call iteration over __dict__ or field metadata.
+
+    Args:
+        cls: Class to add the methods to
+        fields: (name, required) pairs in constructor order
+        datetime_fields: Fields stored as datetime and serialized as ISO strings
+        nested_fields: Mapping of field name to the class used to decode/encode it
+        frozen: Whether instances reject attribute assignment after construction
+    """
+    nested_fields = nested_fields or {}
+    names = [name for name, _ in fields]
+    params = ', '.join(name if required else f"{name}=None" for name, required in fields)
+    setter = '_setattr(self, {name!r}, {name})' if frozen else 'self.{name} = {name}'
+
+    init_lines = [f"def __init__(self, {params}):"]
+    init_lines += [f"    {setter.format(name=name)}" for name in names]
+
+    to_dict_lines = ["def to_dict(self):"]
+    to_dict_items = []
+    for name in names:
+        if name in datetime_fields:
+            to_dict_lines.append(f"    {name} = self.{name}")
+            to_dict_items.append(f"{name!r}: {name}.isoformat() if {name} is not None else None")
+        elif name in nested_fields:
+            to_dict_lines.append(f"    {name} = self.{name}")
+            to_dict_items.append(f"{name!r}: {name}.to_dict() if {name} is not None else None")
+        else:
+            to_dict_items.append(f"{name!r}: self.{name}")
+    to_dict_lines.append("    return {" + ', '.join(to_dict_items) + "}")
+
+    from_dict_lines = ["def from_dict(cls, data):", "    get = data.get"]
+    from_dict_args = []
+    for name, required in fields:
+        value = f"data[{name!r}]" if required else f"get({name!r})"
+        if name in datetime_fields:
+            value = f"_parse_timestamp({value})"
+        elif name in nested_fields:
+            from_dict_lines.append(f"    {name} = {value}")
+            value = f"_{name}_cls.from_dict({name}) if {name} else None"
+        from_dict_args.append(value)
+    from_dict_lines.append("    return cls(" + ', '.join(from_dict_args) + ")")
+
+    repr_fields = ', '.join(f"{name}={{self.{name}!r}}" for name in names)
+    source = '\n'.join(init_lines + to_dict_lines + from_dict_lines + [
+        "def __repr__(self):",
+        f"    return f\"{cls.__name__}({repr_fields})\"",
+        "def __eq__(self, other):",
+        "    if other.__class__ is not self.__class__:",
+        "        return NotImplemented",
+        "    return (" + ''.join(f"self.{n}, " for n in names) + ") == (" + ''.join(f"other.{n}, " for n in names) + ")",
+    ])
+
+    namespace = {'_setattr': object.__setattr__, '_parse_timestamp': parse_timestamp}
+    namespace.update({f"_{name}_cls": nested_cls for name, nested_cls in nested_fields.items()})
+    exec(source, namespace)
+
+    cls.__init__ = namespace['__init__']
+    cls.to_dict = namespace['to_dict']
+    cls.from_dict = classmethod(namespace['from_dict'])
+    cls.__repr__ = namespace['__repr__']
+    cls.__eq__ = namespace['__eq__']
+
+    if frozen:
+        def __setattr__(self, name, value):
+            raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+        def __hash__(self):
+            return hash(tuple(getattr(self, name) for name in names))
+
+        cls.__setattr__ = __setattr__
+        cls.__delattr__ = __setattr__
+        cls.__hash__ = __hash__
+    else:
+        cls.__hash__ = None
+
+    return cls
+
+JOB_RECORD_FIELDS = [
+    ('id', True),
+    ('job_url', True),
+    ('title', True),
+    ('company', True),
+    ('location', False),
+    ('posted_time', False),
+    ('applicants', False),
+    ('description', False),
+    ('created_at', False),
+    ('updated_at', False),
+    ('content_hash', False)
+]
+
+WORKFLOW_FIELDS = [
+    ('workflow_id', True),
+    ('job_id', True),
+    ('job_data', True),
+    ('status', True),
+    ('created_at', True),
+    ('timeout_at', True),
+    ('timeout_timestamp', True),
+    ('expires_at', True),
+    ('updated_at', False),
+    ('document_url', False),
+    ('completed_at', False)
+]
+
+class SlottedJobRecord:
+    """
+    Memory-compact JobRecord using __slots__, with the same fields and dict format
+    """
+    __slots__ = tuple(name for name, _ in JOB_RECORD_FIELDS)
+
+    @classmethod
+    def from_record(cls, record) -> 'SlottedJobRecord':
+        """Create from a JobRecord (or any object with the same attributes)"""
+        return cls(*(getattr(record, name) for name, _ in JOB_RECORD_FIELDS))
+
+class FrozenJobRecord(SlottedJobRecord):
+    """
+    Immutable, hashable variant of SlottedJobRecord
+    """
+    __slots__ = ()
+
+class SlottedWebhookPayload:
+    """
+    Memory-compact WebhookPayload holding SlottedJobRecord records
+    """
+    __slots__ = ('type', 'table', 'schema', 'record', 'old_record')
+
+class SlottedWorkflow:
+    """
+    Memory-compact Workflow using __slots__
+    """
+    __slots__ = tuple(name for name, _ in WORKFLOW_FIELDS)
+
+_compile_codecs(SlottedJobRecord, JOB_RECORD_FIELDS, datetime_fields=('created_at', 'updated_at'))
+_compile_codecs(FrozenJobRecord, JOB_RECORD_FIELDS, datetime_fields=('created_at', 'updated_at'), frozen=True)
+_compile_codecs(
+    SlottedWebhookPayload,
+    [('type', True), ('table', True), ('schema', True), ('record', False), ('old_record', False)],
+    nested_fields={'record': SlottedJobRecord, 'old_record': SlottedJobRecord}
+)
+_compile_codecs(SlottedWorkflow, WORKFLOW_FIELDS)
+
+def dumps_records(records, format: str = 'json') -> bytes:
+    """
+    Serialize records to bytes
+
+    Uses orjson for JSON when it is installed and falls back to the
+    standard library otherwise.
+
+    Args:
+        records: Objects with a to_dict() method
+        format: 'json' or 'msgpack' (requires msgpack)
+
+    Returns:
+        Serialized records
+    """
+    dicts = [record.to_dict() for record in records]
+
+    if format == 'msgpack':
+        if msgpack is None:
+            raise ImportError("msgpack is required for the msgpack format")
+        return msgpack.packb(dicts, use_bin_type=True)
+
+    if orjson is not None:
+        return orjson.dumps(dicts)
+    return json.dumps(dicts, separators=(',', ':')).encode('utf-8')
+
+def loads_records(data: bytes, cls=SlottedJobRecord, format: str = 'json') -> list:
+    """
+    Deserialize records produced by dumps_records
+
+    Args:
+        data: Serialized records
+        cls: Class to decode each record with
+        format: 'json' or 'msgpack' (requires msgpack)
+
+    Returns:
+        List of decoded records
+    """
+    if format == 'msgpack':
+        if msgpack is None:
+            raise ImportError("msgpack is required for the msgpack format")
+        dicts = msgpack.unpackb(data, raw=False)
+    elif orjson is not None:
+        dicts = orjson.loads(data)
+    else:
+        dicts = json.loads(data)
+
+    from_dict = cls.from_dict
+    return [from_dict(item) for item in dicts]
@@ -0,0 +1,223 @@
+from collections.abc import Mapping
+from datetime import datetime
+import hashlib
+from typing import Dict, Any, Optional, Tuple
+from .compact_models import parse_timestamp, _parse_iso_timestamp
+
+class JobRecordValidationError(ValueError):
+    """Raised when a job record does not match the schema"""
+
+# Job record schema: (field name, required, is_timestamp). Every component decodes
+# job records through this schema; fields not listed here are ignored.
+JOB_RECORD_SCHEMA: Tuple[Tuple[str, bool, bool], ...] = (
+    ('id', True, False),
+    ('job_url', True, False),
+    ('title', True, False),
+    ('company', True, False),
+    ('location', False, False),
+    ('posted_time', False, False),
+    ('applicants', False, False),
+    ('description', False, False),
+    ('created_at', False, True),
+    ('updated_at', False, True),
+    ('content_hash', False, False)
+)
+
+# Fields covered by content_hash: what the posting says. posted_time and applicants
+# are relative ("3 hours ago", "45 applicants") and change between scrapes of the
+# same posting, so they are not part of it.
+CONTENT_HASH_FIELDS = ('title', 'company', 'location', 'description')
+
+WEBHOOK_TYPES = ('INSERT', 'UPDATE', 'DELETE')
+
+def _check_value(name: str, value: Any, required: bool, strict: bool) -> Any:
+    """Slow path of decode_job_fields for values that are not plain strings"""
+    if value is None:
+        if required:
+            if strict:
+                raise JobRecordValidationError(f"Missing required field '{name}'")
+            return ''
+        return None
+    if isinstance(value, str):
+        return value
+    if strict:
+        raise JobRecordValidationError(f"Field '{name}' must be a string, got {type(value).__name__}")
+    return str(value)
+
+def _check_timestamp(name: str, value: Any, strict: bool) -> Optional[datetime]:
+    """Parse a timestamp field, validating it if strict"""
+    parsed = parse_timestamp(value)
+    if parsed is None and value != '' and strict:
+        raise JobRecordValidationError(f"Invalid timestamp for '{name}': {value!r}")
+    return parsed
+
+def _compile_field_decoder(schema, build):
+    """
+    Compile a decoder function for a schema
+
+    The generated function inlines one fast check per field (plain strings
+    pass straight through, timestamps go straight to the parse cache) and
+    only calls the slow path for anything else.
+
+    Args:
+        schema: (name, required, is_timestamp) tuples
+        build: Format string for the return expression, given the
+               comma-separated `name=name` keyword arguments
+    """
+    lines = ["def decode(get, strict, cls=None):"]
+    for name, required, is_timestamp in schema:
+        lines.append(f"    {name} = get({name!r})")
+        if is_timestamp:
+            lines.append(f"    if {name} is not None and {name}.__class__ is not _datetime:")
+            lines.append(f"        {name} = (_parse_iso({name}) if {name}.__class__ is str and {name} else None) or _check_timestamp({name!r}, {name}, strict)")
+        else:
+            lines.append(f"    if {name}.__class__ is not str:")
+            lines.append(f"        {name} = _check_value({name!r}, {name}, {required}, strict)")
+    lines.append("    return " + build.format(', '.join(f"{name}={name}" for name, _, _ in schema)))
+
+    namespace = {
+        '_datetime': datetime,
+        '_parse_iso': _parse_iso_timestamp,
+        '_check_value': _check_value,
+        '_check_timestamp': _check_timestamp
+    }
+    exec('\n'.join(lines), namespace)
+    return namespace['decode']
+
+_decode_job_fields = _compile_field_decoder(JOB_RECORD_SCHEMA, 'dict({})')
+_decode_job_record = _compile_field_decoder(JOB_RECORD_SCHEMA, 'cls({})')
+
+def _getter(source: Any):
+    """Get a field accessor for a mapping or an object"""
+    if source.__class__ is dict or isinstance(source, Mapping):
+        return source.get
+    if source is None:
+        raise JobRecordValidationError("Job record is empty")
+    return lambda name: getattr(source, name, None)
+
+def decode_job_fields(source: Any, strict: bool = True) -> Dict[str, Any]:
+    """
+    Validate and decode job record fields
+
+    Args:
+        source: Mapping (e.g. a webhook record) or object with job record attributes
+        strict: Raise on missing required fields, non-string values and invalid
+                timestamps. When False, missing fields default to '' / None,
+                other values are converted to str and invalid timestamps become None.
+
+    Returns:
+        Dictionary of decoded field values, suitable as JobRecord keyword arguments
+
+    Raises:
+        JobRecordValidationError: If strict and the record does not match the schema
+    """
+    return _decode_job_fields(_getter(source), strict)
+
+_record_cls = None
+
+def _default_record_cls():
+    """JobRecord, imported on first use since job_models imports this module"""
+    global _record_cls
+    if _record_cls is None:
+        from .job_models import JobRecord
+        _record_cls = JobRecord
+    return _record_cls
+
+def decode_job_record(source: Any, cls=None, strict: bool = True):
+    """
+    Decode a job record into a model object
+
+    Args:
+        source: Mapping or object with job record attributes
+        cls: Class to construct, defaults to JobRecord. Any class accepting the
+             schema fields as keyword arguments works (e.g. SlottedJobRecord).
+        strict: See decode_job_fields
+
+    Returns:
+        Decoded job record
+
+    Raises:
+        JobRecordValidationError: If strict and the record does not match the schema
+    """
+    return _decode_job_record(_getter(source), strict, cls or _record_cls or _default_record_cls())
+
+def compute_content_hash(source: Any) -> str:
+    """
+    Hash the content fields of a job record
+
+    Args:
+        source: Mapping or object with job record attributes; missing
+                fields hash like empty strings, as the scraper stores them
+
+    Returns:
+        SHA-256 hex digest of CONTENT_HASH_FIELDS
+    """
+    get = _getter(source)
+    content = '\x1f'.join(get(name) or '' for name in CONTENT_HASH_FIELDS)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def is_noop_update(record: Any, old_record: Any) -> bool:
+    """
+    Check whether an UPDATE left the content of a job unchanged
+
+    The stored content_hash values are compared when both records have one,
+    otherwise the CONTENT_HASH_FIELDS themselves.
+
+    Args:
+        record: New record (mapping or object)
+        old_record: Previous record, None if the webhook did not include it
+
+    Returns:
+        True if the update can be ignored
+    """
+    if not record or not old_record:
+        return False
+    get, old_get = _getter(record), _getter(old_record)
+    content_hash, old_content_hash = get('content_hash'), old_get('content_hash')
+    if content_hash and old_content_hash:
+        return content_hash == old_content_hash
+    return all((get(name) or '') == (old_get(name) or '') for name in CONTENT_HASH_FIELDS)
+
+def decode_webhook_payload(data: Mapping, record_cls=None, strict: bool = True):
+    """
+    Decode a Supabase webhook payload
+
+    Args:
+        data: Webhook payload dictionary
+        record_cls: Class used for record / old_record, defaults to JobRecord
+        strict: See decode_job_fields
+
+    Returns:
+        WebhookPayload
+
+    Raises:
+        JobRecordValidationError: If the payload or its records are invalid
+    """
+    from .job_models import WebhookPayload
+
+    if not isinstance(data, Mapping):
+        raise JobRecordValidationError("Webhook payload must be an object")
+
+    missing = [key for key in ('type', 'table', 'schema') if key not in data]
+    if missing:
+        raise JobRecordValidationError(f"Webhook payload is missing: {', '.join(missing)}")
+
+    webhook_type = data['type']
+    if webhook_type not in WEBHOOK_TYPES:
+        raise JobRecordValidationError(f"Unknown webhook type: {webhook_type!r}")
+
+    record = None
+    if webhook_type in ('INSERT', 'UPDATE') and data.get('record'):
+        record = decode_job_record(data['record'], record_cls, strict)
+
+    old_record = None
+    if webhook_type in ('UPDATE', 'DELETE') and data.get('old_record'):
+        old_record = decode_job_record(data['old_record'], record_cls, strict)
+
+    return WebhookPayload(
+        type=webhook_type,
+        table=data['table'],
+        schema=data['schema'],
+        record=record,
+        old_record=old_record
+    )
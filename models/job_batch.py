@@ -0,0 +1,424 @@
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, List, Iterable, Iterator, Sequence
+from .compact_models import parse_timestamp
+from .decoder import _getter, _default_record_cls
+
+# Plain string columns, stored as lists of str
+STRING_FIELDS = ('id', 'job_url', 'title', 'posted_time', 'applicants', 'content_hash')
+
+# Low-cardinality columns, stored as int32 codes into a vocabulary of unique values
+DICTIONARY_FIELDS = ('company', 'location')
+
+# Timestamp columns, stored as float64 seconds since the epoch (NaN for missing)
+TIMESTAMP_FIELDS = ('created_at', 'updated_at')
+
+FIELDS = ('id', 'job_url', 'title', 'company', 'location', 'posted_time',
+          'applicants', 'description', 'created_at', 'updated_at', 'content_hash')
+
+_NAN = float('nan')
+
+def _from_epoch(value: float) -> Optional[datetime]:
+    if value != value:
+        return None
+    return datetime.fromtimestamp(value, timezone.utc)
+
+class _Columns:
+    """Column storage shared by a batch and every view derived from it"""
+    __slots__ = ('length', 'strings', 'codes', 'vocabularies',
+                 'description_offsets', 'description_data', 'description_valid', 'timestamps')
+
+class JobBatch:
+    """
+    Column-wise batch of job records for bulk processing
+
+    Company and location are dictionary-encoded, descriptions are kept as one
+    UTF-8 buffer and only decoded when a row or the description column is
+    read, and timestamps are stored as epoch seconds (materialized in UTC).
+
+    Slicing, filtering and dedup return views that share the column storage
+    of the batch they were created from; only the selected row indices are new.
+    """
+
+    def __init__(self, columns: _Columns, rows=None):
+        """
+        Create a view over column storage
+
+        Use from_records / from_payloads to build a batch.
+
+        Args:
+            columns: Column storage
+            rows: Selected row indices (range or sequence of ints), all rows if None
+        """
+        self._columns = columns
+        self._rows = range(columns.length) if rows is None else rows
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any]) -> 'JobBatch':
+        """
+        Build a batch from job records
+
+        Args:
+            records: JobRecord-like objects or record dictionaries
+
+        Returns:
+            JobBatch holding the records
+        """
+        columns = _Columns()
+        strings = {name: [] for name in STRING_FIELDS}
+        codes = {name: array('i') for name in DICTIONARY_FIELDS}
+        vocabularies = {name: [] for name in DICTIONARY_FIELDS}
+        lookups = {name: {} for name in DICTIONARY_FIELDS}
+        timestamps = {name: array('d') for name in TIMESTAMP_FIELDS}
+        offsets = array('q', [0])
+        data = bytearray()
+        valid = array('b')
+
+        string_appends = [(name, strings[name].append) for name in STRING_FIELDS]
+        dictionary_columns = [(name, codes[name].append, vocabularies[name], lookups[name]) for name in DICTIONARY_FIELDS]
+        timestamp_appends = [(name, timestamps[name].append) for name in TIMESTAMP_FIELDS]
+
+        for record in records:
+            get = _getter(record)
+
+            for name, append in string_appends:
+                append(get(name))
+
+            for name, append, vocabulary, lookup in dictionary_columns:
+                value = get(name)
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(vocabulary)
+                    vocabulary.append(value)
+                append(code)
+
+            description = get('description')
+            if description is None:
+                valid.append(0)
+            else:
+                data += description.encode('utf-8')
+                valid.append(1)
+            offsets.append(len(data))
+
+            for name, append in timestamp_appends:
+                value = parse_timestamp(get(name))
+                append(value.timestamp() if value is not None else _NAN)
+
+        columns.length = len(valid)
+        columns.strings = strings
+        columns.codes = codes
+        columns.vocabularies = vocabularies
+        columns.description_offsets = offsets
+        columns.description_data = bytes(data)
+        columns.description_valid = valid
+        columns.timestamps = timestamps
+        return cls(columns)
+
+    @classmethod
+    def from_payloads(cls, payloads: Iterable[Any]) -> 'JobBatch':
+        """
+        Build a batch from the records of webhook payloads
+
+        Payloads without a record (e.g. DELETE) are skipped.
+
+        Args:
+            payloads: WebhookPayload objects or payload dictionaries
+
+        Returns:
+            JobBatch holding the payload records
+        """
+        def records():
+            for payload in payloads:
+                record = payload.get('record') if isinstance(payload, dict) else payload.record
+                if record:
+                    yield record
+        return cls.from_records(records())
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, item):
+        """Get a row as a JobRecord, or a zero-copy view for a slice"""
+        if isinstance(item, slice):
+            rows = self._rows
+            if not isinstance(rows, range):
+                rows = memoryview(rows) if isinstance(rows, array) else rows
+            return JobBatch(self._columns, rows[item])
+        return self._row(self._rows[item])
+
+    def __iter__(self) -> Iterator[Any]:
+        return (self._row(i) for i in self._rows)
+
+    def __repr__(self) -> str:
+        return f"JobBatch({len(self)} records)"
+
+    def indices(self) -> List[int]:
+        """
+        Get the row positions of this view in the records the batch was built from
+
+        Returns:
+            List of row indices
+        """
+        return list(self._rows)
+
+    def _row(self, i: int, cls=None):
+        """Materialize row i of the column storage"""
+        cls = cls or _default_record_cls()
+        c = self._columns
+        strings = c.strings
+        return cls(
+            id=strings['id'][i],
+            job_url=strings['job_url'][i],
+            title=strings['title'][i],
+            company=c.vocabularies['company'][c.codes['company'][i]],
+            location=c.vocabularies['location'][c.codes['location'][i]],
+            posted_time=strings['posted_time'][i],
+            applicants=strings['applicants'][i],
+            description=self._description(i),
+            created_at=_from_epoch(c.timestamps['created_at'][i]),
+            updated_at=_from_epoch(c.timestamps['updated_at'][i]),
+            content_hash=strings['content_hash'][i]
+        )
+
+    def _description(self, i: int) -> Optional[str]:
+        c = self._columns
+        if not c.description_valid[i]:
+            return None
+        offsets = c.description_offsets
+        return c.description_data[offsets[i]:offsets[i + 1]].decode('utf-8')
+
+    def to_records(self, cls=None) -> list:
+        """
+        Materialize the rows of this view
+
+        Args:
+            cls: Record class, defaults to JobRecord (e.g. SlottedJobRecord)
+
+        Returns:
+            List of records
+        """
+        return [self._row(i, cls) for i in self._rows]
+
+    def column(self, name: str) -> list:
+        """
+        Get the values of a column for the rows of this view
+
+        Args:
+            name: Field name
+
+        Returns:
+            List of values
+        """
+        c = self._columns
+        if name in STRING_FIELDS:
+            values = c.strings[name]
+            return [values[i] for i in self._rows]
+        if name in DICTIONARY_FIELDS:
+            codes, vocabulary = c.codes[name], c.vocabularies[name]
+            return [vocabulary[codes[i]] for i in self._rows]
+        if name in TIMESTAMP_FIELDS:
+            values = c.timestamps[name]
+            return [_from_epoch(values[i]) for i in self._rows]
+        if name == 'description':
+            return [self._description(i) for i in self._rows]
+        raise KeyError(f"Unknown field: {name}")
+
+    def vocabulary(self, name: str) -> list:
+        """Get the unique values of a dictionary-encoded column (company, location)"""
+        return self._columns.vocabularies[name]
+
+    def _select(self, rows: Iterable[int]) -> 'JobBatch':
+        return JobBatch(self._columns, array('q', rows))
+
+    def filter(self, mask: Sequence[bool]) -> 'JobBatch':
+        """
+        Select rows with a boolean mask
+
+        Args:
+            mask: One truth value per row of this view (a list or NumPy bool array)
+
+        Returns:
+            View of the selected rows
+        """
+        if len(mask) != len(self._rows):
+            raise ValueError(f"Mask has {len(mask)} entries for {len(self._rows)} rows")
+        return self._select(i for i, keep in zip(self._rows, mask) if keep)
+
+    def filter_values(self, name: str, values: Iterable[Any], exclude: bool = False) -> 'JobBatch':
+        """
+        Select rows whose field is (or, with exclude, is not) one of the given values
+
+        Dictionary-encoded fields are compared by code, so each row costs
+        one integer lookup regardless of the string length.
+
+        Args:
+            name: Field name (not description)
+            values: Values to match
+            exclude: Keep rows that do not match instead
+
+        Returns:
+            View of the selected rows
+        """
+        c = self._columns
+        if name in DICTIONARY_FIELDS:
+            # Resolve the values to a keep/drop flag per code once, then scan the codes
+            values = set(values)
+            keep = [(value in values) != exclude for value in c.vocabularies[name]]
+            codes = c.codes[name]
+            return self._select(i for i in self._rows if keep[codes[i]])
+
+        if name in STRING_FIELDS:
+            wanted = set(values)
+            column = c.strings[name]
+        else:
+            raise KeyError(f"Cannot filter on field: {name}")
+
+        if exclude:
+            return self._select(i for i in self._rows if column[i] not in wanted)
+        return self._select(i for i in self._rows if column[i] in wanted)
+
+    def filter_contains(self, name: str, text: str) -> 'JobBatch':
+        """
+        Select rows whose field contains text, ignoring case
+
+        For dictionary-encoded fields the match is evaluated once per unique value.
+
+        Args:
+            name: Field name
+            text: Text to look for
+
+        Returns:
+            View of the selected rows
+        """
+        needle = text.casefold()
+        if name in DICTIONARY_FIELDS:
+            matches = [value for value in self._columns.vocabularies[name] if value and needle in value.casefold()]
+            return self.filter_values(name, matches)
+        values = self.column(name)
+        return self.filter([bool(value) and needle in value.casefold() for value in values])
+
+    def dedup(self, *names: str, keep: str = 'first') -> 'JobBatch':
+        """
+        Drop rows that repeat another row's key
+
+        Args:
+            names: Fields forming the key, defaults to job_url
+            keep: Keep the 'first' or the 'last' occurrence of each key
+
+        Returns:
+            View of the unique rows
+        """
+        names = names or ('job_url',)
+        c = self._columns
+        keys = []
+        for name in names:
+            if name in DICTIONARY_FIELDS:
+                keys.append(c.codes[name])
+            elif name in STRING_FIELDS:
+                keys.append(c.strings[name])
+            elif name in TIMESTAMP_FIELDS:
+                keys.append(c.timestamps[name])
+            else:
+                raise KeyError(f"Cannot dedup on field: {name}")
+
+        if keep not in ('first', 'last'):
+            raise ValueError(f"keep must be 'first' or 'last', got {keep!r}")
+        candidates = self._rows if keep == 'first' else reversed(self._rows)
+
+        seen = set()
+        add = seen.add
+        if len(keys) == 1:
+            key = keys[0]
+            rows = [i for i in candidates if not (key[i] in seen or add(key[i]))]
+        else:
+            rows = []
+            for i in candidates:
+                value = tuple(key[i] for key in keys)
+                if value not in seen:
+                    add(value)
+                    rows.append(i)
+
+        if keep == 'last':
+            rows.reverse()
+        return self._select(rows)
+
+    def to_numpy(self, include_descriptions: bool = False) -> Dict[str, Any]:
+        """
+        Convert the view to NumPy arrays (requires numpy)
+
+        Dictionary-encoded fields become int32 code arrays, with their
+        vocabularies under '<name>_vocabulary'; timestamps become datetime64[us].
+
+        Args:
+            include_descriptions: Also decode the description column
+
+        Returns:
+            Dictionary of column name to array
+        """
+        import numpy as np
+
+        c = self._columns
+        rows = self._rows
+        if isinstance(rows, range) and rows.step == 1:
+            take = lambda column: column[rows.start:rows.stop]
+        else:
+            index = np.frombuffer(rows, dtype=np.int64) if isinstance(rows, (array, memoryview)) else np.asarray(rows, dtype=np.int64)
+            take = lambda column: column[index]
+
+        result = {}
+        for name in STRING_FIELDS:
+            result[name] = take(np.array(c.strings[name], dtype=object))
+        for name in DICTIONARY_FIELDS:
+            result[name] = take(np.frombuffer(c.codes[name], dtype=np.int32))
+            result[f"{name}_vocabulary"] = np.array(c.vocabularies[name], dtype=object)
+        for name in TIMESTAMP_FIELDS:
+            seconds = take(np.frombuffer(c.timestamps[name], dtype=np.float64))
+            missing = np.isnan(seconds)
+            micros = np.where(missing, 0, seconds * 1e6).astype(np.int64)
+            values = micros.astype('datetime64[us]')
+            values[missing] = np.datetime64('NaT')
+            result[name] = values
+        if include_descriptions:
+            result['description'] = np.array(self.column('description'), dtype=object)
+        return result
+
+    def to_arrow(self):
+        """
+        Convert the view to a pyarrow Table (requires pyarrow)
+
+        Company and location become dictionary arrays and descriptions are
+        wrapped without copying the UTF-8 buffer.
+
+        Returns:
+            pyarrow.Table
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        c = self._columns
+        length = c.length
+
+        arrays = {}
+        for name in STRING_FIELDS:
+            arrays[name] = pa.array(c.strings[name], type=pa.string())
+        for name in DICTIONARY_FIELDS:
+            codes = pa.Array.from_buffers(pa.int32(), length, [None, pa.py_buffer(c.codes[name])])
+            arrays[name] = pa.DictionaryArray.from_arrays(codes, pa.array(c.vocabularies[name], type=pa.string()))
+
+        descriptions = pa.LargeStringArray.from_buffers(
+            length,
+            pa.py_buffer(c.description_offsets),
+            pa.py_buffer(c.description_data)
+        )
+        valid = pa.Array.from_buffers(pa.int8(), length, [None, pa.py_buffer(c.description_valid)])
+        arrays['description'] = pc.if_else(pc.equal(valid, 1), descriptions, pa.scalar(None, pa.large_string()))
+
+        for name in TIMESTAMP_FIELDS:
+            arrays[name] = pa.array([_from_epoch(value) for value in c.timestamps[name]], type=pa.timestamp('us', tz='UTC'))
+
+        table = pa.table({name: arrays[name] for name in FIELDS})
+
+        rows = self._rows
+        if isinstance(rows, range) and rows.step == 1:
+            return table.slice(rows.start, len(rows))
+        return table.take(pa.array(list(rows), type=pa.int64()))
\ No newline at end of file
@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from typing import Dict, Any, Optional, List, Literal
 from datetime import datetime
 import json
+from .decoder import decode_job_record, decode_webhook_payload
 
 @dataclass
 class JobRecord:
@@ -18,6 +19,7 @@ class JobRecord:
     description: Optional[str] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    content_hash: Optional[str] = None
     
     @classmethod
     def create_empty(cls):
@@ -45,23 +47,8 @@ class JobRecord:
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'JobRecord':
-        """Create from dictionary"""
-        # Handle datetime fields
-        if 'created_at' in data and data['created_at'] and isinstance(data['created_at'], str):
-            try:
-                data = data.copy()  # Create a copy to avoid modifying the original
-                data['created_at'] = datetime.fromisoformat(data['created_at'].replace('Z', '+00:00'))
-            except (ValueError, TypeError):
-                data['created_at'] = None
-                
-        if 'updated_at' in data and data['updated_at'] and isinstance(data['updated_at'], str):
-            try:
-                data = data.copy() if 'created_at' not in data else data  # Create a copy if not already done
-                data['updated_at'] = datetime.fromisoformat(data['updated_at'].replace('Z', '+00:00'))
-            except (ValueError, TypeError):
-                data['updated_at'] = None
-                
-        return cls(**data)
+        """Create from dictionary (unknown keys are ignored, invalid timestamps become None)"""
+        return decode_job_record(data, cls, strict=False)
 
 @dataclass
 class WebhookPayload:
@@ -87,16 +74,7 @@ class WebhookPayload:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'WebhookPayload':
         """Create from dictionary"""
-        record = JobRecord.from_dict(data['record']) if 'record' in data and data['record'] else None
-        old_record = JobRecord.from_dict(data['old_record']) if 'old_record' in data and data['old_record'] else None
-        
-        return cls(
-            type=data['type'],
-            table=data['table'],
-            schema=data['schema'],
-            record=record,
-            old_record=old_record
-        )
+        return decode_webhook_payload(data, strict=False)
 
 @dataclass
 class Workflow:
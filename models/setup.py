@@ -11,4 +11,7 @@ setup(
         "pydantic>=2.0.0",
         "typing-extensions>=4.0.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.9.0", "msgpack>=1.0.0"],
+    },
 )
\ No newline at end of file
@@ -0,0 +1,17 @@
+#!/bin/bash
+
+# Add timestamp to log
+echo "====================================="
+date
+echo "Starting job retention..."
+
+# Navigate to the project directory
+cd /home/ubuntu/scraper
+
+# Delete jobs older than RETENTION_DAYS in bounded batches
+python3 retention.py
+
+# Log completion
+echo "Retention finished at: "
+date
+echo "====================================="
\ No newline at end of file
@@ -5,11 +5,14 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
-import random
 
 from src.config.config import Config
 from src.scraper.linkedin_scraper import LinkedInScraper
+from src.scraper.pacing import AdaptivePacer
+from src.scraper.replay import ReplayDriver, SnapshotRecorder
 from src.data.data_manager import DataManager
+from src.data.near_duplicates import NearDuplicateIndex
+from src.data.run_checkpoint import RunCheckpoint
 from src.database.database_manager import DatabaseManager
 
 class LinkedInJobScraper:
@@ -17,12 +20,96 @@ class LinkedInJobScraper:
     def __init__(self):
         self.config = Config()
         self.setup_driver()
-        self.scraper = LinkedInScraper(self.driver, self.config)
-        self.data_manager = DataManager()
-        self.db_manager = DatabaseManager(self.config.SUPABASE_URL, self.config.SUPABASE_KEY)
+        self.recorder = SnapshotRecorder(self.config.RECORD_ARCHIVE) if self.config.RECORD_ARCHIVE else None
+        self.pacer = self.create_pacer()
+        self.scraper = LinkedInScraper(self.driver, self.config, self.recorder, self.pacer)
+        self.near_duplicates = self.load_near_duplicate_index()
+        self.data_manager = DataManager(
+            self.near_duplicates,
+            spill_path=self.config.JOB_SPILL_FILE or None,
+            buffer_size=self.config.JOB_BUFFER_SIZE,
+            store_path=self.config.JOB_STORE or None
+        )
+        self.db_manager = DatabaseManager(
+            self.config.SUPABASE_URL,
+            self.config.SUPABASE_KEY,
+            migration_manifest=self.config.MIGRATION_MANIFEST
+        )
+        self.checkpoint = self.load_checkpoint()
+
+    def load_near_duplicate_index(self):
+        """Load the near-duplicate index, dropping postings older than the configured age"""
+        if not self.config.NEAR_DUPLICATE_DETECTION:
+            return None
+        
+        index = NearDuplicateIndex.load(
+            self.config.NEAR_DUPLICATE_INDEX,
+            threshold=self.config.NEAR_DUPLICATE_THRESHOLD
+        )
+        pruned = index.prune(self.config.NEAR_DUPLICATE_MAX_AGE_DAYS)
+        print(f"Loaded near-duplicate index with {len(index)} postings ({pruned} expired)")
+        return index
+
+    def create_pacer(self):
+        """Create the adaptive pacer of job detail loads, unless pacing is disabled or the run is a replay"""
+        if not self.config.PACING_ENABLED or self.config.REPLAY_ARCHIVE:
+            return None
+        
+        return AdaptivePacer(
+            initial_rate=self.config.PACING_INITIAL_RATE,
+            min_rate=self.config.PACING_MIN_RATE,
+            max_rate=self.config.PACING_MAX_RATE,
+            slow_load=self.config.PACING_SLOW_LOAD
+        )
+
+    def load_checkpoint(self):
+        """Load the checkpoint of an interrupted run of the same search, or start a new one"""
+        if not self.config.RUN_CHECKPOINT:
+            return None
+        
+        return RunCheckpoint.load(
+            self.config.RUN_CHECKPOINT,
+            self.config.JOB_ALERT_URL,
+            self.config.RUN_CHECKPOINT_MAX_AGE_HOURS
+        )
+
+    def finish_run(self, complete=True):
+        """
+        Save the collected jobs and update the checkpoint
+        
+        Args:
+            complete: Whether the run covered the search; if not, the checkpoint is kept
+                      so the next run resumes from the current page
+        """
+        self.save_jobs()
+        if self.checkpoint is not None:
+            if complete:
+                self.checkpoint.clear()
+            else:
+                self.checkpoint.flushed()
+
+    def save_jobs(self):
+        """Upsert the collected jobs and persist the near-duplicate index"""
+        # One upsert per buffer of jobs, so a spilled run is never loaded into memory at once
+        for jobs in self.data_manager.iter_batches(self.config.JOB_BUFFER_SIZE):
+            self.db_manager.upsert_jobs(jobs)
+        
+        if self.near_duplicates is not None:
+            self.near_duplicates.save(self.config.NEAR_DUPLICATE_INDEX)
+            print(f"Suppressed {self.data_manager.suppressed_duplicates} near-duplicate postings")
 
     def setup_driver(self):
         """Configure and initialize the Selenium WebDriver with optimized settings"""
+        if self.config.REPLAY_ARCHIVE:
+            # Offline run over a recorded archive, no browser or LinkedIn login needed
+            print(f"Replaying recorded run from {self.config.REPLAY_ARCHIVE}")
+            self.driver = ReplayDriver(
+                self.config.REPLAY_ARCHIVE,
+                command_latency=self.config.REPLAY_COMMAND_LATENCY,
+                load_latency=self.config.REPLAY_LOAD_LATENCY
+            )
+            return self.driver
+        
         options = Options()
         
         # Profile and session persistence
@@ -104,6 +191,13 @@ class LinkedInJobScraper:
         
         return self.driver
 
+    def has_page(self, page):
+        """Check if the pagination lists a page"""
+        try:
+            return bool(self.driver.find_elements(By.CSS_SELECTOR, f"button[aria-label='Page {page}']"))
+        except Exception:
+            return False
+
     def run(self):
         """Main execution flow"""
         try:
@@ -114,14 +208,28 @@ class LinkedInJobScraper:
             # Login
             self.scraper.login(self.config.LINKEDIN_EMAIL, self.config.LINKEDIN_PASSWORD)
 
+            page = 1
+            total_jobs_processed = 0
+            start_url = self.config.JOB_ALERT_URL
+            resumed = self.checkpoint is not None and self.checkpoint.resumed
+            if resumed:
+                # Continue an interrupted run: restore its unsaved jobs and reopen its page
+                pending = self.checkpoint.pending_jobs()
+                for job in pending:
+                    self.data_manager.add_job(job)
+                page = self.checkpoint.page
+                total_jobs_processed = self.checkpoint.jobs_processed
+                start_url = self.checkpoint.page_url or start_url
+                print(f"Resuming interrupted run on page {page} after {total_jobs_processed} jobs "
+                      f"({len(pending)} unsaved jobs restored)")
+
             # Navigate to job search page
-            self.driver.get(self.config.JOB_ALERT_URL)
+            self.driver.get(start_url)
             time.sleep(1)
             self.scraper.wait_for_captcha()
 
-            page = 1
-            total_jobs_processed = 0
             wait = WebDriverWait(self.driver, 5)
+            complete = True
             
             while total_jobs_processed < self.config.MAX_PROCESS_JOBS:
                 print(f"\nProcessing page {page}")
@@ -145,26 +253,27 @@ class LinkedInJobScraper:
                     for i in range(processed_jobs, current_jobs_count):
                         if total_jobs_processed >= self.config.MAX_PROCESS_JOBS:
                             print(f"\nReached maximum job limit of {self.config.MAX_PROCESS_JOBS}")
-                            self.db_manager.upsert_jobs(self.data_manager.jobs) 
+                            if self.recorder is not None:
+                                self.recorder.record_page(self.driver, page)
+                            self.finish_run()
                             return
+                        
+                        # Jobs the interrupted run already processed are not opened again
+                        if resumed and self.checkpoint.is_processed(self.scraper.get_job_card_id(i)):
+                            continue
                             
                         print(f"Processing job {i + 1} of {current_jobs_count} (Total: {total_jobs_processed + 1})")
                         
-                        # Add delay before processing next job
-                        delay = random.uniform(0.5, 1.0)  # Random delay between 0.5-1 seconds
-                        # time.sleep(delay)
-                        
+                        # Paced by self.pacer, which adapts the delay between jobs to how fast details load
                         job_data, success = self.scraper.extract_job_details(i)
                         if not success:
                             print(f"Failed to extract job details for job {i + 1}")
                             continue
                         
-                        self.data_manager.add_job(job_data)
+                        added = self.data_manager.add_job(job_data)
                         total_jobs_processed += 1
-                        
-                        # Add delay after processing job
-                        delay = random.uniform(0.5, 1.0)  # Random delay between 0.5-1 seconds
-                        # time.sleep(delay)
+                        if self.checkpoint is not None:
+                            self.checkpoint.record_job(job_data, pending=added)
                     
                     processed_jobs = current_jobs_count
                     
@@ -190,6 +299,10 @@ class LinkedInJobScraper:
                 
                 print(f"Processed {processed_jobs} jobs on page {page}")
                 
+                # Record the fully loaded list pane for offline replay
+                if self.recorder is not None:
+                    self.recorder.record_page(self.driver, page)
+                
                 # Try to go to next page
                 try:
                     # Scroll back to top to ensure pagination is visible
@@ -238,17 +351,28 @@ class LinkedInJobScraper:
                     # Reset for new page
                     page += 1
                     processed_jobs = 0
+                    if self.checkpoint is not None:
+                        self.checkpoint.record_page(page, self.driver.current_url)
                     time.sleep(2)  # Increased wait time to ensure everything is ready
                     
                 except Exception as e:
                     print(f"\nError during page transition: {str(e)}")
+                    # With a next page still listed the run was cut short rather than finished
+                    complete = not self.has_page(page + 1)
                     break
 
             # Upsert all collected jobs to database
             print("\nSaving jobs to database...")
-            self.db_manager.upsert_jobs(self.data_manager.jobs)
+            self.finish_run(complete)
 
         finally:
+            if self.pacer is not None:
+                print(self.pacer.summary())
+            if self.checkpoint is not None:
+                self.checkpoint.close()
+            self.data_manager.close()
+            if self.recorder is not None:
+                self.recorder.close()
             self.driver.quit()
 
 if __name__ == "__main__":
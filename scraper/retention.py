@@ -0,0 +1,24 @@
+import argparse
+import time
+
+from src.config.config import Config
+from src.database.database_manager import DatabaseManager
+
+def main():
+    """Delete jobs older than the retention period, outside the scraper's startup path"""
+    config = Config()
+    parser = argparse.ArgumentParser(description="Delete jobs older than the retention period in bounded batches")
+    parser.add_argument('--days', type=float, default=config.RETENTION_DAYS, help='Retention period in days')
+    parser.add_argument('--batch-size', type=int, default=config.RETENTION_BATCH_SIZE, help='Jobs deleted per call')
+    parser.add_argument('--max-batches', type=int, default=config.RETENTION_MAX_BATCHES, help='Calls per run')
+    args = parser.parse_args()
+
+    db_manager = DatabaseManager(config.SUPABASE_URL, config.SUPABASE_KEY)
+    print(f"Deleting jobs older than {args.days:g} days...")
+    start = time.perf_counter()
+    deleted = db_manager.delete_old_jobs(args.days, args.batch_size, args.max_batches)
+    elapsed = time.perf_counter() - start
+    print(f"Deleted {deleted} jobs in {elapsed:.2f}s ({deleted / elapsed if elapsed else 0:.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
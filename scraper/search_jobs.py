@@ -0,0 +1,54 @@
+import argparse
+import time
+
+from src.config.config import Config
+from src.data.job_store import JobStore
+
+def main():
+    """Search the local job history written by the scraper, without the network"""
+    config = Config()
+    parser = argparse.ArgumentParser(description="Search the local history of scraped jobs")
+    parser.add_argument('keywords', nargs='?', help="Full-text query, e.g. 'python AND (aws OR gcp)'")
+    parser.add_argument('--title', help='Words that must appear in the title, in order')
+    parser.add_argument('--company', help='Words that must appear in the company name, in order')
+    parser.add_argument('--location', help='Words that must appear in the location, in order')
+    parser.add_argument('--days', type=float, help='Only jobs seen in the last days')
+    parser.add_argument('--limit', type=int, default=20, help='Maximum number of jobs listed')
+    parser.add_argument('--rank', action='store_true', help='Order by relevance instead of newest first')
+    parser.add_argument('--count', action='store_true', help='Only print the number of matching jobs')
+    parser.add_argument('--optimize', action='store_true', help='Merge the full-text index and exit')
+    parser.add_argument('--db', default=config.JOB_STORE, help='Job store file')
+    args = parser.parse_args()
+
+    if not args.db:
+        parser.error("No job store configured, set JOB_STORE or pass --db")
+
+    with JobStore(args.db) as store:
+        if args.optimize:
+            start = time.perf_counter()
+            store.optimize()
+            print(f"Optimized the full-text index in {time.perf_counter() - start:.2f}s")
+            return
+
+        filters = dict(keywords=args.keywords, title=args.title, company=args.company,
+                       location=args.location, days=args.days)
+        start = time.perf_counter()
+        try:
+            if args.count:
+                count = store.count(**filters)
+            else:
+                jobs = store.search(**filters, limit=args.limit, rank=args.rank)
+        except ValueError as e:
+            parser.error(str(e))
+        elapsed = (time.perf_counter() - start) * 1000
+
+        if args.count:
+            print(f"{count} jobs ({elapsed:.1f} ms)")
+            return
+        for job in jobs:
+            print(f"{job['first_seen'][:10]}  {job['title']} - {job['company']} ({job['location']})")
+            print(f"            {job['job_url']}")
+        print(f"\n{len(jobs)} jobs ({elapsed:.1f} ms)")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -42,10 +42,59 @@ class Config:
         self.CHROME_PROFILE = os.getenv('CHROME_PROFILE')
         self.SELENIUM_HOST = os.getenv('SELENIUM_HOST')
 
+        # Adaptive pacing of job detail loads (AIMD, in jobs per minute)
+        self.PACING_ENABLED = os.getenv('PACING_ENABLED', 'true').lower() == 'true'
+        self.PACING_INITIAL_RATE = float(os.getenv('PACING_INITIAL_RATE', 20))
+        self.PACING_MIN_RATE = float(os.getenv('PACING_MIN_RATE', 2))
+        self.PACING_MAX_RATE = float(os.getenv('PACING_MAX_RATE', 60))
+        self.PACING_SLOW_LOAD = float(os.getenv('PACING_SLOW_LOAD', 3))
+
+        # Near-duplicate detection (reposts of the same role under another URL)
+        self.NEAR_DUPLICATE_DETECTION = os.getenv('NEAR_DUPLICATE_DETECTION', 'true').lower() == 'true'
+        self.NEAR_DUPLICATE_INDEX = os.getenv(
+            'NEAR_DUPLICATE_INDEX',
+            str(Path(__file__).parents[2] / 'data' / 'near_duplicates.idx')
+        )
+        self.NEAR_DUPLICATE_THRESHOLD = float(os.getenv('NEAR_DUPLICATE_THRESHOLD', 0.8))
+        self.NEAR_DUPLICATE_MAX_AGE_DAYS = float(os.getenv('NEAR_DUPLICATE_MAX_AGE_DAYS', 7))
+
+        # Scraped jobs spilled to disk (Arrow IPC, empty keeps them in memory)
+        self.JOB_SPILL_FILE = os.getenv('JOB_SPILL_FILE', '')
+        self.JOB_BUFFER_SIZE = int(os.getenv('JOB_BUFFER_SIZE', 500))
+
+        # Local job history with full-text search (SQLite file, empty to disable)
+        self.JOB_STORE = os.getenv(
+            'JOB_STORE',
+            str(Path(__file__).parents[2] / 'data' / 'jobs.db')
+        )
+
+        # Offline recording / replay of the LinkedIn DOM (archive paths, empty to disable)
+        self.RECORD_ARCHIVE = os.getenv('RECORD_ARCHIVE', '')
+        self.REPLAY_ARCHIVE = os.getenv('REPLAY_ARCHIVE', '')
+        self.REPLAY_COMMAND_LATENCY = float(os.getenv('REPLAY_COMMAND_LATENCY', 0))
+        self.REPLAY_LOAD_LATENCY = float(os.getenv('REPLAY_LOAD_LATENCY', 0))
+
         # Supabase configuration
         self.SUPABASE_URL = os.getenv('SUPABASE_URL')
         self.SUPABASE_KEY = os.getenv('SUPABASE_KEY')
 
+        # Retention of old jobs (retention.py, run on its own schedule)
+        self.RETENTION_DAYS = float(os.getenv('RETENTION_DAYS', 1))
+        self.RETENTION_BATCH_SIZE = int(os.getenv('RETENTION_BATCH_SIZE', 5000))
+        self.RETENTION_MAX_BATCHES = int(os.getenv('RETENTION_MAX_BATCHES', 100))
+
+        # Checkpoint of the current run, resumed by the next run of the same search (empty to disable)
+        self.RUN_CHECKPOINT = os.getenv(
+            'RUN_CHECKPOINT',
+            str(Path(__file__).parents[2] / 'data' / 'run_checkpoint.json')
+        )
+        self.RUN_CHECKPOINT_MAX_AGE_HOURS = float(os.getenv('RUN_CHECKPOINT_MAX_AGE_HOURS', 12))
+
+        # Checksums of the applied migrations, cached locally between runs
+        self.MIGRATION_MANIFEST = os.getenv('MIGRATION_MANIFEST') or str(
+            Path(__file__).parents[2] / 'data' / 'migrations.json'
+        )
+
     def validate(self):
         """Validate that all required configuration is present"""
         required_fields = [
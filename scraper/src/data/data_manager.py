@@ -1,30 +1,118 @@
 import csv
 from datetime import datetime
-from typing import List
+from typing import Iterator, List, Optional
+from job_assistant_models import JobBatch
 from ..scraper.job_data import EnhancedJobData
+from .job_spill import CSV_FIELDS, JobSpill
+from .job_store import JobStore
+from .near_duplicates import NearDuplicateIndex
 
 class DataManager:
-    def __init__(self):
-        self.jobs: List[EnhancedJobData] = []
+    def __init__(self, near_duplicates: Optional[NearDuplicateIndex] = None, spill_path: Optional[str] = None,
+                 buffer_size: int = 500, store_path: Optional[str] = None):
+        """
+        Args:
+            near_duplicates: Index used to suppress near-duplicate postings, if any
+            spill_path: File to spill jobs to (Arrow IPC, requires pyarrow), keeping
+                        at most buffer_size jobs in memory; None keeps every job in memory
+            buffer_size: Jobs buffered in memory between writes to the spill file and the job store
+            store_path: Local SQLite job history with full-text search that every added job is
+                        also written to, None to keep no history
+        """
+        self.spill = JobSpill(spill_path, buffer_size) if spill_path else None
+        self.job_store = JobStore(store_path, buffer_size) if store_path else None
+        self._jobs: List[EnhancedJobData] = []
+        self.near_duplicates = near_duplicates
+        self.suppressed_duplicates = 0
 
-    def add_job(self, job: EnhancedJobData):
-        """Add a job to the collection"""
-        self.jobs.append(job)
+    @property
+    def jobs(self) -> List[EnhancedJobData]:
+        """Every collected job as a list (read back from the spill file if there is one)"""
+        if self.spill is None:
+            return self._jobs
+        return [job for chunk in self.spill.iter_batches() for job in chunk]
+
+    def __len__(self) -> int:
+        return len(self.spill) if self.spill is not None else len(self._jobs)
+
+    def add_job(self, job: EnhancedJobData) -> bool:
+        """
+        Add a job to the collection
+        
+        Near duplicates of an already indexed posting (reposts under another
+        URL) are dropped here, so they are never stored, sent in a webhook or
+        evaluated by the AI.
+        
+        Returns:
+            Whether the job was added
+        """
+        if self.near_duplicates is not None and job.job_url != "Not available":
+            duplicate = self.near_duplicates.check(job.job_url, job.title, job.company, job.description)
+            if duplicate is not None:
+                duplicate_url, similarity = duplicate
+                print(f"Skipping near duplicate of {duplicate_url} (similarity {similarity:.2f}): {job.job_url}")
+                self.suppressed_duplicates += 1
+                return False
+        
+        if self.spill is not None:
+            self.spill.append(job)
+        else:
+            self._jobs.append(job)
+        if self.job_store is not None:
+            self.job_store.add(job)
+        return True
+
+    def iter_batches(self, size: int = 500) -> Iterator[List[EnhancedJobData]]:
+        """
+        Collected jobs in insertion order, in lists of at most size jobs
+        
+        With a spill file only one list is materialized at a time.
+        """
+        if self.spill is not None:
+            yield from self.spill.iter_batches(size)
+            return
+        for start in range(0, len(self._jobs), size):
+            yield self._jobs[start:start + size]
+
+    def to_batch(self) -> JobBatch:
+        """Get the collected jobs as a columnar JobBatch"""
+        return JobBatch.from_records(job for chunk in self.iter_batches() for job in chunk)
 
     def save_to_csv(self, filename=None):
         """Save jobs to CSV file"""
         if filename is None:
             filename = f"linkedin_jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         
-        fieldnames = ['title', 'job_url', 'company', 'location', 'posted_time', 
-                     'applicants', 'description']
+        try:
+            if self.spill is not None:
+                self.spill.export_csv(filename)
+            else:
+                with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+                    writer = csv.writer(csvfile)
+                    writer.writerow(CSV_FIELDS)
+                    writer.writerows([getattr(job, name) for name in CSV_FIELDS] for job in self._jobs)
+            print(f"\nJob details successfully saved to {filename}")
+        except Exception as e:
+            print(f"Error saving to CSV: {str(e)}")
+
+    def save_to_parquet(self, filename=None):
+        """Save jobs to a Parquet file (requires pyarrow), streamed from the spill file if there is one"""
+        if filename is None:
+            filename = f"linkedin_jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.parquet"
         
         try:
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                for job in self.jobs:
-                    writer.writerow(job.__dict__)
+            if self.spill is not None:
+                self.spill.export_parquet(filename)
+            else:
+                import pyarrow.parquet as pq
+                pq.write_table(self.to_batch().to_arrow(), filename, compression='zstd')
             print(f"\nJob details successfully saved to {filename}")
         except Exception as e:
-            print(f"Error saving to CSV: {str(e)}") 
\ No newline at end of file
+            print(f"Error saving to Parquet: {str(e)}")
+
+    def close(self):
+        """Finish the spill file, if any (it stays readable with read_spill), and the job store"""
+        if self.spill is not None:
+            self.spill.close()
+        if self.job_store is not None:
+            self.job_store.close()
\ No newline at end of file
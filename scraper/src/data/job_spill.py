@@ -0,0 +1,170 @@
+import csv
+import os
+from typing import Iterator, List, Optional, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from ..scraper.job_data import EnhancedJobData
+
+# Job fields kept in the spill file, all as UTF-8 strings; description_html is
+# kept so the original markup can still be archived when the jobs are saved
+SPILL_FIELDS = ('id', 'job_url', 'title', 'company', 'location', 'posted_time', 'applicants',
+                'description', 'description_html', 'created_at', 'updated_at', 'content_hash')
+
+# Columns written by CSV exports
+CSV_FIELDS = ('title', 'job_url', 'company', 'location', 'posted_time', 'applicants', 'description')
+
+def _spill_schema():
+    return pa.schema([(name, pa.string()) for name in SPILL_FIELDS])
+
+def read_spill(path: str):
+    """
+    Open a spill file for analysis without loading it into memory
+
+    The file is memory-mapped, so the columns of the returned table point
+    into the page cache and are only read when they are accessed.
+
+    Args:
+        path: Spill file written by JobSpill
+
+    Returns:
+        pyarrow.Table of the spilled jobs, SPILL_FIELDS as string columns
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required to read job spill files")
+    return pa.ipc.open_stream(pa.memory_map(path)).read_all()
+
+class JobSpill:
+    """
+    Append-only on-disk store of scraped jobs
+
+    Jobs are buffered in memory and written to an Arrow IPC stream file as
+    one record batch per buffer_size jobs, so memory use is bounded by the
+    buffer however long the run is. Batches are read back from a memory map
+    of the file, one at a time.
+    """
+
+    def __init__(self, path: str, buffer_size: int = 500):
+        """
+        Create an empty spill, replacing any existing file at path
+
+        Args:
+            path: Spill file (Arrow IPC stream format)
+            buffer_size: Jobs kept in memory before a record batch is written
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required to spill jobs to disk")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.buffer_size = buffer_size
+        self.schema = _spill_schema()
+        self._buffer: List[EnhancedJobData] = []
+        self._sink = pa.OSFile(path, 'wb')
+        self._writer = pa.ipc.new_stream(self._sink, self.schema)
+        self._spilled = 0
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._buffer)
+
+    def append(self, job: EnhancedJobData):
+        self._buffer.append(job)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered jobs to the file as one record batch"""
+        if not self._buffer or self._writer is None:
+            return
+        columns = {name: [] for name in SPILL_FIELDS}
+        for job in self._buffer:
+            for name in SPILL_FIELDS:
+                value = getattr(job, name, None)
+                columns[name].append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        self._writer.write_batch(pa.record_batch([pa.array(columns[name], pa.string()) for name in SPILL_FIELDS],
+                                                 schema=self.schema))
+        self._sink.flush()
+        self._spilled += len(self._buffer)
+        self._buffer = []
+
+    def iter_record_batches(self) -> Iterator['pa.RecordBatch']:
+        """Record batches of every job so far, read from the file one at a time"""
+        self.flush()
+        if not self._spilled:
+            return
+        # Read rather than memory-mapped, so the pages of batches already
+        # consumed are not kept resident for the rest of the iteration
+        with pa.OSFile(self.path) as source:
+            yield from pa.ipc.open_stream(source)
+
+    def iter_batches(self, size: Optional[int] = None) -> Iterator[List[EnhancedJobData]]:
+        """
+        Jobs in insertion order, in lists of at most size jobs
+
+        Only one record batch is converted back to job objects at a time.
+
+        Args:
+            size: Jobs per list, defaults to buffer_size
+        """
+        size = size or self.buffer_size
+        chunk = []
+        for batch in self.iter_record_batches():
+            for row in batch.to_pylist():
+                description_html = row.pop('description_html')
+                chunk.append(EnhancedJobData(row, description_html=description_html))
+                if len(chunk) >= size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+    def export_csv(self, filename: str, fieldnames: Sequence[str] = CSV_FIELDS) -> int:
+        """
+        Stream the jobs to a CSV file, one record batch at a time
+
+        Returns:
+            Number of jobs written
+        """
+        count = 0
+        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(fieldnames)
+            for batch in self.iter_record_batches():
+                columns = [batch.column(name).to_pylist() for name in fieldnames]
+                writer.writerows(zip(*columns))
+                count += batch.num_rows
+        return count
+
+    def export_parquet(self, filename: str, compression: str = 'zstd') -> int:
+        """
+        Stream the jobs to a Parquet file, one row group per record batch
+
+        Returns:
+            Number of jobs written
+        """
+        count = 0
+        with pq.ParquetWriter(filename, self.schema, compression=compression) as writer:
+            for batch in self.iter_record_batches():
+                writer.write_batch(batch)
+                count += batch.num_rows
+        return count
+
+    def table(self):
+        """Memory-mapped pyarrow.Table of every job so far"""
+        self.flush()
+        return read_spill(self.path)
+
+    def close(self):
+        """Write the remaining jobs and close the file; it can still be read with read_spill"""
+        if self._writer is None:
+            return
+        self.flush()
+        self._writer.close()
+        self._sink.close()
+        self._writer = None
\ No newline at end of file
@@ -0,0 +1,228 @@
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from ..scraper.job_data import EnhancedJobData
+
+# Columns of the full-text index, in the order they are indexed
+SEARCH_COLUMNS = ('title', 'company', 'location', 'description')
+
+# Columns stored for every job, besides the id and the first_seen / last_seen timestamps
+STORED_COLUMNS = ('job_url', 'title', 'company', 'location', 'posted_time', 'applicants', 'description',
+                  'content_hash')
+
+_SCHEMA = """
+create table if not exists jobs (
+    id integer primary key,
+    job_url text not null unique,
+    title text,
+    company text,
+    location text,
+    posted_time text,
+    applicants text,
+    description text,
+    content_hash text,
+    first_seen text not null,
+    last_seen text not null
+);
+
+create index if not exists jobs_last_seen_idx on jobs (last_seen);
+
+-- External content table: the text lives in jobs, the index only holds tokens
+create virtual table if not exists jobs_fts using fts5(
+    title, company, location, description,
+    content='jobs', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+create trigger if not exists jobs_fts_insert after insert on jobs begin
+    insert into jobs_fts (rowid, title, company, location, description)
+    values (new.id, new.title, new.company, new.location, new.description);
+end;
+
+-- Rescrapes of an unchanged posting only move last_seen and are not reindexed
+create trigger if not exists jobs_fts_update after update on jobs
+when old.content_hash is not new.content_hash begin
+    insert into jobs_fts (jobs_fts, rowid, title, company, location, description)
+    values ('delete', old.id, old.title, old.company, old.location, old.description);
+    insert into jobs_fts (rowid, title, company, location, description)
+    values (new.id, new.title, new.company, new.location, new.description);
+end;
+
+create trigger if not exists jobs_fts_delete after delete on jobs begin
+    insert into jobs_fts (jobs_fts, rowid, title, company, location, description)
+    values ('delete', old.id, old.title, old.company, old.location, old.description);
+end;
+"""
+
+_UPSERT = f"""
+insert into jobs ({', '.join(STORED_COLUMNS)}, first_seen, last_seen)
+values ({', '.join('?' for _ in STORED_COLUMNS)}, ?, ?)
+on conflict (job_url) do update set
+    {', '.join(f'{name} = excluded.{name}' for name in STORED_COLUMNS[1:])},
+    last_seen = excluded.last_seen
+"""
+
+def _phrase(text: str) -> str:
+    """FTS5 string matching the words of text in order, whatever punctuation it contains"""
+    return '"' + text.replace('"', '""') + '"'
+
+class JobStore:
+    """
+    Local SQLite history of scraped jobs with a full-text index
+
+    Supabase only keeps the last day of jobs; this store keeps every job
+    the scraper has seen, keyed by job_url, so history can be searched
+    offline (see search_jobs.py). Title, company, location and description
+    are indexed with FTS5 and kept in sync by triggers. A job scraped again
+    with the same content_hash only has its last_seen updated.
+
+    Jobs are buffered and written buffer_size at a time, one transaction
+    per write.
+    """
+
+    def __init__(self, path: str, buffer_size: int = 500):
+        """
+        Open the store, creating the file and schema if needed
+
+        Args:
+            path: SQLite database file
+            buffer_size: Jobs buffered by add before they are written
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.buffer_size = buffer_size
+        self._buffer: List[EnhancedJobData] = []
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute('pragma journal_mode = wal')
+        self.connection.execute('pragma synchronous = normal')
+        self.connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> 'JobStore':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add(self, job: EnhancedJobData):
+        """Buffer a job, writing the buffer once it holds buffer_size jobs"""
+        self._buffer.append(job)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered jobs"""
+        if self._buffer:
+            self.add_jobs(self._buffer)
+            self._buffer = []
+
+    def add_jobs(self, jobs: Iterable[EnhancedJobData], seen_at: Optional[str] = None) -> int:
+        """
+        Insert or update jobs by job_url in one transaction
+
+        Args:
+            jobs: Scraped jobs; jobs without a URL are skipped
+            seen_at: ISO timestamp recorded as last_seen (and first_seen of new jobs), defaults to now
+
+        Returns:
+            Number of jobs written
+        """
+        seen_at = seen_at or datetime.now(timezone.utc).isoformat(timespec='seconds')
+        rows = []
+        for job in jobs:
+            if not job.job_url or job.job_url == "Not available":
+                continue
+            data = job.to_supabase_format()
+            rows.append(tuple(data[name] for name in STORED_COLUMNS) + (seen_at, seen_at))
+        with self.connection:
+            self.connection.executemany(_UPSERT, rows)
+        return len(rows)
+
+    def _filters(self, keywords: Optional[str], title: Optional[str], company: Optional[str],
+                 location: Optional[str], days: Optional[float]) -> Tuple[Optional[str], List[str], list]:
+        """FTS5 match expression, extra conditions and their parameters for a search"""
+        terms = [f"({keywords})"] if keywords else []
+        for column, value in (('title', title), ('company', company), ('location', location)):
+            if value:
+                terms.append(f"{column} : {_phrase(value)}")
+        conditions, params = [], []
+        if days is not None:
+            since = datetime.now(timezone.utc) - timedelta(days=days)
+            conditions.append('jobs.last_seen >= ?')
+            params.append(since.isoformat(timespec='seconds'))
+        return (' AND '.join(terms) or None), conditions, params
+
+    def _execute(self, sql: str, params: list, keywords: Optional[str]):
+        try:
+            return self.connection.execute(sql, params)
+        except sqlite3.OperationalError as e:
+            if keywords and 'fts5' in str(e):
+                raise ValueError(f"Invalid search query {keywords!r}: {str(e)}")
+            raise
+
+    def search(self, keywords: Optional[str] = None, title: Optional[str] = None, company: Optional[str] = None,
+               location: Optional[str] = None, days: Optional[float] = None, limit: int = 20,
+               rank: bool = False) -> List[dict]:
+        """
+        Search the stored jobs
+
+        Args:
+            keywords: FTS5 query over every indexed column, e.g. 'python AND (aws OR gcp)'
+            title: Words that must appear in this order in the title
+            company: Words that must appear in this order in the company name
+            location: Words that must appear in this order in the location
+            days: Only jobs seen in the last days
+            limit: Maximum number of jobs returned
+            rank: Order by relevance (bm25) instead of newest first
+
+        Returns:
+            Job rows as dictionaries, newest first unless rank is set
+
+        Raises:
+            ValueError: If keywords is not a valid FTS5 query
+        """
+        self.flush()
+        match, conditions, params = self._filters(keywords, title, company, location, days)
+        if match is None:
+            where = f"where {' and '.join(conditions)}" if conditions else ''
+            sql = f"select * from jobs {where} order by id desc limit ?"
+        else:
+            # Newest first walks the index in rowid order and stops at the limit
+            order = 'jobs_fts.rank' if rank else 'jobs_fts.rowid desc'
+            where = ' '.join(f"and {condition}" for condition in conditions)
+            sql = (f"select jobs.* from jobs_fts join jobs on jobs.id = jobs_fts.rowid "
+                   f"where jobs_fts match ? {where} order by {order} limit ?")
+            params = [match] + params
+        return [dict(row) for row in self._execute(sql, params + [limit], keywords)]
+
+    def count(self, keywords: Optional[str] = None, title: Optional[str] = None, company: Optional[str] = None,
+              location: Optional[str] = None, days: Optional[float] = None) -> int:
+        """Number of stored jobs matching a search (same arguments as search)"""
+        self.flush()
+        match, conditions, params = self._filters(keywords, title, company, location, days)
+        if match is None:
+            where = f"where {' and '.join(conditions)}" if conditions else ''
+            sql = f"select count(*) from jobs {where}"
+        else:
+            where = ' '.join(f"and {condition}" for condition in conditions)
+            sql = (f"select count(*) from jobs_fts join jobs on jobs.id = jobs_fts.rowid "
+                   f"where jobs_fts match ? {where}")
+            params = [match] + params
+        return self._execute(sql, params, keywords).fetchone()[0]
+
+    def optimize(self):
+        """Merge the full-text index into one segment, which speeds up queries after bulk loads"""
+        self.flush()
+        with self.connection:
+            self.connection.execute("insert into jobs_fts (jobs_fts) values ('optimize')")
+
+    def close(self):
+        """Write the buffered jobs and close the database"""
+        if self.connection is None:
+            return
+        self.flush()
+        self.connection.close()
+        self.connection = None
@@ -0,0 +1,275 @@
+import os
+import pickle
+import re
+import time
+import zlib
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+# Signature values are 32-bit; empty bins hold this until densification
+_EMPTY = 0xFFFFFFFF
+
+INDEX_FORMAT_VERSION = 1
+
+def normalize_text(text: Optional[str]) -> List[str]:
+    """Lowercase words of a text, without punctuation or markdown markers"""
+    if not text:
+        return []
+    return re.findall(r'[a-z0-9]+', text.casefold())
+
+class NearDuplicateIndex:
+    """
+    MinHash / LSH index of job postings for near-duplicate detection
+
+    Signatures use one-permutation MinHash: every word shingle of the
+    normalized title, company and description is hashed once and the
+    minimum is kept per hash bin, with empty bins filled from their
+    neighbours. This keeps signing at one hash per shingle, so no NumPy is
+    needed. Signatures are split into bands for LSH; postings sharing a
+    band are candidates and are confirmed by estimated Jaccard similarity.
+
+    The index is persisted locally with pickle and pruned by age, matching
+    the retention of the jobs table.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 16, threshold: float = 0.8, shingle_size: int = 3):
+        """
+        Create an empty index
+
+        Args:
+            num_perm: Signature length (number of hash bins)
+            bands: Number of LSH bands, must divide num_perm
+            threshold: Estimated Jaccard similarity at which postings are duplicates
+            shingle_size: Words per shingle
+        """
+        if num_perm % bands:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+
+        self.signatures: Dict[str, bytes] = {}
+        self.added_at: Dict[str, float] = {}
+        self.buckets: List[Dict[bytes, List[str]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.signatures
+
+    def signature(self, title: Optional[str], company: Optional[str], description: Optional[str]) -> bytes:
+        """
+        Compute the MinHash signature of a posting
+
+        Args:
+            title: Job title
+            company: Company name
+            description: Job description
+
+        Returns:
+            Signature as packed 32-bit values
+        """
+        words = normalize_text(title) + ['|'] + normalize_text(company) + ['|'] + normalize_text(description)
+        size = self.shingle_size
+        num_perm = self.num_perm
+
+        mins = [_EMPTY] * num_perm
+        crc32 = zlib.crc32
+
+        # A shingle's hash is the CRC of its words chained together, so every word is
+        # encoded once and no shingle strings are built
+        encoded = [word.encode('utf-8') + b' ' for word in words]
+        if len(encoded) < size:
+            encoded += [b''] * (size - len(encoded))
+        if size == 3:
+            values = {crc32(c, crc32(b, crc32(a))) for a, b, c in zip(encoded, encoded[1:], encoded[2:])}
+        else:
+            values = set()
+            for shingle in zip(*(encoded[offset:] for offset in range(size))):
+                value = 0
+                for part in shingle:
+                    value = crc32(part, value)
+                values.add(value)
+
+        for value in values:
+            slot = value % num_perm
+            if value < mins[slot]:
+                mins[slot] = value
+
+        # Densify: an empty bin takes the value of the next non-empty bin, rehashed with
+        # the distance to it so that neighbouring empty bins do not all collide
+        if _EMPTY in mins:
+            filled = next((i for i, value in enumerate(mins) if value != _EMPTY), None)
+            if filled is not None:
+                source, distance = mins[filled], 0
+                for step in range(1, num_perm):
+                    i = (filled - step) % num_perm
+                    if mins[i] == _EMPTY:
+                        distance += 1
+                        mins[i] = crc32(source.to_bytes(4, 'little'), distance)
+                    else:
+                        source, distance = mins[i], 0
+
+        return array('I', mins).tobytes()
+
+    def _band_keys(self, signature: bytes) -> List[bytes]:
+        width = self.rows * 4
+        return [signature[band * width:(band + 1) * width] for band in range(self.bands)]
+
+    def similarity(self, first: bytes, second: bytes) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        a, b = array('I', first), array('I', second)
+        return sum(1 for x, y in zip(a, b) if x == y) / self.num_perm
+
+    def query(self, signature: bytes, exclude: str = None) -> List[Tuple[str, float]]:
+        """
+        Find indexed postings similar to a signature
+
+        Args:
+            signature: Signature to look up
+            exclude: Key to leave out of the results (e.g. the posting itself)
+
+        Returns:
+            (key, estimated similarity) pairs at or above the threshold, most similar first
+        """
+        candidates = set()
+        for bucket, band_key in zip(self.buckets, self._band_keys(signature)):
+            keys = bucket.get(band_key)
+            if keys:
+                candidates.update(keys)
+        candidates.discard(exclude)
+
+        matches = []
+        for key in candidates:
+            score = self.similarity(signature, self.signatures[key])
+            if score >= self.threshold:
+                matches.append((key, score))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+    def add(self, key: str, signature: bytes, added_at: float = None):
+        """
+        Add (or replace) a posting
+
+        Args:
+            key: Posting key, e.g. the job URL
+            signature: Posting signature
+            added_at: Unix time the posting was seen, defaults to now
+        """
+        if key in self.signatures:
+            self.remove(key)
+
+        self.signatures[key] = signature
+        self.added_at[key] = added_at if added_at is not None else time.time()
+        for bucket, band_key in zip(self.buckets, self._band_keys(signature)):
+            bucket.setdefault(band_key, []).append(key)
+
+    def remove(self, key: str):
+        """Remove a posting from the index"""
+        signature = self.signatures.pop(key, None)
+        if signature is None:
+            return
+        self.added_at.pop(key, None)
+        for bucket, band_key in zip(self.buckets, self._band_keys(signature)):
+            keys = bucket.get(band_key)
+            if keys:
+                keys.remove(key)
+                if not keys:
+                    del bucket[band_key]
+
+    def check(self, key: str, title: str, company: str, description: str) -> Optional[Tuple[str, float]]:
+        """
+        Check a posting against the index and add it if it is not a duplicate
+
+        A posting already indexed under the same key is not its own duplicate.
+
+        Args:
+            key: Posting key, e.g. the job URL
+            title: Job title
+            company: Company name
+            description: Job description
+
+        Returns:
+            (key of the most similar indexed posting, similarity) if the posting is
+            a near duplicate, otherwise None
+        """
+        signature = self.signature(title, company, description)
+        matches = self.query(signature, exclude=key)
+        if matches:
+            return matches[0]
+        self.add(key, signature)
+        return None
+
+    def prune(self, max_age_days: float) -> int:
+        """
+        Remove postings added more than max_age_days ago
+
+        Args:
+            max_age_days: Maximum age in days
+
+        Returns:
+            Number of postings removed
+        """
+        cutoff = time.time() - max_age_days * 86400
+        expired = [key for key, added_at in self.added_at.items() if added_at < cutoff]
+        for key in expired:
+            self.remove(key)
+        return len(expired)
+
+    def save(self, path: str):
+        """Write the index to a file, replacing it atomically"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        state = {
+            'version': INDEX_FORMAT_VERSION,
+            'params': (self.num_perm, self.bands, self.shingle_size),
+            'signatures': self.signatures,
+            'added_at': self.added_at
+        }
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str, **params) -> 'NearDuplicateIndex':
+        """
+        Load an index written by save, or create an empty one
+
+        The LSH buckets are rebuilt from the signatures. If the file was
+        written with a different num_perm, bands or shingle_size it is
+        discarded, since its signatures are not comparable. The threshold
+        only applies to queries, so it is taken from params.
+
+        Args:
+            path: Index file
+            **params: Constructor parameters
+
+        Returns:
+            NearDuplicateIndex
+        """
+        index = cls(**params)
+        if not os.path.exists(path):
+            return index
+
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+        except Exception as e:
+            print(f"Error loading near-duplicate index, starting empty: {str(e)}")
+            return index
+
+        expected = (index.num_perm, index.bands, index.shingle_size)
+        if state.get('version') != INDEX_FORMAT_VERSION or tuple(state.get('params', ())) != expected:
+            print("Near-duplicate index was built with different parameters, starting empty")
+            return index
+
+        added_at = state['added_at']
+        for key, signature in state['signatures'].items():
+            index.add(key, signature, added_at.get(key))
+        return index
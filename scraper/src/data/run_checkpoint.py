@@ -0,0 +1,221 @@
+import json
+import os
+import time
+from typing import List, Optional
+
+from ..scraper.job_data import EnhancedJobData
+
+CHECKPOINT_FORMAT_VERSION = 1
+
+class RunCheckpoint:
+    """
+    Progress of a scraper run, persisted so an interrupted run can resume
+
+    Every processed job is appended to a JSON lines journal (path + '.jobs'):
+    its ID, and the job itself if it is waiting to be saved to Supabase. The
+    state (search URL, page and its URL, IDs of the processed jobs and how
+    many jobs the run processed) is a small JSON file, replaced atomically
+    when the run moves on to another page and when the collected jobs are
+    saved, which also empties the journal. Recording a job is a single
+    append, however many jobs the run already processed.
+
+    On resume the IDs in the journal are added to those in the state; a
+    line cut short by a crash is ignored. A checkpoint is only resumed by a
+    run of the same search URL started within max_age_hours of the
+    interrupted one; otherwise it is discarded and the run starts from the
+    first page.
+    """
+
+    def __init__(self, path: str, search_url: str):
+        """
+        Start a new checkpoint (nothing is written until the first job)
+
+        Args:
+            path: State file; the journal is written to path + '.jobs'
+            search_url: Job search URL of the run
+        """
+        self.path = path
+        self.journal_path = f"{path}.jobs"
+        self.search_url = search_url
+        self.started_at = time.time()
+        self.page = 1
+        self.page_url: Optional[str] = None
+        self.processed_ids: List[str] = []
+        self._processed = set()
+        self.jobs_processed = 0
+        self.journal_size = 0
+        self._state_saved = False
+        self.resumed = False
+        self._journal = None
+
+    @classmethod
+    def load(cls, path: str, search_url: str, max_age_hours: float) -> 'RunCheckpoint':
+        """
+        Resume the checkpoint at path if it belongs to the same search window, or start a new one
+
+        Args:
+            path: State file
+            search_url: Job search URL of this run
+            max_age_hours: How long after an interrupted run started it can still be resumed
+
+        Returns:
+            RunCheckpoint, with resumed set if the saved state was loaded
+        """
+        checkpoint = cls(path, search_url)
+        if not os.path.exists(path):
+            return checkpoint
+
+        try:
+            with open(path, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Discarding unreadable run checkpoint {path}: {str(e)}")
+            checkpoint.clear()
+            return checkpoint
+
+        if (state.get('version') != CHECKPOINT_FORMAT_VERSION or state.get('search_url') != search_url
+                or time.time() - state.get('started_at', 0) > max_age_hours * 3600):
+            print("Discarding run checkpoint of another search or an expired search window")
+            checkpoint.clear()
+            return checkpoint
+
+        checkpoint.started_at = state['started_at']
+        checkpoint.page = state['page']
+        checkpoint.page_url = state['page_url']
+        checkpoint.processed_ids = state['processed_ids']
+        checkpoint._processed = set(checkpoint.processed_ids)
+        checkpoint.jobs_processed = state['jobs_processed']
+
+        # Jobs journaled after the state was written are not in its count yet
+        offset = 0
+        for line in checkpoint._journal_lines():
+            checkpoint._add_processed(json.loads(line)['id'])
+            if offset >= state['journal_size']:
+                checkpoint.jobs_processed += 1
+            offset += len(line)
+        checkpoint.journal_size = offset
+        checkpoint._state_saved = True
+        checkpoint.resumed = True
+        return checkpoint
+
+    @staticmethod
+    def job_id(job_url: str) -> str:
+        """LinkedIn job ID of a job URL"""
+        return job_url.rstrip('/').rsplit('/', 1)[-1]
+
+    def is_processed(self, job_id: Optional[str]) -> bool:
+        return job_id is not None and job_id in self._processed
+
+    def _add_processed(self, job_id: str):
+        if job_id not in self._processed:
+            self._processed.add(job_id)
+            self.processed_ids.append(job_id)
+
+    def _journal_lines(self) -> List[bytes]:
+        """Complete lines of the journal, up to a line a crash cut short"""
+        if not os.path.exists(self.journal_path):
+            return []
+        with open(self.journal_path, 'rb') as f:
+            data = f.read()
+
+        lines = []
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b'\n'):
+                break
+            try:
+                json.loads(line)
+            except ValueError:
+                break
+            lines.append(line)
+        return lines
+
+    def pending_jobs(self) -> List[EnhancedJobData]:
+        """Jobs of the interrupted run that were collected but not saved"""
+        jobs = []
+        for line in self._journal_lines():
+            record = json.loads(line)
+            if 'job' in record:
+                job = record['job']
+                description_html = job.pop('description_html', None)
+                jobs.append(EnhancedJobData(job, description_html=description_html))
+        return jobs
+
+    def _open_journal(self):
+        if self._journal is None:
+            directory = os.path.dirname(os.path.abspath(self.journal_path))
+            os.makedirs(directory, exist_ok=True)
+            # Drop anything after the complete lines, e.g. a line a crash cut short
+            self._journal = open(self.journal_path, 'ab')
+            self._journal.truncate(self.journal_size)
+        return self._journal
+
+    def record_job(self, job: EnhancedJobData, pending: bool = True):
+        """
+        Record a processed job
+
+        Args:
+            job: Scraped job
+            pending: Whether the job is waiting to be saved (False if it was dropped, e.g. as a near duplicate)
+        """
+        job_id = self.job_id(job.job_url)
+        record = {'id': job_id}
+        if pending:
+            record['job'] = dict(job.to_dict(), description_html=job.description_html)
+        line = json.dumps(record, separators=(',', ':')).encode('utf-8') + b'\n'
+
+        journal = self._open_journal()
+        journal.write(line)
+        journal.flush()
+        self.journal_size += len(line)
+
+        self._add_processed(job_id)
+        self.jobs_processed += 1
+        if not self._state_saved:
+            # The journal is only resumed along with a state file
+            self.save()
+
+    def record_page(self, page: int, page_url: str):
+        """Record that the run moved on to a page"""
+        self.page = page
+        self.page_url = page_url
+        self.save()
+
+    def flushed(self):
+        """Record that the pending jobs were saved, emptying the journal"""
+        self._open_journal().truncate(0)
+        self.journal_size = 0
+        self.save()
+
+    def save(self):
+        """Write the state, replacing the file atomically"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        state = {
+            'version': CHECKPOINT_FORMAT_VERSION,
+            'search_url': self.search_url,
+            'started_at': self.started_at,
+            'page': self.page,
+            'page_url': self.page_url,
+            'processed_ids': self.processed_ids,
+            'jobs_processed': self.jobs_processed,
+            'journal_size': self.journal_size
+        }
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, separators=(',', ':'))
+        os.replace(temp_path, self.path)
+        self._state_saved = True
+
+    def close(self):
+        """Close the journal; the checkpoint stays on disk for the next run"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def clear(self):
+        """Remove the checkpoint once the run completed"""
+        self.close()
+        for path in (self.path, self.journal_path):
+            if os.path.exists(path):
+                os.remove(path)
@@ -1,13 +1,18 @@
 import os
 from supabase import create_client
-from typing import List
+from typing import Any, Dict, Iterator, List, Sequence
 from ..scraper.job_data import EnhancedJobData
 from .migrations.migration_manager import MigrationManager
 
+# Columns of the lightweight job listing: which jobs exist and whether their content changed
+JOB_KEY_COLUMNS = ('id', 'job_url', 'content_hash', 'created_at')
+
 class DatabaseManager:
-    def __init__(self, supabase_url: str, supabase_key: str):
+    def __init__(self, supabase_url: str, supabase_key: str, migration_manifest: str = None):
+        self.supabase_url = supabase_url
         self.supabase = create_client(supabase_url, supabase_key)
-        self.migration_manager = MigrationManager(self)
+        # Local cache of applied migration checksums, so unchanged startups need a single query
+        self.migration_manager = MigrationManager(self, migration_manifest)
 
     def initialize_database(self):
         """Initialize database and run any pending migrations"""
@@ -15,45 +20,123 @@ class DatabaseManager:
             print("Running database migrations...")
             self.migration_manager.run_migrations()
             
-            # Call delete_old_jobs function after migrations
-            print("Cleaning up old jobs...")
-            self.supabase.rpc('delete_old_jobs').execute()
-            
+            # Old jobs are deleted by the retention job (retention.py), not on startup
             print("Database initialization complete")
         except Exception as e:
             print(f"Error initializing database: {str(e)}")
             raise
 
+    def delete_old_jobs(self, retention_days: float = 1, batch_size: int = 5000, max_batches: int = 100) -> int:
+        """
+        Delete jobs older than the retention period in bounded batches
+
+        Each batch is one delete_old_jobs_batch call, and so one short
+        transaction, using the created_at index. Batches stop when one
+        deletes fewer than batch_size rows or after max_batches; the rest
+        is left for the next run.
+
+        Args:
+            retention_days: Age in days after which jobs are deleted
+            batch_size: Maximum jobs deleted per call
+            max_batches: Maximum calls per run
+
+        Returns:
+            Number of jobs deleted
+        """
+        total = 0
+        for _ in range(max_batches):
+            result = self.supabase.rpc('delete_old_jobs_batch', {
+                'batch_size': batch_size,
+                'retention': f"{retention_days} days"
+            }).execute()
+            deleted = result.data or 0
+            total += deleted
+            if deleted < batch_size:
+                break
+        return total
+
     def upsert_jobs(self, jobs: List[EnhancedJobData]):
         """
         Upsert job data into Supabase database.
         Uses job_url as the unique identifier.
+        
+        Jobs go through the upsert_jobs_if_changed function, which only
+        writes new jobs and jobs whose content_hash changed, so rescraped
+        jobs do not trigger UPDATE webhooks.
         """
         try:
-            # Convert jobs to list of dictionaries and remove duplicates
-            job_dicts = []
+            # Drop jobs without a URL and duplicates, then convert to dictionaries
+            unique_jobs = []
             seen = set()
             for job in jobs:
                 if job.job_url not in seen and job.job_url != "Not available":
                     seen.add(job.job_url)
-                    job_dicts.append(job.to_supabase_format())
+                    unique_jobs.append(job)
+            job_dicts = [job.to_supabase_format() for job in unique_jobs]
             
             if not job_dicts:
                 return
             
-            # Upsert the jobs into the 'jobs' table
-            result = self.supabase.table('jobs').upsert(
-                job_dicts,
-                on_conflict='job_url'  # Use job_url for conflict resolution
-            ).execute()
+            # Upsert the jobs into the 'jobs' table, skipping unchanged ones
+            result = self.supabase.rpc('upsert_jobs_if_changed', {'jobs': job_dicts}).execute()
+            written = {row['job_url'] for row in result.data or []}
+            inserted = sum(1 for row in result.data or [] if row['inserted'])
+            
+            print(f"Successfully upserted {len(job_dicts)} jobs to database "
+                  f"({inserted} new, {len(written) - inserted} changed, {len(job_dicts) - len(written)} unchanged)")
+            
+            # Archive the original description markup of the written jobs
+            archive_rows = [row for row in (job.to_archive_format() for job in unique_jobs
+                                            if job.job_url in written) if row]
+            if archive_rows:
+                self.supabase.table('job_description_archive').upsert(
+                    archive_rows,
+                    on_conflict='job_url'
+                ).execute()
+                print(f"Archived original descriptions for {len(archive_rows)} jobs")
             
-            print(f"Successfully upserted {len(job_dicts)} jobs to database")
             return result
             
         except Exception as e:
             print(f"Error upserting jobs to database: {str(e)}")
             raise
 
+    def iter_job_keys(self, page_size: int = 1000, columns: Sequence[str] = JOB_KEY_COLUMNS) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the key columns of every job, without descriptions
+        
+        Pages are read in job_url order with keyset pagination (job_url
+        greater than the last one seen) rather than offsets, so every page
+        is one range scan of the jobs_job_url_keys_idx covering index
+        however deep into the table it is, and jobs inserted during the
+        scan do not shift later pages.
+        
+        Args:
+            page_size: Rows fetched per request
+            columns: Columns to select; job_url is always included
+            
+        Yields:
+            Row dictionaries in job_url order
+        """
+        if 'job_url' not in columns:
+            columns = ('job_url',) + tuple(columns)
+        select = ','.join(columns)
+        
+        last_job_url = None
+        while True:
+            query = self.supabase.table('jobs').select(select).order('job_url').limit(page_size)
+            if last_job_url is not None:
+                query = query.gt('job_url', last_job_url)
+            rows = query.execute().data
+            yield from rows
+            if len(rows) < page_size:
+                return
+            last_job_url = rows[-1]['job_url']
+
+    def get_job_hashes(self, page_size: int = 1000) -> Dict[str, str]:
+        """Map every stored job URL to its content_hash (None for jobs saved before hashing)"""
+        return {row['job_url']: row['content_hash'] for row in self.iter_job_keys(page_size, ('job_url', 'content_hash'))}
+
     def get_job_count(self) -> int:
         """Get the total number of jobs in the database"""
         try:
@@ -1,62 +1,159 @@
+import hashlib
+import json
 import os
-from typing import List
+import secrets
+from typing import Dict, List, Optional
 from datetime import datetime
-import re
+
+# Bump when the manifest layout changes; older manifests are ignored
+MANIFEST_FORMAT_VERSION = 1
 
 class MigrationManager:
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, manifest_path: Optional[str] = None):
+        """
+        Create a migration manager
+
+        Args:
+            db_manager: DatabaseManager whose Supabase client runs the migrations
+            manifest_path: Local JSON cache of the applied checksums (None disables it)
+        """
         self.db_manager = db_manager
         self.migrations_dir = os.path.join(os.path.dirname(__file__), 'versions')
+        self.manifest_path = manifest_path
+        self.round_trips = 0
 
     def run_migrations(self):
-        """Run all pending migrations in order"""
+        """
+        Run all new or modified migrations in order
+
+        Migration files are compared by SHA-256 against the checksums in the
+        migrations table. When the local manifest shows this database already
+        has the checksum column, that comparison is the only request made at
+        startup; otherwise the migrations table is created or upgraded first.
+        """
         try:
-            # Ensure migrations table exists
-            self._create_migrations_table()
-            
-            # Get dictionary of applied migrations and their content
-            applied = self._get_applied_migrations()
+            manifest = self._load_manifest()
+            local = self._get_local_checksums(manifest.get('files', {}))
             
-            # Get all migration files
-            migration_files = self._get_migration_files()
+            applied = None
+            if manifest.get('database') == self._database_key():
+                try:
+                    applied = self._get_applied_checksums()
+                except Exception as e:
+                    print(f"Migrations table check failed, recreating it: {str(e)}")
+            if applied is None:
+                self._create_migrations_table()
+                applied = self._get_applied_checksums()
             
-            # Run pending migrations
-            for migration_file in migration_files:
-                version = self._get_version_from_filename(migration_file)
-                
-                # Read the current file content
-                with open(os.path.join(self.migrations_dir, migration_file), 'r') as f:
-                    current_content = f.read()
-                
-                # Check if migration needs to be applied or rerun
+            # Run pending migrations, one transaction per file
+            for migration_file, (version, checksum) in local.items():
                 if version not in applied:
                     print(f"Running new migration: {migration_file}")
-                    self._run_migration(migration_file)
-                    self._record_migration(version, current_content)
-                elif current_content != applied[version]:
+                elif applied[version] != checksum:
                     print(f"Rerunning modified migration: {migration_file}")
-                    self._run_migration(migration_file)
-                    self._record_migration(version, current_content)
+                else:
+                    continue
+                self._run_migration(migration_file, version, checksum)
+                applied[version] = checksum
+            
+            self._save_manifest(manifest.get('files', {}), local)
+            print(f"Migrations up to date ({self.round_trips} database requests)")
                 
         except Exception as e:
             print(f"Error running migrations: {str(e)}")
             raise
 
+    def _database_key(self) -> str:
+        """Identifies the database in the manifest without storing its URL"""
+        url = getattr(self.db_manager, 'supabase_url', '') or ''
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]
+
+    def _load_manifest(self) -> dict:
+        if not self.manifest_path or not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable migration manifest {self.manifest_path}: {str(e)}")
+            return {}
+        return manifest if manifest.get('version') == MANIFEST_FORMAT_VERSION else {}
+
+    def _save_manifest(self, cached_files: dict, local: Dict[str, tuple]):
+        """Write the manifest atomically (a crash leaves the previous one in place)"""
+        if not self.manifest_path:
+            return
+        files = {}
+        for migration_file, (version, checksum) in local.items():
+            stat = os.stat(os.path.join(self.migrations_dir, migration_file))
+            files[migration_file] = {'checksum': checksum, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        manifest = {
+            'version': MANIFEST_FORMAT_VERSION,
+            'database': self._database_key(),
+            'updated_at': datetime.now().isoformat(),
+            'files': files
+        }
+        if manifest['files'] == cached_files and os.path.exists(self.manifest_path):
+            return
+        
+        directory = os.path.dirname(self.manifest_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, self.manifest_path)
+
+    def _get_local_checksums(self, cached_files: dict) -> Dict[str, tuple]:
+        """
+        Checksums of the migration files, in run order
+
+        Files whose size and modification time match the manifest are not re-read.
+
+        Returns:
+            Dictionary of file name -> (version, SHA-256 hex digest)
+        """
+        checksums = {}
+        for migration_file in self._get_migration_files():
+            path = os.path.join(self.migrations_dir, migration_file)
+            stat = os.stat(path)
+            cached = cached_files.get(migration_file)
+            if cached and cached.get('size') == stat.st_size and cached.get('mtime_ns') == stat.st_mtime_ns:
+                checksum = cached['checksum']
+            else:
+                with open(path, 'r') as f:
+                    checksum = self._checksum(f.read())
+            checksums[migration_file] = (self._get_version_from_filename(migration_file), checksum)
+        return checksums
+
+    @staticmethod
+    def _checksum(content: str) -> str:
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def _exec_sql(self, sql: str):
+        self.round_trips += 1
+        return self.db_manager.supabase.rpc('exec_sql', {'query': sql}).execute()
+
     def _create_migrations_table(self):
-        """Create the migrations tracking table if it doesn't exist"""
+        """Create the migrations tracking table, or add and backfill the checksum column of an existing one"""
         sql = """
         create table if not exists migrations (
             version text primary key,
             applied_at timestamp with time zone default timezone('utc'::text, now()),
             content text not null
         );
+        alter table migrations add column if not exists checksum text;
+        update migrations
+        set checksum = encode(sha256(convert_to(content, 'UTF8')), 'hex')
+        where checksum is null;
         """
-        self.db_manager.supabase.rpc('exec_sql', {'query': sql}).execute()
+        self._exec_sql(sql)
 
-    def _get_applied_migrations(self) -> dict:
-        """Get dictionary of applied migration versions and their content"""
-        result = self.db_manager.supabase.table('migrations').select('version, content').execute()
-        return {row['version']: row['content'] for row in result.data}
+    def _get_applied_checksums(self) -> dict:
+        """Get dictionary of applied migration versions and their checksums"""
+        self.round_trips += 1
+        result = self.db_manager.supabase.table('migrations').select('version, checksum').execute()
+        return {row['version']: row['checksum'] for row in result.data}
 
     def _get_migration_files(self) -> List[str]:
         """Get sorted list of migration files"""
@@ -67,104 +164,35 @@ class MigrationManager:
         """Extract version number from migration filename"""
         return filename.split('_')[0]
 
-    def _split_sql_statements(self, sql: str) -> list:
-        """Split SQL into statements while preserving dollar-quoted blocks and DO blocks"""
-        statements = []
-        current_statement = []
-        in_quotes = False
-        quote_char = None
-        in_dollar_quote = False
-        dollar_quote_tag = None
-        in_do_block = False
-        nested_level = 0
-        
-        # Split into lines while preserving newlines
-        lines = sql.splitlines(True)
-        
-        for line in lines:
-            i = 0
-            while i < len(line):
-                # Check for DO block start
-                if not in_quotes and not in_dollar_quote and line[i:].strip().upper().startswith('DO'):
-                    in_do_block = True
-                
-                # Handle dollar quotes
-                if line[i:i+1] == '$':
-                    # Look for the end of the dollar quote tag
-                    end_tag = line.find('$', i+1)
-                    if end_tag != -1:
-                        tag = line[i:end_tag+1]
-                        if not in_dollar_quote:
-                            in_dollar_quote = True
-                            dollar_quote_tag = tag
-                        elif tag == dollar_quote_tag:
-                            in_dollar_quote = False
-                            dollar_quote_tag = None
-                        i = end_tag
-                
-                # Handle regular quotes when not in dollar quotes
-                elif not in_dollar_quote and line[i] in ["'", '"']:
-                    if not in_quotes:
-                        in_quotes = True
-                        quote_char = line[i]
-                    elif line[i] == quote_char:
-                        in_quotes = False
-                        quote_char = None
-                
-                # Track nested blocks
-                elif not in_quotes and not in_dollar_quote:
-                    if line[i:].strip().startswith('begin'):
-                        nested_level += 1
-                    elif line[i:].strip().startswith('end'):
-                        nested_level -= 1
-                        if nested_level == 0:
-                            in_do_block = False
-                
-                # Handle semicolons when not in any quotes and not in a DO block
-                elif (line[i] == ';' and 
-                      not in_quotes and 
-                      not in_dollar_quote and 
-                      not in_do_block):
-                    current_statement.append(line[:i+1])
-                    statements.append(''.join(current_statement))
-                    current_statement = []
-                    line = line[i+1:]
-                    i = 0
-                    continue
-                
-                i += 1
-            
-            if line:
-                current_statement.append(line)
-        
-        # Add any remaining statement
-        if current_statement:
-            statements.append(''.join(current_statement))
-        
-        return [stmt.strip() for stmt in statements if stmt.strip()]
+    def _run_migration(self, migration_file: str, version: str, checksum: str):
+        """
+        Execute a migration file and record it in a single exec_sql call
 
-    def _run_migration(self, migration_file: str):
-        """Execute a single migration file"""
+        PostgREST runs each RPC in one transaction, so if any statement fails
+        the whole file and its migrations row are rolled back together.
+        """
         file_path = os.path.join(self.migrations_dir, migration_file)
         with open(file_path, 'r') as f:
             sql = f.read()
-            
-        # Split SQL into separate statements, preserving DO blocks and dollar quotes
-        statements = self._split_sql_statements(sql)
         
-        # Execute each statement separately
-        for statement in statements:
-            try:
-                self.db_manager.supabase.rpc('exec_sql', {'query': statement}).execute()
-            except Exception as e:
-                print(f"Error executing SQL statement: {str(e)}")
-                print(f"Failed statement: {statement}")
-                raise
-
-    def _record_migration(self, version: str, content: str):
-        """Record that a migration has been applied"""
-        self.db_manager.supabase.table('migrations').upsert({
-            'version': version,
-            'content': content,
-            'applied_at': 'now()'
-        }).execute() 
\ No newline at end of file
+        # The terminator on its own line ends the file's last statement (even after a
+        # trailing line comment); if it was already terminated it is an empty statement
+        batch = f"{sql}\n;\n{self._record_migration_sql(version, sql, checksum)}"
+        
+        try:
+            self._exec_sql(batch)
+        except Exception as e:
+            print(f"Error executing migration {migration_file} (rolled back): {str(e)}")
+            raise
+
+    def _record_migration_sql(self, version: str, content: str, checksum: str) -> str:
+        """Statement recording that a migration has been applied"""
+        # Dollar-quote the file content with a tag that cannot occur in it
+        tag = f"$migration_{secrets.token_hex(4)}$"
+        while tag in content:
+            tag = f"$migration_{secrets.token_hex(4)}$"
+        version_literal = "'" + version.replace("'", "''") + "'"
+        return f"""insert into migrations (version, content, checksum, applied_at)
+values ({version_literal}, {tag}{content}{tag}, '{checksum}', timezone('utc'::text, now()))
+on conflict (version) do update
+set content = excluded.content, checksum = excluded.checksum, applied_at = excluded.applied_at;"""
\ No newline at end of file
@@ -0,0 +1,115 @@
+import re
+from typing import List
+
+# Next token that can change the splitter's state. Words are matched whole so
+# keywords are never found inside identifiers (end_date, do_update, a$begin).
+_TOKEN = re.compile(r"""
+    (?P<word>[^\W\d][\w$]*)
+  | (?P<line_comment>--)
+  | (?P<block_comment>/\*)
+  | (?P<string>')
+  | (?P<quoted_identifier>")
+  | (?P<dollar_quote>\$(?:[^\W\d]\w*)?\$)
+  | (?P<semicolon>;)
+""", re.VERBOSE)
+
+# Rest of a literal after its opening quote, up to and including the closing quote
+_STRING_END = re.compile(r"[^']*(?:''[^']*)*'")
+_ESCAPE_STRING_END = re.compile(r"[^'\\]*(?:(?:''|\\.)[^'\\]*)*'", re.DOTALL)
+_QUOTED_IDENTIFIER_END = re.compile(r'[^"]*(?:""[^"]*)*"')
+_COMMENT_DELIMITER = re.compile(r"/\*|\*/")
+_NON_SPACE = re.compile(r"\S")
+
+def _skip_block_comment(sql: str, position: int) -> int:
+    """End of a block comment whose /* ends at position; PostgreSQL block comments nest"""
+    depth = 1
+    while depth:
+        match = _COMMENT_DELIMITER.search(sql, position)
+        if not match:
+            return len(sql)
+        depth += 1 if match.group() == '/*' else -1
+        position = match.end()
+    return position
+
+def split_sql_statements(sql: str) -> List[str]:
+    """
+    Split a SQL script into statements in a single pass
+
+    Semicolons only end a statement outside string literals (including
+    E'' strings with backslash escapes), quoted identifiers, dollar-quoted
+    bodies (DO blocks, plpgsql functions), line comments, nested block
+    comments and BEGIN ATOMIC ... END function bodies, where CASE ... END
+    expressions are tracked. The input is scanned token by token with
+    compiled patterns, so the running time is linear in its length.
+
+    An unterminated literal, comment or body runs to the end of the input,
+    leaving the error to the database.
+
+    Args:
+        sql: Script text
+
+    Returns:
+        Statements in order, stripped, each with its terminating semicolon
+        (except possibly the last). Fragments holding only whitespace and
+        comments are dropped; comments before a statement stay with it.
+    """
+    statements = []
+    start = 0
+    position = 0
+    length = len(sql)
+    has_code = False
+    previous_word = None
+    atomic_depth = 0
+
+    while position < length:
+        match = _TOKEN.search(sql, position)
+        if not match:
+            break
+        if not has_code and _NON_SPACE.search(sql, position, match.start()):
+            has_code = True
+        kind = match.lastgroup
+        position = match.end()
+
+        if kind == 'line_comment':
+            newline = sql.find('\n', position)
+            position = length if newline == -1 else newline + 1
+            continue
+        if kind == 'block_comment':
+            position = _skip_block_comment(sql, position)
+            continue
+
+        if kind != 'semicolon':
+            has_code = True
+        if kind == 'word':
+            word = match.group().lower()
+            if word == 'e' and sql.startswith("'", position):
+                # E'...' escape string: backslashes escape the next character
+                end = _ESCAPE_STRING_END.match(sql, position + 1)
+                position = end.end() if end else length
+            elif atomic_depth:
+                if word == 'case':
+                    atomic_depth += 1
+                elif word == 'end':
+                    atomic_depth -= 1
+            elif word == 'atomic' and previous_word == 'begin':
+                atomic_depth = 1
+            previous_word = word
+        elif kind == 'string':
+            end = _STRING_END.match(sql, position)
+            position = end.end() if end else length
+        elif kind == 'quoted_identifier':
+            end = _QUOTED_IDENTIFIER_END.match(sql, position)
+            position = end.end() if end else length
+        elif kind == 'dollar_quote':
+            end = sql.find(match.group(), position)
+            position = length if end == -1 else end + len(match.group())
+        elif not atomic_depth:
+            # Empty statements (a lone semicolon) are dropped with their comments
+            if has_code:
+                statements.append(sql[start:position].strip())
+            start = position
+            has_code = False
+
+    if has_code or _NON_SPACE.search(sql, position):
+        statements.append(sql[start:].strip())
+    return statements
@@ -0,0 +1,38 @@
+-- Archive of the original description markup, zstd-compressed. The jobs table
+-- holds the normalized text that is sent to webhooks and AI prompts.
+create table if not exists job_description_archive (
+    job_url text primary key references jobs(job_url) on delete cascade,
+    html_zstd bytea not null,
+    raw_bytes integer not null,
+    created_at timestamp with time zone default timezone('utc'::text, now())
+);
+
+-- Enable row level security on the archive table if not already enabled
+do $$
+begin
+    if not exists (
+        select 1
+        from pg_tables
+        where tablename = 'job_description_archive'
+        and rowsecurity = true
+    ) then
+        alter table job_description_archive enable row level security;
+    end if;
+end $$;
+
+-- Allow service_role full access if the policy doesn't exist
+do $$
+begin
+    if not exists (
+        select 1
+        from pg_policies
+        where tablename = 'job_description_archive'
+        and policyname = 'allow_service_role'
+    ) then
+        create policy "allow_service_role" on job_description_archive
+        for all
+        to service_role
+        using (true)
+        with check (true);
+    end if;
+end $$;
\ No newline at end of file
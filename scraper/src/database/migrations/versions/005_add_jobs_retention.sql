@@ -0,0 +1,46 @@
+-- Index the retention cutoff so old jobs are found without scanning the table.
+-- Not built concurrently: exec_sql runs the migration in one transaction.
+create index if not exists jobs_created_at_idx on jobs (created_at);
+
+-- Delete at most batch_size jobs older than the retention period and return
+-- how many were deleted. Callers repeat it until it returns less than
+-- batch_size, so each call is a short transaction holding few row locks.
+-- Rows locked by a concurrent upsert are skipped and picked up next time.
+create or replace function delete_old_jobs_batch(
+    batch_size integer default 5000,
+    retention interval default interval '1 day'
+)
+returns integer
+language plpgsql
+security definer
+as $func$
+declare
+    deleted integer;
+begin
+    delete from jobs
+    where id in (
+        select id
+        from jobs
+        where created_at < (now() - retention)
+        order by created_at
+        limit batch_size
+        for update skip locked
+    );
+    get diagnostics deleted = row_count;
+    return deleted;
+end;
+$func$;
+
+-- Grant execute permission to service_role if not already granted
+do $$
+begin
+    if not exists (
+        select 1
+        from information_schema.routine_privileges
+        where routine_name = 'delete_old_jobs_batch'
+        and grantee = 'service_role'
+        and privilege_type = 'EXECUTE'
+    ) then
+        grant execute on function delete_old_jobs_batch(integer, interval) to service_role;
+    end if;
+end $$;
\ No newline at end of file
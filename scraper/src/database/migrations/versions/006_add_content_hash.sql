@@ -0,0 +1,54 @@
+-- Hash of the job content computed by the scraper (title, company, location,
+-- description), used to skip upserts that would not change anything
+alter table jobs add column if not exists content_hash text;
+
+-- Upsert scraped jobs, writing only new jobs and jobs whose content_hash
+-- differs. Unchanged rows are not touched, so set_updated_at does not fire
+-- and no UPDATE webhook is sent. Rows written before content_hash existed
+-- have a null hash and are rewritten once. Returns the written jobs.
+create or replace function upsert_jobs_if_changed(jobs jsonb)
+returns table (job_url text, inserted boolean)
+language plpgsql
+security definer
+as $func$
+begin
+    return query
+    insert into jobs as existing (job_url, title, company, location, posted_time, applicants, description, content_hash)
+    select incoming.job_url, incoming.title, incoming.company, incoming.location, incoming.posted_time,
+           incoming.applicants, incoming.description, incoming.content_hash
+    from jsonb_to_recordset(upsert_jobs_if_changed.jobs) as incoming(
+        job_url text,
+        title text,
+        company text,
+        location text,
+        posted_time text,
+        applicants text,
+        description text,
+        content_hash text
+    )
+    on conflict on constraint jobs_job_url_key do update
+    set title = excluded.title,
+        company = excluded.company,
+        location = excluded.location,
+        posted_time = excluded.posted_time,
+        applicants = excluded.applicants,
+        description = excluded.description,
+        content_hash = excluded.content_hash
+    where existing.content_hash is distinct from excluded.content_hash
+    returning existing.job_url, (existing.xmax = 0);
+end;
+$func$;
+
+-- Grant execute permission to service_role if not already granted
+do $$
+begin
+    if not exists (
+        select 1
+        from information_schema.routine_privileges
+        where routine_name = 'upsert_jobs_if_changed'
+        and grantee = 'service_role'
+        and privilege_type = 'EXECUTE'
+    ) then
+        grant execute on function upsert_jobs_if_changed(jsonb) to service_role;
+    end if;
+end $$;
\ No newline at end of file
@@ -0,0 +1,5 @@
+-- Covering index for listing jobs without their descriptions
+-- (DatabaseManager.iter_job_keys): pages ordered by job_url that select
+-- id, job_url, content_hash and created_at are answered by an index-only
+-- scan instead of reading the table rows.
+create index if not exists jobs_job_url_keys_idx on jobs (job_url) include (id, content_hash, created_at);
\ No newline at end of file
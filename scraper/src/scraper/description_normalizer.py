@@ -0,0 +1,234 @@
+from html.parser import HTMLParser
+from typing import Iterable, List, Optional
+import re
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Elements whose content is never part of the posting
+SKIPPED_TAGS = {'script', 'style', 'svg', 'button', 'noscript', 'template', 'iframe', 'form', 'select'}
+
+# Class name fragments of LinkedIn UI chrome inside the description container
+SKIPPED_CLASSES = (
+    'visually-hidden',
+    'artdeco-button',
+    'inline-show-more-text__button',
+    'jobs-description__footer',
+    'jobs-premium',
+    'premium-upsell'
+)
+
+# Elements that never have an end tag
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt', 'fieldset', 'figcaption',
+    'figure', 'footer', 'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table',
+    'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'ul', 'br'
+}
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+BOLD_TAGS = {'strong', 'b'}
+
+# LinkedIn UI labels that end up inside the description markup
+BOILERPLATE_LINES = {'about the job', 'show more', 'show less', 'see more', 'see less', '…more', '… more'}
+
+# Headings that start a section dropped from the compact text
+BOILERPLATE_HEADINGS = (
+    'equal opportunity',
+    'equal employment',
+    'eeo statement',
+    'reasonable accommodation',
+    'accommodation request',
+    'privacy notice',
+    'applicant privacy',
+    'e-verify'
+)
+
+# Standalone paragraphs dropped from the compact text
+BOILERPLATE_PARAGRAPH = re.compile(
+    r'\b(equal (employment )?opportunity employer|reasonable accommodations?|e-verify|'
+    r'regard to race, colou?r, religion)\b',
+    re.IGNORECASE
+)
+
+# Boilerplate paragraphs longer than this are kept, they usually carry real content too
+MAX_BOILERPLATE_PARAGRAPH = 1200
+
+ZSTD_LEVEL = 10
+
+class DescriptionNormalizer(HTMLParser):
+    """
+    Streaming converter from LinkedIn description markup to compact markdown
+
+    Markup can be fed in chunks. Headings (and lines that are entirely bold,
+    which LinkedIn postings use as headings) become '## ' lines, list items
+    become '- ' lines and everything else is collapsed to one line per block.
+    UI chrome and legal boilerplate sections are dropped.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines: List[str] = []
+        self._inline: List[str] = []
+        self._skip_depth = 0
+        self._heading_depth = 0
+        self._bold_depth = 0
+        self._bold_only = True
+        self._list_item = False
+        self._dropping_section = False
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_depth:
+            if tag not in VOID_TAGS:
+                self._skip_depth += 1
+            return
+
+        if tag in SKIPPED_TAGS or self._has_skipped_class(attrs):
+            if tag not in VOID_TAGS:
+                self._skip_depth = 1
+            return
+
+        if tag in BLOCK_TAGS or tag in HEADING_TAGS:
+            self._flush()
+        if tag in HEADING_TAGS:
+            self._heading_depth += 1
+        elif tag in BOLD_TAGS:
+            self._bold_depth += 1
+        elif tag == 'li':
+            self._list_item = True
+
+    def handle_startendtag(self, tag, attrs):
+        if not self._skip_depth and tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if self._skip_depth:
+            if tag not in VOID_TAGS:
+                self._skip_depth -= 1
+            return
+
+        if tag in HEADING_TAGS:
+            self._flush()
+            self._heading_depth = max(self._heading_depth - 1, 0)
+        elif tag in BOLD_TAGS:
+            self._bold_depth = max(self._bold_depth - 1, 0)
+        elif tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if not self._bold_depth and not self._heading_depth and data.strip():
+            self._bold_only = False
+        self._inline.append(data)
+
+    def close(self) -> str:
+        """
+        Finish parsing
+
+        Returns:
+            Normalized description text
+        """
+        super().close()
+        self._flush()
+        return self.text
+
+    @property
+    def text(self) -> str:
+        """Normalized description text of the markup fed so far"""
+        return '\n'.join(self.lines)
+
+    def _has_skipped_class(self, attrs) -> bool:
+        for name, value in attrs:
+            if name == 'class' and value and any(fragment in value for fragment in SKIPPED_CLASSES):
+                return True
+            if name == 'aria-hidden' and value == 'true':
+                return True
+        return False
+
+    def _flush(self):
+        """End the current line"""
+        text = ' '.join(''.join(self._inline).split())
+        list_item = self._list_item
+        is_heading = bool(self._heading_depth) or (self._bold_only and not list_item)
+        self._inline = []
+        self._bold_only = True
+        self._list_item = False
+
+        if not text or text.casefold() in BOILERPLATE_LINES:
+            return
+
+        if is_heading:
+            folded = text.casefold()
+            self._dropping_section = any(heading in folded for heading in BOILERPLATE_HEADINGS)
+            if self._dropping_section:
+                return
+            line = f"## {text.rstrip(':')}"
+        else:
+            if self._dropping_section:
+                return
+            if len(text) <= MAX_BOILERPLATE_PARAGRAPH and BOILERPLATE_PARAGRAPH.search(text):
+                return
+            line = f"- {text}" if list_item else text
+
+        if not self.lines or self.lines[-1] != line:
+            self.lines.append(line)
+
+def normalize_description(html: Optional[str]) -> Optional[str]:
+    """
+    Convert description markup to compact markdown text
+
+    Args:
+        html: Description innerHTML (plain text passes through unchanged)
+
+    Returns:
+        Normalized text
+    """
+    if not html or '<' not in html:
+        return html
+    return normalize_description_chunks([html])
+
+def normalize_description_chunks(chunks: Iterable[str]) -> str:
+    """
+    Convert description markup received in chunks to compact markdown text
+
+    Args:
+        chunks: Pieces of the description markup, in order
+
+    Returns:
+        Normalized text
+    """
+    normalizer = DescriptionNormalizer()
+    for chunk in chunks:
+        normalizer.feed(chunk)
+    return normalizer.close()
+
+def compress_description(html: Optional[str]) -> Optional[bytes]:
+    """
+    Compress the original description markup for storage
+
+    Args:
+        html: Description innerHTML
+
+    Returns:
+        zstd frame, or None if there is nothing to store or zstandard is not installed
+    """
+    if not html or zstandard is None:
+        return None
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(html.encode('utf-8'))
+
+def decompress_description(data: bytes) -> str:
+    """
+    Restore description markup stored by compress_description
+
+    Args:
+        data: zstd frame
+
+    Returns:
+        Original description markup
+    """
+    if zstandard is None:
+        raise ImportError("zstandard is required to decompress stored descriptions")
+    return zstandard.ZstdDecompressor().decompress(data).decode('utf-8')
@@ -0,0 +1,355 @@
+from html import escape
+from html.parser import HTMLParser
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+import re
+
+# Elements that never have an end tag
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+# Elements whose rendered text starts on a new line
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt', 'fieldset', 'figcaption',
+    'figure', 'footer', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol',
+    'p', 'pre', 'section', 'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'ul', 'br'
+}
+
+# Elements whose content is never rendered
+HIDDEN_TAGS = {'script', 'style', 'template', 'noscript', 'head'}
+
+class Node:
+    """Element of a parsed snapshot; children are Nodes or text strings"""
+
+    __slots__ = ('tag', 'attrs', 'children', 'parent', '_classes', '_elements')
+
+    def __init__(self, tag: str, attrs: Dict[str, str] = None, parent: 'Node' = None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.children: List[Union['Node', str]] = []
+        self.parent = parent
+        self._classes = None
+        self._elements = None
+
+    @property
+    def classes(self) -> frozenset:
+        if self._classes is None:
+            self._classes = frozenset(self.attrs.get('class', '').split())
+        return self._classes
+
+    @property
+    def elements(self) -> List['Node']:
+        """Element children, without text"""
+        if self._elements is None:
+            self._elements = [child for child in self.children if child.__class__ is Node]
+        return self._elements
+
+    def iter_descendants(self) -> Iterator['Node']:
+        """Descendant elements in document order"""
+        stack = list(reversed(self.elements))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.elements))
+
+    def text_content(self) -> str:
+        """Concatenated text of the subtree, like the DOM textContent property"""
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.__class__ is str:
+                parts.append(node)
+            else:
+                stack.extend(reversed(node.children))
+        return ''.join(parts)
+
+    def rendered_text(self) -> str:
+        """Approximation of the rendered text (WebElement.text): block elements on their own lines"""
+        parts = []
+        self._render(parts)
+        lines = (' '.join(line.split()) for line in ''.join(parts).split('\n'))
+        return '\n'.join(line for line in lines if line)
+
+    def _render(self, parts: List[str]):
+        if self.tag in HIDDEN_TAGS or 'hidden' in self.attrs or self.attrs.get('aria-hidden') == 'true':
+            return
+        block = self.tag in BLOCK_TAGS
+        if block:
+            parts.append('\n')
+        for child in self.children:
+            if child.__class__ is str:
+                parts.append(child)
+            else:
+                child._render(parts)
+        if block:
+            parts.append('\n')
+
+    def inner_html(self) -> str:
+        parts = []
+        for child in self.children:
+            if child.__class__ is str:
+                parts.append(child if self.tag in ('script', 'style') else escape(child, quote=False))
+            else:
+                child._serialize(parts)
+        return ''.join(parts)
+
+    def outer_html(self) -> str:
+        parts = []
+        self._serialize(parts)
+        return ''.join(parts)
+
+    def _serialize(self, parts: List[str]):
+        attrs = ''.join(
+            f' {name}' if value is None else f' {name}="{escape(value)}"' for name, value in self.attrs.items()
+        )
+        parts.append(f"<{self.tag}{attrs}>")
+        if self.tag in VOID_TAGS:
+            return
+        parts.append(self.inner_html())
+        parts.append(f"</{self.tag}>")
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node('#document')
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {name: value if value is not None else '' for name, value in attrs}, self.stack[-1])
+        self.stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.stack.pop()
+
+    def handle_endtag(self, tag):
+        # Close up to the matching open element; stray end tags are ignored
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag == tag:
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        self.stack[-1].children.append(data)
+
+def parse_html(html: str) -> Node:
+    """
+    Parse a snapshot into a tree
+
+    Recorded snapshots are browser-serialized outerHTML, so the markup is
+    well-formed apart from void elements and no HTML5 error recovery is done.
+
+    Args:
+        html: Markup
+
+    Returns:
+        Document node whose children are the top-level elements
+    """
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+class SelectorError(ValueError):
+    """Raised for CSS selectors the engine does not support"""
+
+_TOKEN = re.compile(r"""
+    (?P<combinator>\s*[>+~]\s*|\s+)
+  | (?P<id>\#[\w-]+)
+  | (?P<class>\.[\w-]+)
+  | (?P<tag>\*|[a-zA-Z][\w-]*)
+  | \[\s*(?P<attr>[\w:-]+)\s*(?:(?P<op>[~^$*|]?=)\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\]\s]+))\s*)?\]
+  | :(?P<pseudo>[\w-]+)(?:\((?P<arg>[^)]*)\))?
+""", re.VERBOSE)
+
+class _Compound:
+    __slots__ = ('tag', 'id', 'classes', 'attrs', 'pseudos')
+
+    def __init__(self):
+        self.tag = None
+        self.id = None
+        self.classes = []
+        self.attrs = []
+        self.pseudos = []
+
+    def matches(self, node: Node) -> bool:
+        if self.tag is not None and node.tag != self.tag:
+            return False
+        if self.id is not None and node.attrs.get('id') != self.id:
+            return False
+        if self.classes and not node.classes.issuperset(self.classes):
+            return False
+        for name, op, value in self.attrs:
+            actual = node.attrs.get(name)
+            if actual is None:
+                return False
+            if op is None:
+                continue
+            if op == '=' and actual != value:
+                return False
+            if op == '~=' and value not in actual.split():
+                return False
+            if op == '^=' and not actual.startswith(value):
+                return False
+            if op == '$=' and not actual.endswith(value):
+                return False
+            if op == '*=' and value not in actual:
+                return False
+            if op == '|=' and actual != value and not actual.startswith(value + '-'):
+                return False
+        for pseudo, arg in self.pseudos:
+            siblings = node.parent.elements if node.parent is not None else [node]
+            if pseudo == 'first-child' and siblings[0] is not node:
+                return False
+            if pseudo == 'last-child' and siblings[-1] is not node:
+                return False
+            if pseudo == 'only-child' and len(siblings) != 1:
+                return False
+            if pseudo == 'nth-child' and (arg >= len(siblings) or siblings[arg] is not node):
+                return False
+        return True
+
+def _parse_compound_sequence(selector: str) -> List[Tuple[str, _Compound]]:
+    """[(combinator, compound), ...] left to right; the first combinator is ''"""
+    parts = []
+    compound = None
+    combinator = ''
+    position = 0
+    text = selector.strip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match:
+            raise SelectorError(f"Unsupported selector at {text[position:]!r} in {selector!r}")
+        position = match.end()
+
+        if match.group('combinator') is not None:
+            if compound is None:
+                raise SelectorError(f"Selector starts with a combinator: {selector!r}")
+            parts.append((combinator, compound))
+            compound = None
+            combinator = match.group('combinator').strip() or ' '
+            continue
+
+        if compound is None:
+            compound = _Compound()
+        if match.group('id'):
+            compound.id = match.group('id')[1:]
+        elif match.group('class'):
+            compound.classes.append(match.group('class')[1:])
+        elif match.group('tag'):
+            compound.tag = None if match.group('tag') == '*' else match.group('tag').lower()
+        elif match.group('attr'):
+            value = next((v for v in (match.group('dq'), match.group('sq'), match.group('bare')) if v is not None), None)
+            compound.attrs.append((match.group('attr').lower(), match.group('op'), value))
+        else:
+            pseudo, arg = match.group('pseudo').lower(), match.group('arg')
+            if pseudo == 'nth-child':
+                if not (arg or '').strip().isdigit():
+                    raise SelectorError(f"Only :nth-child(<number>) is supported: {selector!r}")
+                compound.pseudos.append((pseudo, int(arg) - 1))
+            elif pseudo in ('first-child', 'last-child', 'only-child'):
+                compound.pseudos.append((pseudo, None))
+            else:
+                raise SelectorError(f"Unsupported pseudo-class :{pseudo} in {selector!r}")
+
+    if compound is None:
+        raise SelectorError(f"Empty or incomplete selector: {selector!r}")
+    parts.append((combinator, compound))
+    return parts
+
+class Selector:
+    """
+    Compiled CSS selector
+
+    Supports type, #id, .class and [attribute] selectors (=, ~=, ^=, $=,
+    *=, |=), :first-child, :last-child, :only-child and :nth-child(n), the
+    descendant, child (>), adjacent (+) and general sibling (~) combinators
+    and selector lists. Matching goes right to left from the candidate
+    element, as browsers do.
+    """
+
+    def __init__(self, selector: str):
+        self.selector = selector
+        self.alternatives = [_parse_compound_sequence(part) for part in _split_list(selector)]
+
+    def matches(self, node: Node) -> bool:
+        return any(_match_from(parts, len(parts) - 1, node) for parts in self.alternatives)
+
+    def select(self, scope: Node, first: bool = False) -> List[Node]:
+        """
+        Elements under scope matching the selector, in document order
+
+        Like querySelectorAll on an element, the whole selector is matched
+        against the document, so ancestors above scope can satisfy it.
+        """
+        found = []
+        for node in scope.iter_descendants():
+            if self.matches(node):
+                found.append(node)
+                if first:
+                    break
+        return found
+
+def _split_list(selector: str) -> List[str]:
+    parts, depth, quote, start = [], 0, None, 0
+    for i, char in enumerate(selector):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append(selector[start:i])
+            start = i + 1
+    parts.append(selector[start:])
+    return parts
+
+def _match_from(parts: List[Tuple[str, _Compound]], index: int, node: Node) -> bool:
+    combinator, compound = parts[index]
+    if not compound.matches(node):
+        return False
+    if index == 0:
+        return True
+
+    if combinator == '>':
+        parent = node.parent
+        return parent is not None and parent.tag != '#document' and _match_from(parts, index - 1, parent)
+    if combinator == ' ':
+        ancestor = node.parent
+        while ancestor is not None and ancestor.tag != '#document':
+            if _match_from(parts, index - 1, ancestor):
+                return True
+            ancestor = ancestor.parent
+        return False
+
+    siblings = node.parent.elements if node.parent is not None else [node]
+    position = next(i for i, sibling in enumerate(siblings) if sibling is node)
+    if combinator == '+':
+        return position > 0 and _match_from(parts, index - 1, siblings[position - 1])
+    return any(_match_from(parts, index - 1, sibling) for sibling in siblings[:position])
+
+_compiled: Dict[str, Selector] = {}
+
+def compile_selector(selector: str) -> Selector:
+    """Compiled selector, cached per selector string"""
+    compiled = _compiled.get(selector)
+    if compiled is None:
+        if len(_compiled) > 1024:
+            _compiled.clear()
+        compiled = _compiled[selector] = Selector(selector)
+    return compiled
+
+def select(scope: Node, selector: str) -> List[Node]:
+    """All elements under scope matching a CSS selector"""
+    return compile_selector(selector).select(scope)
+
+def select_one(scope: Node, selector: str) -> Optional[Node]:
+    """First element under scope matching a CSS selector, or None"""
+    found = compile_selector(selector).select(scope, first=True)
+    return found[0] if found else None
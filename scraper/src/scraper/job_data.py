@@ -1,26 +1,27 @@
-from job_assistant_models import JobRecord as JobData
+from job_assistant_models import JobRecord as JobData, compute_content_hash, decode_job_fields
+from .description_normalizer import compress_description
 
 # If you need additional functionality:
 class EnhancedJobData(JobData):
     """Extends JobRecord with scraper-specific functionality"""
     
-    def __init__(self, job_data=None, **kwargs):
+    def __init__(self, job_data=None, description_html=None, **kwargs):
         # Initialize from either a JobData object or keyword arguments
         if job_data is not None:
-            # Copy attributes from the provided JobData object
-            super().__init__(
-                id=getattr(job_data, 'id', None),
-                title=getattr(job_data, 'title', ''),
-                job_url=getattr(job_data, 'job_url', ''),
-                company=getattr(job_data, 'company', ''),
-                location=getattr(job_data, 'location', ''),
-                posted_time=getattr(job_data, 'posted_time', ''),
-                applicants=getattr(job_data, 'applicants', ''),
-                description=getattr(job_data, 'description', '')
-            )
+            # Copy fields from the provided JobData object (or record dict) through the shared decoder
+            super().__init__(**decode_job_fields(job_data, strict=False))
         else:
             # Initialize with provided keyword arguments
             super().__init__(**kwargs)
+        
+        # Original description markup; description holds the normalized text
+        self.description_html = description_html
+    
+    def to_dict(self):
+        """Convert to dictionary for serialization (without the original markup)"""
+        data = super().to_dict()
+        data.pop('description_html', None)
+        return data
     
     def to_supabase_format(self):
         """Convert to format expected by Supabase"""
@@ -33,9 +34,34 @@ class EnhancedJobData(JobData):
             'applicants': self.applicants or '',
             'description': self.description or ''
         }
+        # Lets the database skip rows whose content has not changed
+        data['content_hash'] = compute_content_hash(data)
             
         return data
     
+    def to_archive_format(self):
+        """
+        Convert the original description markup to a job_description_archive row
+        
+        The markup is kept zstd-compressed in its own table so it can be
+        reprocessed later without being sent with every jobs webhook.
+        
+        Returns:
+            Row dictionary, or None if there is no markup to archive
+        """
+        if not self.description_html or self.description_html == self.description:
+            return None
+        
+        compressed = compress_description(self.description_html)
+        if compressed is None:
+            return None
+        
+        return {
+            'job_url': self.job_url,
+            'html_zstd': '\\x' + compressed.hex(),  # bytea in hex format
+            'raw_bytes': len(self.description_html.encode('utf-8'))
+        }
+    
     @classmethod
     def create_empty(cls):
         """Create an empty EnhancedJobData object"""
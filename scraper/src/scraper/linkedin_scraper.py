@@ -15,10 +15,20 @@ from selenium.common.exceptions import (
     TimeoutException
 )
 from ..scraper.job_data import EnhancedJobData, JobData
+from .description_normalizer import normalize_description
+from .pacing import AdaptivePacer
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
+# URL fragments of LinkedIn's security checkpoint pages
+SECURITY_CHECK_PATTERNS = (
+    "checkpoint/challenge",
+    "checkpoint/lg/login",
+    "security-verification",
+    "security-challenge"
+)
+
 @dataclass
 class JobSelector:
     """Configuration for job data selectors"""
@@ -66,10 +76,14 @@ class LinkedInSelectors:
     }
 
 class LinkedInScraper:
-    def __init__(self, driver, config):
+    def __init__(self, driver, config, recorder=None, pacer: Optional[AdaptivePacer] = None):
         self.driver = driver
         self.selectors = LinkedInSelectors.JOB_LIST
         self.config = config
+        # Optional SnapshotRecorder capturing the job details of this run for offline replay
+        self.recorder = recorder
+        # Optional AdaptivePacer spacing out job detail loads (may be shared between sessions)
+        self.pacer = pacer
         
     def wait_for_captcha(self):
         """Pause execution until CAPTCHA is solved manually."""
@@ -124,6 +138,11 @@ class LinkedInScraper:
         except Exception as e:
             print(f"Failed to send timeout email: {str(e)}")
 
+    def is_security_check(self) -> bool:
+        """Check if the browser is on a security checkpoint page"""
+        current_url = self.driver.current_url
+        return any(pattern in current_url for pattern in SECURITY_CHECK_PATTERNS)
+
     def wait_for_security_check(self, timeout=300):
         """
         Wait for user to complete security check manually.
@@ -137,16 +156,9 @@ class LinkedInScraper:
         print("="*50 + "\n")
         
         start_time = time.time()
-        security_patterns = [
-            "checkpoint/challenge",
-            "checkpoint/lg/login",
-            "security-verification",
-            "security-challenge"
-        ]
         
         while time.time() - start_time < timeout:
-            current_url = self.driver.current_url
-            if not any(pattern in current_url for pattern in security_patterns):
+            if not self.is_security_check():
                 print("\nSecurity check completed! Continuing...")
                 time.sleep(2)  # Wait for page to fully load
                 return True
@@ -193,14 +205,7 @@ class LinkedInScraper:
             time.sleep(3)
             
             # Check for security checkpoint
-            security_patterns = [
-                "checkpoint/challenge",
-                "checkpoint/lg/login",
-                "security-verification",
-                "security-challenge"
-            ]
-            
-            if any(pattern in self.driver.current_url for pattern in security_patterns):
+            if self.is_security_check():
                 if not self.wait_for_security_check():
                     print("Failed to complete security check!")
                     return False
@@ -268,6 +273,17 @@ class LinkedInScraper:
             print(f"Timeout waiting for job details to load: {str(e)}")
             return False
 
+    def get_job_card_id(self, job_index: int) -> Optional[str]:
+        """LinkedIn job ID of a job card, without opening it"""
+        try:
+            job_list = self.driver.find_element(By.CSS_SELECTOR, self.selectors['container'].selector)
+            job_cards = job_list.find_elements(By.CSS_SELECTOR, self.selectors['job_cards'].selector)
+            if job_index >= len(job_cards):
+                return None
+            return job_cards[job_index].get_attribute('data-job-id')
+        except (NoSuchElementException, StaleElementReferenceException):
+            return None
+
     def extract_job_details(self, job_index: int) -> Tuple[EnhancedJobData, bool]:
         """Extract job details from a job card using its index in the list"""
         job_data = JobData.create_empty()
@@ -300,16 +316,29 @@ class LinkedInScraper:
             # Find and click the title link using selector from config
             title_link = job_card.find_element(By.CSS_SELECTOR, self.selectors['title'].selector)
             job_data.title = self._get_job_title(job_card)
-            job_data.job_url = self._get_job_url(job_card.get_attribute('data-job-id'))
+            job_card_id = job_card.get_attribute('data-job-id')
+            job_data.job_url = self._get_job_url(job_card_id)
+            
+            # Keep to the pacer's rate before requesting the job details
+            if self.pacer is not None:
+                self.pacer.wait()
             
             # Click the title and wait for content to load
             self.driver.execute_script("arguments[0].click();", title_link)
+            load_start = time.perf_counter()
             
             # Wait for loading to complete
             if not self.wait_for_job_details_loading():
                 print("Failed to load job details, skipping job")
+                self._handle_failed_load()
                 return job_data, False
             
+            if self.pacer is not None:
+                self.pacer.record_load(time.perf_counter() - load_start)
+            
+            if self.recorder is not None:
+                self.recorder.record_job(self.driver, job_card_id)
+            
             # Now get the job details
             try:
                 # Company
@@ -318,8 +347,9 @@ class LinkedInScraper:
                 # Metadata
                 self._get_job_metadata(job_data)
                 
-                # Description
-                job_data.description = self._get_job_description()
+                # Description, normalized to compact text (the markup is kept for storage)
+                description_html = self._get_job_description()
+                job_data.description = normalize_description(description_html)
                 
             except StaleElementReferenceException:
                 print("Stale element encountered while getting job details, skipping job")
@@ -328,7 +358,9 @@ class LinkedInScraper:
                 print(f"Error extracting job details after loading: {str(e)}")
                 return EnhancedJobData(job_data), False
             
-            return EnhancedJobData(job_data), True
+            if description_html != job_data.description:
+                print(f"Normalized description: {len(description_html)} -> {len(job_data.description)} characters")
+            return EnhancedJobData(job_data, description_html=description_html), True
             
         except StaleElementReferenceException:
             print("Stale element encountered, skipping job")
@@ -337,6 +369,20 @@ class LinkedInScraper:
             print(f"Error extracting job details: {str(e)}")
             return EnhancedJobData(job_data), False
 
+    def _handle_failed_load(self):
+        """Back off after a job detail load timed out, waiting out a checkpoint or CAPTCHA if that was the cause"""
+        checkpoint = self.is_security_check()
+        captcha = not checkpoint and bool(self.driver.find_elements(By.CLASS_NAME, "captcha__image"))
+        if self.pacer is not None:
+            if checkpoint or captcha:
+                self.pacer.record_checkpoint()
+            else:
+                self.pacer.record_timeout()
+        if checkpoint:
+            self.wait_for_security_check()
+        elif captcha:
+            self.wait_for_captcha()
+
     def _get_job_url(self, job_card_id: str) -> str:
         """Get the job URL from the job card ID"""
         return f"https://www.linkedin.com/jobs/view/{job_card_id}"
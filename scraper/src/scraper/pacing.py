@@ -0,0 +1,140 @@
+import random
+import threading
+import time
+from collections import Counter
+from typing import Callable
+
+# Kinds of throttle events counted by AdaptivePacer
+THROTTLE_EVENTS = ('slow', 'timeout', 'checkpoint')
+
+class AdaptivePacer:
+    """
+    AIMD pacing of job detail loads
+
+    The pacer hands out start times at its current rate (jobs per minute).
+    Every detail load that completes within slow_load seconds adds increase
+    to the rate; a slower load or a timeout multiplies it by decrease, at
+    most once per interval so that one throttling episode seen by several
+    loads backs off once. A security checkpoint drops the rate to min_rate.
+    The rate only grows while the pacer is what holds the scraper back, and
+    backing off starts from the pace actually reached when that is lower,
+    so a rate the scraper never used does not delay the back-off.
+
+    A pacer can be shared by several scraper sessions (one per thread):
+    start times are handed out under a lock, so together they keep to one
+    rate, which is what LinkedIn sees for the account.
+    """
+
+    def __init__(self, initial_rate: float = 20.0, min_rate: float = 2.0, max_rate: float = 60.0,
+                 increase: float = 1.0, decrease: float = 0.5, slow_load: float = 3.0, jitter: float = 0.2,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            initial_rate: Jobs per minute to start with
+            min_rate: Lowest rate backed off to
+            max_rate: Highest rate probed
+            increase: Jobs per minute added after a fast load
+            decrease: Factor applied to the rate after a slow load or a timeout
+            slow_load: Seconds after which a detail load counts as throttled
+            jitter: Random fraction added to or removed from every interval
+            clock: Monotonic time source, in seconds
+            sleep: Function sleeping for the given seconds
+        """
+        if not 0 < min_rate <= initial_rate <= max_rate:
+            raise ValueError(f"Expected 0 < min_rate <= initial_rate <= max_rate, "
+                             f"got {min_rate}, {initial_rate}, {max_rate}")
+        if not 0 < decrease < 1:
+            raise ValueError(f"decrease must be between 0 and 1, got {decrease}")
+
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_load = slow_load
+        self.jitter = jitter
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+        self._hold_until = 0.0
+        self._paced = False
+        self._last_start = None
+        self._gap = None
+
+        self.jobs = 0
+        self.events = Counter({kind: 0 for kind in THROTTLE_EVENTS})
+        self.started_at = None
+
+    @property
+    def interval(self) -> float:
+        """Seconds between job starts at the current rate"""
+        return 60.0 / self.rate
+
+    def wait(self) -> float:
+        """
+        Sleep until the next job may start
+
+        Returns:
+            Seconds slept
+        """
+        with self._lock:
+            now = self._clock()
+            if self.started_at is None:
+                self.started_at = now
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+            self._paced = start > now
+            # Moving average of the time between starts, i.e. the pace reached
+            if self._last_start is not None:
+                gap = start - self._last_start
+                self._gap = gap if self._gap is None else 0.8 * self._gap + 0.2 * gap
+            self._last_start = start
+        if start > now:
+            self._sleep(start - now)
+        return start - now
+
+    def record_load(self, seconds: float):
+        """Record a job detail load that completed after seconds"""
+        with self._lock:
+            self.jobs += 1
+            if seconds > self.slow_load:
+                self._back_off('slow')
+            elif self._paced:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def record_timeout(self):
+        """Record a job detail load that timed out"""
+        with self._lock:
+            self._back_off('timeout')
+
+    def record_checkpoint(self):
+        """Record a security checkpoint or CAPTCHA; the next job waits a full interval at min_rate"""
+        with self._lock:
+            self.events['checkpoint'] += 1
+            self.rate = self.min_rate
+            now = self._clock()
+            self._next_start = max(self._next_start, now + self.interval)
+            self._hold_until = now + self.interval
+
+    def _back_off(self, kind: str):
+        self.events[kind] += 1
+        now = self._clock()
+        if now >= self._hold_until:
+            reached = 60.0 / self._gap if self._gap else self.rate
+            self.rate = max(self.min_rate, min(self.rate, reached) * self.decrease)
+            self._hold_until = now + self.interval
+
+    def jobs_per_minute(self) -> float:
+        """Jobs loaded per minute since the first wait"""
+        if self.started_at is None:
+            return 0.0
+        elapsed = self._clock() - self.started_at
+        return self.jobs * 60.0 / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        """One-line report of the run's pace and throttle events"""
+        elapsed = (self._clock() - self.started_at) / 60.0 if self.started_at is not None else 0.0
+        events = ', '.join(f"{kind} {self.events[kind]}" for kind in THROTTLE_EVENTS)
+        return (f"Pacing: {self.jobs} jobs in {elapsed:.1f} min ({self.jobs_per_minute():.1f} jobs/min), "
+                f"throttle events: {events}, final rate {self.rate:.1f} jobs/min")
@@ -0,0 +1,427 @@
+import json
+import os
+import re
+import threading
+import time
+import zipfile
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from selenium.common.exceptions import (
+    InvalidSelectorException,
+    JavascriptException,
+    NoSuchElementException,
+    StaleElementReferenceException
+)
+from selenium.webdriver.common.by import By
+
+from .dom import Node, SelectorError, compile_selector, parse_html
+
+ARCHIVE_FORMAT_VERSION = 1
+
+# Panes captured during a recorded run: the job list (cards and pagination) and the job details
+LIST_PANE_SELECTOR = '.scaffold-layout__list'
+DETAIL_PANE_SELECTOR = '.scaffold-layout__detail'
+
+# Markup the replay adds around the recorded panes, so login checks pass
+REPLAY_CHROME = '<header class="global-nav"><img class="global-nav__me-photo" alt="Profile"></header>'
+
+# Recorded job IDs and page numbers end up in archive member names
+_SAFE_NAME = re.compile(r'[^A-Za-z0-9_-]')
+
+class SnapshotRecorder:
+    """
+    Records the DOM of a scraper run to a compressed archive for replay
+
+    The archive is a zip (deflate) with the list pane of every page under
+    pages/, the detail pane of every job under jobs/ and a manifest of the
+    pages and their jobs in the order they were visited.
+    """
+
+    def __init__(self, path: str):
+        """
+        Create a recorder
+
+        Args:
+            path: Archive file to write (replaced if it exists)
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.zip = zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=9)
+        self.manifest = {
+            'version': ARCHIVE_FORMAT_VERSION,
+            'recorded_at': datetime.now().isoformat(),
+            'pages': []
+        }
+        # Detail panes already in the archive, by member name
+        self.recorded_jobs = set()
+        self.lock = threading.Lock()
+
+    def _capture(self, driver, selector: str) -> Optional[str]:
+        try:
+            return driver.find_element(By.CSS_SELECTOR, selector).get_attribute('outerHTML')
+        except Exception as e:
+            print(f"Could not record {selector}: {str(e)}")
+            return None
+
+    def record_page(self, driver, page: int):
+        """
+        Record the list pane of the current results page (after all its cards have loaded)
+
+        Args:
+            driver: WebDriver showing the page
+            page: Page number, starting at 1
+        """
+        html = self._capture(driver, LIST_PANE_SELECTOR)
+        if html is None:
+            return
+        job_ids = [card.attrs.get('data-job-id') for card in
+                   compile_selector('[data-job-id]').select(parse_html(html))]
+        with self.lock:
+            self.zip.writestr(f"pages/{page:04d}.html", html)
+            self.manifest['pages'].append({'page': page, 'url': driver.current_url, 'job_ids': job_ids})
+
+    def record_job(self, driver, job_id: str):
+        """
+        Record the detail pane of the job currently shown
+
+        Args:
+            driver: WebDriver showing the job details
+            job_id: LinkedIn job ID (data-job-id of its card)
+        """
+        name = f"jobs/{_SAFE_NAME.sub('_', str(job_id))}.html"
+        if name in self.recorded_jobs:
+            return
+        html = self._capture(driver, DETAIL_PANE_SELECTOR)
+        if html is None:
+            return
+        with self.lock:
+            if name not in self.recorded_jobs:
+                self.recorded_jobs.add(name)
+                self.zip.writestr(name, html)
+
+    def close(self):
+        """Write the manifest and close the archive"""
+        with self.lock:
+            if self.zip.fp is None:
+                return
+            self.zip.writestr('manifest.json', json.dumps(self.manifest, indent=2))
+            self.zip.close()
+        print(f"Recorded {len(self.manifest['pages'])} pages to {self.path}")
+
+class ReplayArchive:
+    """Read side of a recorded archive"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.zip = zipfile.ZipFile(path)
+        names = set(self.zip.namelist())
+        if 'manifest.json' in names:
+            self.manifest = json.loads(self.zip.read('manifest.json'))
+        else:
+            # Interrupted recording: rebuild the page list from the member names
+            pages = sorted(name for name in names if name.startswith('pages/'))
+            self.manifest = {'version': ARCHIVE_FORMAT_VERSION, 'pages': [
+                {'page': int(name[len('pages/'):-len('.html')]), 'url': None, 'job_ids': None} for name in pages
+            ]}
+        self.pages = {entry['page']: entry for entry in self.manifest['pages']}
+        self._jobs = {name[len('jobs/'):-len('.html')] for name in names if name.startswith('jobs/')}
+
+    def page_html(self, page: int) -> Optional[str]:
+        if page not in self.pages:
+            return None
+        return self.zip.read(f"pages/{page:04d}.html").decode('utf-8')
+
+    def job_html(self, job_id: str) -> Optional[str]:
+        name = _SAFE_NAME.sub('_', str(job_id))
+        if name not in self._jobs:
+            return None
+        return self.zip.read(f"jobs/{name}.html").decode('utf-8')
+
+class ReplayElement:
+    """WebElement stand-in over a node of a replayed snapshot"""
+
+    def __init__(self, driver: 'ReplayDriver', node: Node, root: Node):
+        self._driver = driver
+        self._node = node
+        self._root = root
+
+    def _check(self) -> Node:
+        self._driver._command()
+        if not self._driver._attached(self._root):
+            raise StaleElementReferenceException("Element is no longer attached to the replayed DOM")
+        return self._node
+
+    @property
+    def parent(self) -> 'ReplayDriver':
+        # Like WebElement.parent, this is the driver, not the parent element
+        return self._driver
+
+    @property
+    def id(self) -> str:
+        return str(id(self._node))
+
+    @property
+    def tag_name(self) -> str:
+        return self._check().tag
+
+    @property
+    def text(self) -> str:
+        return self._check().rendered_text()
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        node = self._check()
+        if name == 'innerHTML':
+            return node.inner_html()
+        if name == 'outerHTML':
+            return node.outer_html()
+        if name == 'textContent':
+            return node.text_content()
+        if name == 'innerText':
+            return node.rendered_text()
+        return node.attrs.get(name)
+
+    def get_dom_attribute(self, name: str) -> Optional[str]:
+        return self._check().attrs.get(name)
+
+    def is_displayed(self) -> bool:
+        node = self._check()
+        return 'hidden' not in node.attrs and node.attrs.get('aria-hidden') != 'true'
+
+    def is_enabled(self) -> bool:
+        return 'disabled' not in self._check().attrs
+
+    def is_selected(self) -> bool:
+        return 'checked' in self._check().attrs or 'selected' in self._check().attrs
+
+    def click(self):
+        self._driver._click(self._check())
+
+    def send_keys(self, *value):
+        self._check()
+
+    def find_element(self, by=By.ID, value: str = None) -> 'ReplayElement':
+        return self._driver._find(self._check(), self._root, by, value, first=True)[0]
+
+    def find_elements(self, by=By.ID, value: str = None) -> List['ReplayElement']:
+        return self._driver._find(self._check(), self._root, by, value)
+
+    def __eq__(self, other):
+        return isinstance(other, ReplayElement) and other._node is self._node
+
+    def __hash__(self):
+        return id(self._node)
+
+class ReplayDriver:
+    """
+    WebDriver stand-in that replays a recorded archive offline
+
+    Implements the subset of the WebDriver API used by LinkedInScraper and
+    main.py: get, current_url, find_element(s) with CSS / ID / class / tag /
+    name locators, the execute_script calls the scraper makes (click,
+    scrolling, document.readyState, outerHTML), timeouts and quit.
+
+    Any URL containing /jobs/ shows page 1 of the recording. Clicking a job
+    card or its title shows that job's recorded details; clicking a
+    "Page N" button (added for every recorded page after the current one)
+    moves to page N. After a navigation the new content appears only once
+    load_latency has passed, so the scraper's waits behave as they do live.
+    """
+
+    def __init__(self, archive: str, command_latency: float = 0.0, load_latency: float = 0.0):
+        """
+        Create a replay driver
+
+        Args:
+            archive: Archive written by SnapshotRecorder
+            command_latency: Seconds added to every driver / element command (a WebDriver round trip)
+            load_latency: Seconds before a page or job detail appears after navigating to it
+        """
+        self.archive = ReplayArchive(archive)
+        self.command_latency = command_latency
+        self.load_latency = load_latency
+        self.implicit_wait = 0.0
+        self.page_load_timeout = None
+        self.script_timeout = None
+
+        self.commands = 0
+        self.page = None
+        self.job_id = None
+        self._url = 'data:,'
+        self._chrome = parse_html(REPLAY_CHROME)
+        self._list = None
+        self._pagination = None
+        self._detail = None
+        self._ready_at = 0.0
+        self._pending = None
+        self._parsed_jobs: Dict[str, Node] = {}
+
+    # WebDriver API
+
+    @property
+    def current_url(self) -> str:
+        self._command()
+        return self._url
+
+    @property
+    def page_source(self) -> str:
+        self._command()
+        return ''.join(root.inner_html() for root in self._roots())
+
+    def get(self, url: str):
+        self._command()
+        if '/jobs/' in url:
+            # A recorded page URL (e.g. a resumed run) opens that page, any other search the first
+            page = next((number for number, entry in self.archive.pages.items() if entry.get('url') == url), 1)
+            self._show_page(page, url)
+        else:
+            self._url = url
+            self.page = None
+            self._list = self._pagination = self._detail = None
+
+    def find_element(self, by=By.ID, value: str = None) -> ReplayElement:
+        return self._find(None, None, by, value, first=True)[0]
+
+    def find_elements(self, by=By.ID, value: str = None) -> List[ReplayElement]:
+        return self._find(None, None, by, value)
+
+    def execute_script(self, script: str, *args):
+        self._command()
+        code = ' '.join(script.split()).rstrip(';')
+        if code == 'arguments[0].click()':
+            args[0].click()
+            return None
+        if code.startswith('arguments[0].scrollIntoView') or code.startswith('window.scrollTo'):
+            return None
+        if code == 'return document.readyState':
+            return 'complete' if self._loaded() else 'interactive'
+        match = re.fullmatch(r'return arguments\[0\]\.(outerHTML|innerHTML|textContent|innerText)', code)
+        if match:
+            return args[0].get_attribute(match.group(1))
+        raise JavascriptException(f"Script not supported by the replay driver: {script}")
+
+    def implicitly_wait(self, time_to_wait: float):
+        self.implicit_wait = time_to_wait
+
+    def set_page_load_timeout(self, time_to_wait: float):
+        self.page_load_timeout = time_to_wait
+
+    def set_script_timeout(self, time_to_wait: float):
+        self.script_timeout = time_to_wait
+
+    def quit(self):
+        self.archive.zip.close()
+
+    # Replay state
+
+    def _command(self):
+        self.commands += 1
+        if self.command_latency:
+            time.sleep(self.command_latency)
+
+    def _loaded(self) -> bool:
+        if self._pending is not None and time.perf_counter() >= self._ready_at:
+            self._pending()
+            self._pending = None
+        return self._pending is None
+
+    def _navigate(self, apply):
+        """Apply a navigation now, or once load_latency has passed"""
+        if self.load_latency:
+            self._pending = apply
+            self._ready_at = time.perf_counter() + self.load_latency
+        else:
+            self._pending = None
+            apply()
+
+    def _show_page(self, page: int, url: str = None):
+        html = self.archive.page_html(page)
+        if html is None:
+            raise NoSuchElementException(f"Page {page} was not recorded")
+        entry = self.archive.pages[page]
+        later = [number for number in sorted(self.archive.pages) if number > page]
+        buttons = ''.join(f'<li><button aria-label="Page {number}" data-replay-page="{number}">{number}</button></li>'
+                          for number in later)
+
+        # The old page disappears at once; the new one after load_latency
+        self._list = self._pagination = self._detail = None
+        self.page = page
+        self.job_id = None
+        self._url = entry.get('url') or url or f"https://www.linkedin.com/jobs/search/?page={page}"
+
+        def apply():
+            self._list = parse_html(html)
+            self._pagination = parse_html(f'<ul class="artdeco-pagination__pages">{buttons}</ul>')
+
+        self._navigate(apply)
+
+    def _show_job(self, job_id: str):
+        self._detail = None
+        self.job_id = job_id
+
+        def apply():
+            if job_id not in self._parsed_jobs:
+                html = self.archive.job_html(job_id)
+                self._parsed_jobs[job_id] = parse_html(html) if html is not None else parse_html('')
+            self._detail = self._parsed_jobs[job_id]
+
+        self._navigate(apply)
+
+    def _click(self, node: Node):
+        target = node
+        while target is not None:
+            if 'data-replay-page' in target.attrs:
+                self._show_page(int(target.attrs['data-replay-page']))
+                return
+            if 'data-job-id' in target.attrs:
+                self._show_job(target.attrs['data-job-id'])
+                return
+            target = target.parent
+
+    def _roots(self) -> List[Node]:
+        self._loaded()
+        return [root for root in (self._chrome, self._list, self._pagination, self._detail) if root is not None]
+
+    def _attached(self, root: Node) -> bool:
+        return any(root is current for current in self._roots())
+
+    def _find(self, scope: Optional[Node], scope_root: Optional[Node], by, value: str, first: bool = False):
+        if scope is None:
+            self._command()
+        selector = _to_css(by, value)
+        try:
+            compiled = compile_selector(selector)
+        except SelectorError as e:
+            raise InvalidSelectorException(str(e))
+
+        deadline = time.perf_counter() + self.implicit_wait
+        while True:
+            found = []
+            for root in ([scope_root] if scope is not None else self._roots()):
+                for node in compiled.select(scope if scope is not None else root, first=first):
+                    found.append(ReplayElement(self, node, root))
+                if first and found:
+                    return found
+            if found or time.perf_counter() >= deadline or self._pending is None:
+                break
+            # Content is still loading: wait for it like an implicit wait would
+            time.sleep(max(0.0, min(self._ready_at, deadline) - time.perf_counter()))
+
+        if first:
+            raise NoSuchElementException(f"No element matches {by}={value!r} in the replayed DOM")
+        return found
+
+def _to_css(by, value: str) -> str:
+    if by == By.CSS_SELECTOR:
+        return value
+    if by == By.ID:
+        return f'[id="{value}"]'
+    if by == By.CLASS_NAME:
+        return f".{value}"
+    if by == By.TAG_NAME:
+        return value
+    if by == By.NAME:
+        return f'[name="{value}"]'
+    raise InvalidSelectorException(f"Locator strategy {by} is not supported by the replay driver")